@@ -0,0 +1,170 @@
+from __future__ import annotations
+import asyncio
+from interpreter import Interpreter, COMPILED_ENGINES
+from parser import parse_stream, count_nodes
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+
+# Nodos evaluados por porción antes de ceder el control al bucle de eventos
+STEP_BUDGET = 10_000
+
+# Tamaño de los fragmentos en que se parsea el código (ver parser.parse_stream)
+CHUNK_SIZE = 1 << 14
+
+
+# ==================== INTÉRPRETE COOPERATIVO ====================
+
+class AsyncInterpreter(Interpreter):
+    """
+    Intérprete que ejecuta por porciones y cede el control entre ellas.
+
+    Cada porción ejecuta sentencias hasta evaluar `budget` nodos (el lenguaje
+    no tiene ciclos, así que cada sentencia evalúa a lo sumo sus nodos);
+    entre porciones se hace `await asyncio.sleep(0)`, de modo que otras
+    tareas avanzan y la tarea puede cancelarse. Una sola sentencia nunca se
+    divide: una expresión enorme ocupa una porción completa.
+
+    La salida de print no se escribe en stdout: se acumula en `output` y se
+    entrega por porciones a quien itere (ver iter_prints).
+    """
+
+    def __init__(self, engine: str = 'closures', budget: int = STEP_BUDGET):
+        super().__init__(engine)
+        if budget < 1:
+            raise ValueError("El presupuesto de pasos debe ser positivo")
+        self.budget = budget
+        self.result: Any = None  # Valor de la última sentencia ejecutada
+        self._printed: List[Any] = []  # Impreso en la porción actual
+
+    def emit(self, value: Any) -> None:
+        self.output.append(value)
+        self._printed.append(value)
+
+    async def run_async(self, statements: Iterable[Any],
+                        deadline: Optional[float] = None) -> Any:
+        """
+        Ejecuta las sentencias cediendo el control entre porciones.
+
+        Args:
+            statements: Sentencias (por ejemplo, de parser.parse_stream)
+            deadline: Instante límite según loop.time(); al superarlo se
+                lanza asyncio.TimeoutError al terminar la porción en curso
+
+        Returns:
+            El valor de la última sentencia
+        """
+        async for _ in self.slices(statements, deadline):
+            pass
+        return self.result
+
+    async def slices(self, statements: Iterable[Any],
+                     deadline: Optional[float] = None) -> AsyncIterator[List[Any]]:
+        """Ejecuta porción a porción; genera los valores impresos en cada una"""
+        loop = asyncio.get_running_loop()
+        steps = self._steps(statements)
+        while True:
+            done = next(steps, True)
+            printed, self._printed = self._printed, []
+            if printed:
+                yield printed
+            if done:
+                return
+            if deadline is not None and loop.time() >= deadline:
+                raise asyncio.TimeoutError("Tiempo límite superado")
+            await asyncio.sleep(0)
+
+    def _steps(self, statements: Iterable[Any]):
+        """
+        Generador que se detiene (genera False) al agotar cada porción.
+
+        Como en Interpreter.run_stream, con los motores compilados cada
+        sentencia se evalúa con walk(): se ejecuta una sola vez.
+        """
+        if self.engine in COMPILED_ENGINES and 'run' not in self.__dict__:
+            run = self.walk  # Sin suscriptores (ver subscribe)
+        else:
+            run = self.run
+        spent = 0
+        for stmt in statements:
+            self.result = run(stmt)
+            spent += count_nodes(stmt)
+            if spent >= self.budget:
+                spent = 0
+                yield False
+
+
+# ==================== FUNCIONES DE CONVENIENCIA ====================
+
+def _statements(text: str, optimize: bool) -> Iterable[Any]:
+    """Sentencias parseadas a medida que se ejecutan (el parseo también se reparte)"""
+    chunks = (text[i:i + CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE))
+    statements = parse_stream(chunks)
+    if optimize:
+        from optimizer import optimize_stream
+        statements = optimize_stream(statements)
+    return statements
+
+
+def _deadline(timeout: Optional[float], deadline: Optional[float]) -> Optional[float]:
+    if timeout is None:
+        return deadline
+    limit = asyncio.get_running_loop().time() + timeout
+    return limit if deadline is None else min(limit, deadline)
+
+
+async def interpret_async(text: str, env: Dict[str, Any] = None, engine: str = 'closures',
+                          optimize: bool = False, budget: int = STEP_BUDGET,
+                          timeout: Optional[float] = None,
+                          deadline: Optional[float] = None) -> AsyncInterpreter:
+    """
+    Versión asíncrona de interpret: no bloquea el bucle de eventos.
+
+    Ejemplo:
+        interp = await interpret_async(codigo, env, budget=1000, timeout=2.0)
+
+    Args:
+        text: Código fuente a interpretar
+        env: Entorno inicial opcional con variables predefinidas
+        engine: Motor de ejecución (ver interpreter.ENGINES)
+        optimize: Plegar constantes en cada sentencia
+        budget: Nodos evaluados por porción (ver AsyncInterpreter)
+        timeout: Segundos máximos de ejecución
+        deadline: Instante límite según loop.time()
+
+    La tarea puede cancelarse entre porciones. Al superar el tiempo límite
+    se lanza asyncio.TimeoutError; lo ya ejecutado queda en el entorno.
+
+    Returns:
+        El intérprete después de ejecutar (contiene env, output y result)
+    """
+    interpreter = AsyncInterpreter(engine, budget)
+    if env:
+        interpreter.env.update(env)
+    await interpreter.run_async(_statements(text, optimize), _deadline(timeout, deadline))
+    return interpreter
+
+
+async def iter_prints(text: str, env: Dict[str, Any] = None, engine: str = 'closures',
+                      optimize: bool = False, budget: int = STEP_BUDGET,
+                      timeout: Optional[float] = None,
+                      deadline: Optional[float] = None) -> AsyncIterator[Any]:
+    """
+    Ejecuta como interpret_async y genera cada valor impreso, en orden.
+
+    Ejemplo:
+        async for value in iter_prints(codigo, budget=1000):
+            await websocket.send(str(value))
+
+    Los valores de cada porción se entregan al terminarla, antes de ejecutar
+    la siguiente.
+    """
+    interpreter = AsyncInterpreter(engine, budget)
+    if env:
+        interpreter.env.update(env)
+    async for printed in interpreter.slices(_statements(text, optimize),
+                                            _deadline(timeout, deadline)):
+        for value in printed:
+            yield value
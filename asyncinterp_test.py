@@ -0,0 +1,93 @@
+import asyncio
+import sys
+import unittest
+from errors import RuntimeError
+from asyncinterp import AsyncInterpreter, interpret_async, iter_prints
+from interpreter import interpret
+from parser import parse_stream
+
+
+PROGRAM = "".join(f"x{i} = {i} * 2; print(x{i} + 1);\n" for i in range(50))
+
+
+class InterpretAsyncTest(unittest.IsolatedAsyncioTestCase):
+    """Tests de la ejecución asíncrona por porciones"""
+
+    async def test_same_result_as_interpret(self):
+        """El entorno y la salida coinciden con interpret"""
+        expected = interpret(PROGRAM)
+        for budget in (1, 7, 10_000):
+            interp = await interpret_async(PROGRAM, budget=budget)
+            self.assertEqual(interp.env, expected.env, budget)
+            self.assertEqual(interp.output, expected.output, budget)
+        interp = await interpret_async("y = x + 1; y * 2;", env={'x': 4}, engine='bytecode')
+        self.assertEqual(interp.result, 10)
+
+    async def test_statements_not_compiled(self):
+        """Cada sentencia se ejecuta una vez: se recorre sin compilarla"""
+        interp = await interpret_async(PROGRAM, optimize=True)
+        self.assertEqual(interp.output, interpret(PROGRAM).output)
+        self.assertEqual(interp._compiled, {})
+
+    async def test_yields_between_slices(self):
+        """Otras tareas avanzan mientras se ejecuta el programa"""
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(len(ticks))
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        await interpret_async(PROGRAM, budget=5)
+        task.cancel()
+        self.assertGreater(len(ticks), 10)
+
+    async def test_cancellation(self):
+        """La tarea se puede cancelar entre porciones"""
+        code = "x = 1;\n" * 100_000
+        interp = AsyncInterpreter(budget=100)
+        task = asyncio.create_task(interp.run_async(parse_stream([code])))
+        for _ in range(3):
+            await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertTrue(interp.env)
+
+    async def test_deadline(self):
+        """Error: el programa supera el tiempo límite"""
+        code = "x = 1 + 2 * 3;\n" * 200_000
+        with self.assertRaises(asyncio.TimeoutError):
+            await interpret_async(code, budget=100, timeout=0.01)
+
+    async def test_runtime_error(self):
+        """Los errores del programa se propagan"""
+        with self.assertRaises(RuntimeError):
+            await interpret_async("print(1); 1 / 0;")
+
+    def test_invalid_budget(self):
+        """Error: presupuesto no positivo"""
+        with self.assertRaises(ValueError):
+            AsyncInterpreter(budget=0)
+
+
+class IterPrintsTest(unittest.IsolatedAsyncioTestCase):
+    """Tests de la salida como iterador asíncrono"""
+
+    async def test_values_in_order(self):
+        """Se generan todos los valores impresos, en orden"""
+        values = [value async for value in iter_prints(PROGRAM, budget=3)]
+        self.assertEqual(values, [i * 2 + 1 for i in range(50)])
+
+    async def test_values_before_end(self):
+        """Los valores llegan antes de terminar el programa"""
+        values = iter_prints("print(1);" + "x = 2;" * 1000 + "1 / 0;", budget=10)
+        self.assertEqual(await values.__anext__(), 1)
+        with self.assertRaises(RuntimeError):
+            await values.__anext__()
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
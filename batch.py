@@ -0,0 +1,247 @@
+from __future__ import annotations
+import glob
+import json
+import os
+import signal
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from interpreter import Interpreter
+from parser import parse
+from sinks import CaptureSink
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+
+# Código de salida de un script que supera el tiempo límite (como timeout(1))
+TIMEOUT_EXIT_CODE = 124
+
+# Los temporizadores por script usan SIGALRM (no disponible en Windows)
+HAS_TIMEOUTS = hasattr(signal, 'setitimer')
+
+
+# ==================== RESULTADOS ====================
+
+class ScriptResult(namedtuple('ScriptResult', ('script', 'status', 'exit_code', 'output',
+                                               'error', 'seconds', 'size'))):
+    """
+    Resultado de ejecutar un script del lote.
+
+    status es 'ok', 'error' o 'timeout' y exit_code 0, 1 o TIMEOUT_EXIT_CODE;
+    output son los valores impresos (Interpreter.output), error el mensaje
+    (o None) y size los bytes del código fuente.
+    """
+    __slots__ = ()
+
+    def to_json(self) -> str:
+        return json.dumps(self._asdict(), ensure_ascii=False)
+
+
+class BatchSummary(namedtuple('BatchSummary', ('scripts', 'ok', 'errors', 'timeouts',
+                                               'seconds', 'bytes', 'jobs'))):
+    """Totales de un lote: scripts por estado, segundos, bytes y procesos"""
+    __slots__ = ()
+
+    def __str__(self):
+        rate = self.scripts / self.seconds if self.seconds else 0.0
+        throughput = self.bytes / self.seconds / 1e6 if self.seconds else 0.0
+        return (f"Scripts: {self.scripts} (ok {self.ok}, error {self.errors}, "
+                f"timeout {self.timeouts}) en {self.seconds:.2f} s con {self.jobs} procesos: "
+                f"{rate:.1f} scripts/s, {throughput:.2f} MB/s")
+
+
+# ==================== SELECCIÓN DE SCRIPTS ====================
+
+def collect_scripts(sources: Iterable[str]) -> List[str]:
+    """
+    Expande las fuentes de un lote a una lista de scripts, en orden.
+
+    Cada fuente puede ser:
+        - un directorio: sus archivos (no ocultos), ordenados por nombre
+        - un patrón glob ('scripts/*.txt', 'datos/**/*.txt')
+        - '@lista.txt': un manifiesto con una ruta por línea, relativa al
+          manifiesto; se ignoran las líneas vacías y las que empiezan con '#'
+        - la ruta de un script
+    """
+    scripts: List[str] = []
+    for source in sources:
+        if source.startswith('@'):
+            scripts.extend(_read_manifest(source[1:]))
+        elif os.path.isdir(source):
+            scripts.extend(sorted(
+                os.path.join(source, name) for name in os.listdir(source)
+                if not name.startswith('.') and os.path.isfile(os.path.join(source, name))
+            ))
+        elif glob.has_magic(source):
+            scripts.extend(sorted(path for path in glob.glob(source, recursive=True)
+                                  if os.path.isfile(path)))
+        else:
+            scripts.append(source)
+    return scripts
+
+
+def _read_manifest(manifest: str) -> List[str]:
+    base = os.path.dirname(manifest)
+    with open(manifest, 'r', encoding='utf-8') as f:
+        lines = [line.strip() for line in f]
+    return [os.path.join(base, line) for line in lines if line and not line.startswith('#')]
+
+
+# ==================== EJECUCIÓN ====================
+
+class ScriptTimeout(Exception):
+    """El script superó su tiempo límite"""
+
+
+def _alarm(signum, frame):
+    raise ScriptTimeout()
+
+
+def run_script(script: str, engine: str = 'closures', optimize: bool = False,
+               timeout: Optional[float] = None) -> ScriptResult:
+    """
+    Ejecuta un script y captura su salida, su estado y su duración.
+
+    Nunca lanza excepciones: los errores de lectura, de sintaxis y de
+    ejecución quedan en el resultado. Con `timeout` (segundos) la ejecución
+    se interrumpe con SIGALRM; debe llamarse desde el hilo principal.
+    """
+    start = time.perf_counter()
+    # Los procesos no escriben en stdout: la salida solo se captura
+    interpreter = Interpreter(engine, CaptureSink())
+    size = 0
+    status, exit_code, error = 'ok', 0, None
+    timed = bool(timeout) and HAS_TIMEOUTS
+    try:
+        if timed:
+            previous = signal.signal(signal.SIGALRM, _alarm)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        try:
+            with open(script, 'r', encoding='utf-8') as f:
+                size = os.fstat(f.fileno()).st_size  # Bytes, no caracteres
+                code = f.read()
+            ast = parse(code)
+            if optimize:
+                from optimizer import optimize as optimize_ast
+                ast, _ = optimize_ast(ast)
+            interpreter.run(ast)
+        finally:
+            if timed:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+                signal.signal(signal.SIGALRM, previous)
+    except ScriptTimeout:
+        status, exit_code = 'timeout', TIMEOUT_EXIT_CODE
+        error = f"Tiempo límite superado ({timeout} s)"
+    except FileNotFoundError:
+        status, exit_code, error = 'error', 1, f"No se encontró el archivo '{script}'"
+    except Exception as e:
+        status, exit_code, error = 'error', 1, str(e)
+    return ScriptResult(script, status, exit_code, interpreter.output, error,
+                        time.perf_counter() - start, size)
+
+
+def run_batch(scripts: List[str], jobs: Optional[int] = None, engine: str = 'closures',
+              optimize: bool = False, timeout: Optional[float] = None,
+              on_result: Optional[Callable[[ScriptResult], None]] = None) -> BatchSummary:
+    """
+    Ejecuta muchos scripts en paralelo con un pool de procesos.
+
+    Los resultados se entregan a `on_result` en el orden de `scripts`, a
+    medida que están listos. Los scripts se envían a los procesos en grupos
+    para que el costo de comunicación no domine con scripts pequeños. Si un
+    proceso muere, solo el script que lo mató queda como error y el lote
+    continúa (ver _run_pool).
+
+    Args:
+        scripts: Rutas de los scripts (ver collect_scripts)
+        jobs: Procesos (por defecto, la cantidad de núcleos); con 1 se
+            ejecuta en el proceso actual
+        engine: Motor de ejecución (ver interpreter.ENGINES)
+        optimize: Aplicar el optimizador antes de ejecutar
+        timeout: Segundos máximos por script (None: sin límite)
+    """
+    jobs = jobs or os.cpu_count() or 1
+    task = partial(run_script, engine=engine, optimize=optimize, timeout=timeout)
+    counts = {'ok': 0, 'error': 0, 'timeout': 0}
+    total_bytes = 0
+    start = time.perf_counter()
+
+    def consume(results: Iterator[ScriptResult]) -> None:
+        nonlocal total_bytes
+        for result in results:
+            counts[result.status] += 1
+            total_bytes += result.size
+            if on_result is not None:
+                on_result(result)
+
+    if jobs == 1 or len(scripts) <= 1:
+        jobs = 1
+        consume(map(task, scripts))
+    else:
+        chunksize = max(1, min(64, len(scripts) // (jobs * 4)))
+        chunks = [scripts[i:i + chunksize] for i in range(0, len(scripts), chunksize)]
+        consume(_run_pool(chunks, jobs, task))
+
+    return BatchSummary(len(scripts), counts['ok'], counts['error'], counts['timeout'],
+                        time.perf_counter() - start, total_bytes, jobs)
+
+
+def _run_chunk(task: Callable[[str], ScriptResult], chunk: List[str]) -> List[ScriptResult]:
+    return [task(script) for script in chunk]
+
+
+def _run_pool(chunks: List[List[str]], jobs: int,
+              task: Callable[[str], ScriptResult]) -> Iterator[ScriptResult]:
+    """
+    Ejecuta los grupos de scripts en un pool de procesos y genera los
+    resultados en orden.
+
+    Si un proceso muere (por ejemplo, lo mata el sistema por falta de
+    memoria), el pool queda roto y todos los grupos pendientes fallan con
+    BrokenProcessPool. En ese caso los scripts del grupo afectado se repiten
+    de a uno (ver _isolate) y los grupos siguientes se envían a un pool nuevo.
+    """
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    try:
+        pending = deque(executor.submit(_run_chunk, task, chunk) for chunk in chunks)
+        for index, chunk in enumerate(chunks):
+            try:
+                results = pending.popleft().result()
+            except BrokenProcessPool:
+                executor.shutdown(wait=True)
+                results = _isolate(chunk, task)
+                executor = ProcessPoolExecutor(max_workers=jobs)
+                pending = deque(executor.submit(_run_chunk, task, later)
+                                for later in chunks[index + 1:])
+            yield from results
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _isolate(chunk: List[str], task: Callable[[str], ScriptResult]) -> List[ScriptResult]:
+    """
+    Ejecuta los scripts de un grupo de a uno, cada uno en un proceso aparte.
+
+    El grupo pudo fallar porque murió otro proceso del pool, así que sus
+    scripts se repiten; el que vuelve a matar al proceso queda como error.
+    """
+    results = []
+    executor = ProcessPoolExecutor(max_workers=1)
+    try:
+        for script in chunk:
+            start = time.perf_counter()
+            try:
+                results.append(executor.submit(task, script).result())
+            except BrokenProcessPool:
+                results.append(ScriptResult(
+                    script, 'error', 1, [], "El proceso terminó de forma inesperada",
+                    time.perf_counter() - start, 0))
+                executor.shutdown(wait=True)
+                executor = ProcessPoolExecutor(max_workers=1)
+    finally:
+        executor.shutdown(wait=True)
+    return results
@@ -0,0 +1,141 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import batch
+from batch import collect_scripts, run_script, run_batch, HAS_TIMEOUTS, TIMEOUT_EXIT_CODE
+from main import run_batch_files
+
+
+def crashing_run_script(script, **options):
+    """run_script que mata al proceso con los scripts llamados 'crash*'"""
+    if os.path.basename(script).startswith('crash'):
+        os._exit(1)
+    return run_script(script, **options)
+
+
+class BatchTestCase(unittest.TestCase):
+    """Crea un directorio temporal con scripts"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, code):
+        path = os.path.join(self.dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(code)
+        return path
+
+
+class CollectScriptsTest(BatchTestCase):
+    """Tests de la selección de scripts"""
+
+    def test_directory(self):
+        """Un directorio aporta sus archivos no ocultos, ordenados"""
+        b = self.write('b.txt', '1;')
+        a = self.write('a.txt', '1;')
+        self.write('.oculto', '1;')
+        os.mkdir(os.path.join(self.dir, 'sub'))
+        self.assertEqual(collect_scripts([self.dir]), [a, b])
+
+    def test_glob(self):
+        """Los patrones glob se expanden en orden"""
+        a = self.write('x/a.txt', '1;')
+        b = self.write('x/y/b.txt', '1;')
+        self.write('x/c.dat', '1;')
+        pattern = os.path.join(self.dir, 'x', '**', '*.txt')
+        self.assertEqual(collect_scripts([pattern]), sorted([a, b]))
+
+    def test_manifest(self):
+        """El manifiesto tiene rutas relativas a él, comentarios y líneas vacías"""
+        manifest = self.write('lista.txt', '# nocturno\nb.txt\n\nsub/a.txt\n')
+        self.assertEqual(collect_scripts(['@' + manifest]),
+                         [os.path.join(self.dir, 'b.txt'), os.path.join(self.dir, 'sub/a.txt')])
+
+
+class RunScriptTest(BatchTestCase):
+    """Tests de la ejecución de un script"""
+
+    def test_ok(self):
+        """Se captura la salida sin escribir en stdout"""
+        result = run_script(self.write('a.txt', 'x = 2; print(x * 3); print(x);'))
+        self.assertEqual((result.status, result.exit_code), ('ok', 0))
+        self.assertEqual(result.output, [6, 2])
+        self.assertIsNone(result.error)
+
+    def test_size_in_bytes(self):
+        """El tamaño se cuenta en bytes del archivo, no en caracteres"""
+        code = 'año = 2; print(año);'
+        result = run_script(self.write('a.txt', code))
+        self.assertEqual(result.output, [2])
+        self.assertEqual(result.size, len(code.encode('utf-8')))
+
+    def test_errors(self):
+        """Los errores de sintaxis, de ejecución y de lectura quedan en el resultado"""
+        for code in ('x = ;', 'print(1); 1 / 0;'):
+            result = run_script(self.write('a.txt', code))
+            self.assertEqual((result.status, result.exit_code), ('error', 1), code)
+            self.assertTrue(result.error)
+        self.assertEqual(run_script(self.write('a.txt', 'print(1); 1 / 0;')).output, [1])
+        result = run_script(os.path.join(self.dir, 'no_existe.txt'))
+        self.assertIn('No se encontró', result.error)
+
+    @unittest.skipUnless(HAS_TIMEOUTS, "SIGALRM no está disponible")
+    def test_timeout(self):
+        """Un script que supera el tiempo límite se interrumpe"""
+        path = self.write('lento.txt', 'x = 1 + 2 * 3;\n' * 200000)
+        result = run_script(path, timeout=0.01)
+        self.assertEqual((result.status, result.exit_code), ('timeout', TIMEOUT_EXIT_CODE))
+        # El temporizador no queda activo
+        self.assertEqual(run_script(self.write('a.txt', 'print(1);'), timeout=0.01).status, 'ok')
+
+
+class RunBatchTest(BatchTestCase):
+    """Tests del pool de procesos"""
+
+    def test_results_in_input_order(self):
+        """Los resultados llegan en el orden de entrada con uno o varios procesos"""
+        scripts = [self.write(f's{i}.txt', f'print({i});' if i % 5 else '1 / 0;')
+                   for i in range(20)]
+        for jobs in (1, 3):
+            results = []
+            summary = run_batch(scripts, jobs=jobs, on_result=results.append)
+            self.assertEqual([r.script for r in results], scripts)
+            self.assertEqual([r.output for r in results if r.status == 'ok'],
+                             [[i] for i in range(20) if i % 5])
+            self.assertEqual((summary.scripts, summary.ok, summary.errors), (20, 16, 4))
+
+    def test_worker_crash(self):
+        """Si un proceso muere, solo su script falla y el lote continúa"""
+        scripts = [self.write(f'{"crash" if i == 7 else "s"}{i:02}.txt', f'print({i});')
+                   for i in range(24)]
+        results = []
+        with mock.patch.object(batch, 'run_script', crashing_run_script):
+            summary = run_batch(scripts, jobs=2, on_result=results.append)
+        self.assertEqual([r.script for r in results], scripts)
+        self.assertEqual([r.status for r in results], ['error' if i == 7 else 'ok' for i in range(24)])
+        self.assertEqual([r.output for r in results if r.status == 'ok'],
+                         [[i] for i in range(24) if i != 7])
+        self.assertEqual((summary.ok, summary.errors), (23, 1))
+
+    def test_run_batch_files(self):
+        """main.py --batch escribe un objeto JSON por script"""
+        self.write('a.txt', 'print(1);')
+        self.write('b.txt', 'print(2);')
+        output = os.path.join(self.dir, 'salida.jsonl')
+        self.assertTrue(run_batch_files([os.path.join(self.dir, '*.txt')], jobs=2, output=output))
+        with open(output, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual([(line['status'], line['output']) for line in lines],
+                         [('ok', [1]), ('ok', [2])])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
@@ -0,0 +1,118 @@
+"""
+Benchmark de memoria del AST: bytes por nodo.
+
+Compara los nodos actuales (con __slots__ y códigos de operador enteros)
+con los nodos dataclass originales, construyendo el mismo árbol con ambos.
+
+Uso:
+    python bench/ast_memory.py [--statements N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser as slotted  # noqa: E402
+from optimizer import count_nodes  # noqa: E402
+
+
+# ==================== NODOS ORIGINALES ====================
+
+@dataclass
+class NumberNode:
+    value: int
+
+@dataclass
+class IdNode:
+    name: str
+
+@dataclass
+class BinOpNode:
+    left: Any
+    op: str
+    right: Any
+
+@dataclass
+class UnaryOpNode:
+    op: str
+    operand: Any
+
+@dataclass
+class AssignNode:
+    name: str
+    value: Any
+
+@dataclass
+class PrintNode:
+    expr: Any
+
+@dataclass
+class ProgramNode:
+    statements: List[Any]
+
+
+# ==================== GENERACIÓN ====================
+
+def build(nodes, statements: int, seed: int = 0):
+    """Construye un programa aleatorio reproducible con las clases `nodes`"""
+    rng = random.Random(seed)
+    names = [f'v{i}' for i in range(32)]
+    binary = slotted.BINARY_OPERATORS
+    unary = slotted.UNARY_OPERATORS
+
+    def expr(depth):
+        roll = rng.random()
+        if depth == 0 or roll < 0.25:
+            # Números grandes: evita que todos compartan los enteros pequeños
+            return nodes.NumberNode(rng.randrange(1000, 10 ** 6))
+        if roll < 0.45:
+            return nodes.IdNode(rng.choice(names))
+        if roll < 0.55:
+            return nodes.UnaryOpNode(rng.choice(unary), expr(depth - 1))
+        return nodes.BinOpNode(expr(depth - 1), rng.choice(binary), expr(depth - 1))
+
+    body = []
+    for _ in range(statements):
+        if rng.random() < 0.2:
+            body.append(nodes.PrintNode(expr(4)))
+        else:
+            body.append(nodes.AssignNode(rng.choice(names), expr(4)))
+    return nodes.ProgramNode(body)
+
+
+def measure(nodes, statements: int):
+    """Retorna el árbol construido y los bytes asignados para construirlo"""
+    tracemalloc.start()
+    tree = build(nodes, statements)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tree, size
+
+
+# ==================== PUNTO DE ENTRADA ====================
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Memoria por nodo del AST')
+    arg_parser.add_argument('--statements', type=int, default=20_000,
+                            help='Sentencias del programa generado')
+    args = arg_parser.parse_args()
+
+    _, before = measure(sys.modules[__name__], args.statements)
+    tree, after = measure(slotted, args.statements)
+    # Misma semilla: ambos árboles tienen la misma forma
+    nodes = count_nodes(tree)
+
+    print(f"Nodos: {nodes}")
+    print(f"Antes (dataclass):   {before / nodes:7.1f} bytes/nodo")
+    print(f"Después (__slots__): {after / nodes:7.1f} bytes/nodo")
+    print(f"Reducción: {100 * (1 - after / before):.1f}%")
+
+
+if __name__ == '__main__':
+    main()
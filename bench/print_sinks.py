@@ -0,0 +1,73 @@
+"""
+Benchmark de la salida de print: print() por valor contra los destinos de sinks.py.
+
+Compila una sola vez un programa con muchas sentencias print y lo ejecuta
+con cada destino, escribiendo en /dev/null, para medir solo el costo de
+formatear y escribir la salida.
+
+Uso:
+    python bench/print_sinks.py [--prints N] [--repeat R]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from interpreter import Interpreter  # noqa: E402
+from parser import parse  # noqa: E402
+from compiler import compile_ast  # noqa: E402
+from sinks import FdSink, CaptureSink, NullSink  # noqa: E402
+
+
+def program(prints: int):
+    """Programa con `prints` sentencias print sobre valores distintos"""
+    return parse("x = 7;\n" + "".join(f"print(x * {i});\n" for i in range(prints)))
+
+
+def measure(execute, make_sink, repeat: int) -> float:
+    """Mejor tiempo de `repeat` ejecuciones, con stdout en /dev/null"""
+    best = float('inf')
+    with open(os.devnull, 'w') as devnull:
+        for _ in range(repeat):
+            sink = make_sink(devnull)
+            interpreter = Interpreter('closures', sink)
+            with contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                execute({}, interpreter.emit)
+                if sink is not None:
+                    sink.close()
+                best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Costo de la salida de print por destino')
+    arg_parser.add_argument('--prints', type=int, default=200_000,
+                            help='Sentencias print del programa generado')
+    arg_parser.add_argument('--repeat', type=int, default=3,
+                            help='Repeticiones (se toma el mejor tiempo)')
+    args = arg_parser.parse_args()
+
+    execute = compile_ast(program(args.prints))
+    sinks = [
+        ('print() + output', lambda devnull: None),
+        ('FdSink', lambda devnull: FdSink(devnull.fileno())),
+        ('CaptureSink(1000)', lambda devnull: CaptureSink(1000)),
+        ('NullSink', lambda devnull: NullSink()),
+    ]
+
+    baseline = None
+    print(f"{args.prints} prints")
+    for name, make_sink in sinks:
+        seconds = measure(execute, make_sink, args.repeat)
+        baseline = baseline or seconds
+        print(f"  {name:18} {seconds:7.3f} s  {args.prints / seconds / 1e6:6.2f} M prints/s"
+              f"  x{baseline / seconds:.2f}")
+
+
+if __name__ == '__main__':
+    main()
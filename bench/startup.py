@@ -0,0 +1,108 @@
+"""
+Benchmark del arranque de la CLI: `python main.py -c "1;"`.
+
+Mide el tiempo total de varios arranques (comparado con un `python -c pass`
+vacío) y el costo de importación de cada módulo con `python -X importtime`.
+Termina con código 1 si el costo propio (la diferencia entre las medianas)
+supera el objetivo.
+
+Uso:
+    python bench/startup.py [--runs N] [--target-ms MS] [--top N]
+"""
+
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'main.py')
+
+# Costo propio máximo aceptable de `main.py -c "1;"` (su mediana menos la de
+# `python -c pass`), en milisegundos: se midieron unos 25 ms sin typing ni
+# los módulos de -O y de columnas, y unos 35 ms cuando se cargaban
+TARGET_MS = 30.0
+
+COMMAND = [sys.executable, MAIN, '-c', '1;']
+BASELINE = [sys.executable, '-c', 'pass']
+
+
+# ==================== MEDICIÓN ====================
+
+def wall_times(command, runs: int):
+    """Tiempo (ms) de `runs` ejecuciones del comando"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1e3)
+    return times
+
+
+def import_costs():
+    """
+    Costo de importación por módulo según `python -X importtime`.
+
+    Retorna una lista de (módulo, propio µs, acumulado µs, es del proyecto).
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + COMMAND[1:],
+                            check=True, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True)
+    local = {name[:-3] for name in os.listdir(ROOT) if name.endswith('.py')}
+    costs = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        name = name.strip()
+        costs.append((name, int(own), int(cumulative), name in local))
+    return costs
+
+
+# ==================== PUNTO DE ENTRADA ====================
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Tiempo de arranque de main.py')
+    arg_parser.add_argument('--runs', type=int, default=30, help='Arranques a medir')
+    arg_parser.add_argument('--target-ms', type=float, default=TARGET_MS,
+                            help=f'Costo propio máximo aceptable (por defecto: {TARGET_MS} ms)')
+    arg_parser.add_argument('--top', type=int, default=10,
+                            help='Módulos externos más costosos a mostrar')
+    args = arg_parser.parse_args()
+
+    # Con los .pyc al día no se mide la compilación del código fuente
+    compileall.compile_dir(ROOT, quiet=1, maxlevels=0)
+
+    wall_times(COMMAND, 3)  # Calentar la caché de archivos
+    times = wall_times(COMMAND, args.runs)
+    baseline = wall_times(BASELINE, args.runs)
+    median = statistics.median(times)
+    base = statistics.median(baseline)
+
+    print(f"python main.py -c \"1;\": mediana {median:.1f} ms, mínimo {min(times):.1f} ms")
+    print(f"python -c pass:          mediana {base:.1f} ms (costo propio: {median - base:.1f} ms)")
+
+    costs = import_costs()
+    project = [cost for cost in costs if cost[3]]
+    external = sorted((cost for cost in costs if not cost[3]), key=lambda c: c[1], reverse=True)
+    print(f"\n{'módulo del proyecto':24} {'propio µs':>10} {'acumulado µs':>13}")
+    for name, own, cumulative, _ in project:
+        print(f"{name:24} {own:10} {cumulative:13}")
+    print(f"{'total':24} {sum(c[1] for c in project):10}")
+    print(f"\n{'módulo externo':24} {'propio µs':>10}")
+    for name, own, _, _ in external[:args.top]:
+        print(f"{name:24} {own:10}")
+    print(f"{'total':24} {sum(c[1] for c in external):10}")
+
+    if median - base > args.target_ms:
+        print(f"\nEl costo propio ({median - base:.1f} ms) supera el objetivo de "
+              f"{args.target_ms} ms", file=sys.stderr)
+        sys.exit(1)
+    print(f"\nDentro del objetivo de {args.target_ms} ms")
+
+
+if __name__ == '__main__':
+    main()
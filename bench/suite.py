@@ -0,0 +1,380 @@
+"""
+Benchmark del lexer, el parser y el intérprete con cargas que escalan.
+
+Genera programas deterministas (con semilla) de varias formas y tamaños y
+mide por separado, para cada uno:
+    - lex:   lexer.lexer, tokens/s
+    - parse: Parser.parse (sin contar el lexer), nodos/s
+    - run:   Interpreter.run del programa entero con el motor elegido
+             (incluida su compilación), nodos/s
+    - el pico de memoria de cada fase (con tracemalloc, en una pasada aparte)
+
+Los resultados se guardan en JSON y se pueden comparar con una línea base:
+las fases más lentas o con más memoria que el umbral se marcan como
+regresiones y el proceso termina con código 1.
+
+Uso:
+    python bench/suite.py -o base.json
+    python bench/suite.py --workloads flat,deep --sizes 1KB,10MB -o nuevo.json
+    python bench/suite.py --compare base.json            # Medir y comparar
+    python bench/suite.py --compare base.json nuevo.json # Solo comparar
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compiler import MAX_CLOSURE_DEPTH  # noqa: E402
+from lexer import lexer, tokenize  # noqa: E402
+from parser import Parser, count_nodes  # noqa: E402
+from interpreter import Interpreter, ENGINES  # noqa: E402
+from sinks import FdSink  # noqa: E402
+
+
+SIZES = ('1KB', '100KB', '1MB')  # Por defecto; se admite hasta 100MB y más
+UNITS = {'B': 1, 'KB': 1 << 10, 'MB': 1 << 20, 'GB': 1 << 30}
+
+# Fases medidas: (nombre, métrica de rendimiento)
+PHASES = (('lex', 'tokens_per_s'), ('parse', 'nodes_per_s'), ('run', 'nodes_per_s'))
+
+THRESHOLD = 0.10  # Diferencia relativa a partir de la cual hay regresión
+
+# Duración mínima de cada muestra: con programas chicos se repite la fase
+MIN_SAMPLE_SECONDS = 0.1
+
+
+# ==================== GENERADORES ====================
+
+# Variables definidas al principio de cada programa
+PRELUDE_VARS = 32
+
+
+class Workload(ABC):
+    """Generador de programas de una forma dada (determinista por semilla)"""
+
+    def __init__(self, seed: int):
+        self.rng = random.Random(seed)
+
+    def literal(self) -> str:
+        return str(self.rng.randrange(1, 1000))
+
+    def var(self, prefix: str = 'v') -> str:
+        return f'{prefix}{self.rng.randrange(PRELUDE_VARS)}'
+
+    def prelude(self) -> List[str]:
+        return [f'v{i} = {i + 1};\n' for i in range(PRELUDE_VARS)]
+
+    @abstractmethod
+    def statement(self) -> str:
+        """Una sentencia del programa, terminada en ';' y salto de línea"""
+
+    def generate(self, size: int) -> str:
+        """Programa de al menos `size` bytes"""
+        parts = self.prelude()
+        length = sum(map(len, parts))
+        while length < size:
+            stmt = self.statement()
+            parts.append(stmt)
+            length += len(stmt)
+        return ''.join(parts)
+
+
+# Los valores se mantienen acotados: se promedian variables y se suman
+# literales, nunca se multiplican variables entre sí.
+
+class Flat(Workload):
+    """Muchas sentencias cortas de asignación"""
+
+    def statement(self) -> str:
+        return (f'{self.var()} = ({self.var()} + {self.var()} * 3) / 4'
+                f' - {self.literal()} + {self.literal()};\n')
+
+
+class Deep(Workload):
+    """
+    Expresiones con paréntesis anidados: las sentencias alternan entre las
+    profundidades de DEPTHS, la última por encima de MAX_CLOSURE_DEPTH para
+    que el motor de clausuras compile el programa con su respaldo de bytecode
+    """
+
+    DEPTHS = (40, 2 * MAX_CLOSURE_DEPTH)
+    OPS = ('+', '-', '==', '<', 'and', 'or')
+
+    def __init__(self, seed: int):
+        super().__init__(seed)
+        self.count = 0
+
+    def statement(self) -> str:
+        depth = self.DEPTHS[self.count % len(self.DEPTHS)]
+        self.count += 1
+        expr = self.var()
+        for _ in range(depth):
+            expr = f'({expr} {self.rng.choice(self.OPS)} {self.literal()})'
+        return f'{self.var()} = {expr} / 2;\n'
+
+
+class Wide(Workload):
+    """Expresiones largas sin anidar (WIDTH términos)"""
+
+    WIDTH = 100
+
+    def statement(self) -> str:
+        terms = [self.var() if self.rng.random() < 0.5 else self.literal()
+                 for _ in range(self.WIDTH)]
+        signs = [self.rng.choice(('+', '-')) for _ in range(self.WIDTH - 1)]
+        body = terms[0] + ''.join(f' {sign} {term}' for sign, term in zip(signs, terms[1:]))
+        return f'{self.var()} = ({body}) / {self.WIDTH};\n'
+
+
+class ManyVars(Workload):
+    """Cada sentencia define una variable nueva a partir de dos anteriores"""
+
+    def __init__(self, seed: int):
+        super().__init__(seed)
+        self.defined = PRELUDE_VARS
+
+    def statement(self) -> str:
+        i = self.rng.randrange(self.defined)
+        j = self.rng.randrange(self.defined)
+        stmt = f'v{self.defined} = (v{i} + v{j}) / 2 + {self.literal()};\n'
+        self.defined += 1
+        return stmt
+
+
+class PrintHeavy(Workload):
+    """Mayoría de sentencias print"""
+
+    def statement(self) -> str:
+        if self.rng.random() < 0.8:
+            return f'print({self.var()} + {self.literal()});\n'
+        return f'{self.var()} = ({self.var()} + {self.var()}) / 2 - {self.literal()};\n'
+
+
+WORKLOADS: Dict[str, Callable[[int], Workload]] = {
+    'flat': Flat,
+    'deep': Deep,
+    'wide': Wide,
+    'many_vars': ManyVars,
+    'print_heavy': PrintHeavy,
+}
+
+
+def generate(workload: str, size: int, seed: int = 0) -> str:
+    """Genera el programa de `workload` con al menos `size` bytes"""
+    return WORKLOADS[workload](seed).generate(size)
+
+
+def parse_size(text: str) -> int:
+    """'1KB' -> 1024, '100MB' -> 104857600"""
+    text = text.strip().upper()
+    for unit in sorted(UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * UNITS[unit])
+    return int(text)
+
+
+# ==================== MEDICIÓN ====================
+
+def lex_phase(text: str) -> int:
+    count = 0
+    for _ in lexer(text):
+        count += 1
+    return count
+
+
+def run_phase(ast, engine: str, devnull: int) -> None:
+    # run() y no run_stream(): con los motores compilados, run_stream
+    # recorre cada sentencia con walk() y no mediría el motor elegido
+    sink = FdSink(devnull)
+    Interpreter(engine, sink).run(ast)
+    sink.flush()
+
+
+def timed(fn: Callable[[], Any], repeat: int):
+    """
+    Mejor tiempo por llamada de `repeat` muestras y el último resultado.
+
+    Cada muestra repite la llamada hasta durar al menos MIN_SAMPLE_SECONDS,
+    para que los programas de 1KB no queden dominados por el ruido.
+    """
+    start = time.perf_counter()
+    result = fn()
+    first = time.perf_counter() - start
+    number = max(1, int(MIN_SAMPLE_SECONDS / first) if first else 1000)
+    best = first
+    for _ in range(repeat):
+        result = None
+        gc.collect()
+        start = time.perf_counter()
+        for _ in range(number):
+            result = fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best, result
+
+
+def peak(fn: Callable[[], Any]) -> int:
+    """Pico de memoria (bytes) asignado durante una llamada"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(workload: str, size_name: str, seed: int, repeat: int,
+            engine: str, memory: bool) -> Dict[str, Any]:
+    """Mide las tres fases de un programa generado"""
+    text = generate(workload, parse_size(size_name), seed)
+    tokens_stream = tokenize(text)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    try:
+        lex_seconds, tokens = timed(lambda: lex_phase(text), repeat)
+        parse_seconds, ast = timed(lambda: Parser(tokens_stream).parse(), repeat)
+        nodes = count_nodes(ast)
+        run_seconds, _ = timed(lambda: run_phase(ast, engine, devnull), repeat)
+        result = {
+            'workload': workload, 'size': size_name, 'bytes': len(text),
+            'tokens': tokens, 'nodes': nodes,
+            'lex_seconds': lex_seconds, 'lex_tokens_per_s': tokens / lex_seconds,
+            'parse_seconds': parse_seconds, 'parse_nodes_per_s': nodes / parse_seconds,
+            'run_seconds': run_seconds, 'run_nodes_per_s': nodes / run_seconds,
+        }
+        if memory:
+            result['lex_peak_bytes'] = peak(lambda: lex_phase(text))
+            del ast
+            result['parse_peak_bytes'] = peak(lambda: Parser(tokens_stream).parse())
+            ast = Parser(tokens_stream).parse()
+            result['run_peak_bytes'] = peak(lambda: run_phase(ast, engine, devnull))
+        return result
+    finally:
+        os.close(devnull)
+
+
+def run_suite(workloads: List[str], sizes: List[str], seed: int, repeat: int,
+              engine: str, memory: bool, log=sys.stderr) -> Dict[str, Any]:
+    results = []
+    for workload in workloads:
+        for size in sizes:
+            result = measure(workload, size, seed, repeat, engine, memory)
+            print(f"{workload:12} {size:>6}  "
+                  f"lex {result['lex_tokens_per_s'] / 1e6:6.2f} Mtok/s  "
+                  f"parse {result['parse_nodes_per_s'] / 1e6:6.2f} Mnod/s  "
+                  f"run {result['run_nodes_per_s'] / 1e6:6.2f} Mnod/s", file=log)
+            results.append(result)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'engine': engine, 'seed': seed, 'repeat': repeat,
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'results': results,
+    }
+
+
+# ==================== COMPARACIÓN ====================
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float = THRESHOLD) -> List[str]:
+    """
+    Compara dos resultados y retorna las regresiones encontradas.
+
+    Hay regresión si el rendimiento de una fase baja, o su pico de memoria
+    sube, más que `threshold` (relativo a la línea base). Solo se comparan
+    los pares (carga, tamaño) presentes en ambos.
+    """
+    base = {(r['workload'], r['size']): r for r in baseline['results']}
+    regressions = []
+    print(f"{'carga':12} {'tamaño':>6}  {'fase':5} {'métrica':12} {'base':>10} "
+          f"{'actual':>10} {'cambio':>8}")
+    for result in current['results']:
+        key = (result['workload'], result['size'])
+        if key not in base:
+            continue
+        old = base[key]
+        for phase, rate in PHASES:
+            checks = [(f'{phase}_{rate}', 1), (f'{phase}_peak_bytes', -1)]
+            for metric, better in checks:
+                if metric not in old or metric not in result:
+                    continue
+                change = (result[metric] - old[metric]) / old[metric]
+                flag = ''
+                if change * better < -threshold:
+                    flag = '  REGRESIÓN'
+                    regressions.append(f"{key[0]} {key[1]} {metric}: {100 * change:+.1f}%")
+                short = rate if metric.endswith(rate) else 'peak_bytes'
+                print(f"{key[0]:12} {key[1]:>6}  {phase:5} {short:12} {old[metric]:10.4g} "
+                      f"{result[metric]:10.4g} {100 * change:+7.1f}%{flag}")
+    return regressions
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# ==================== PUNTO DE ENTRADA ====================
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark del lexer, parser e intérprete')
+    arg_parser.add_argument('--workloads', default=','.join(WORKLOADS),
+                            help=f'Cargas separadas por comas ({", ".join(WORKLOADS)})')
+    arg_parser.add_argument('--sizes', default=','.join(SIZES),
+                            help='Tamaños separados por comas, de 1KB a 100MB')
+    arg_parser.add_argument('--seed', type=int, default=0, help='Semilla de los generadores')
+    arg_parser.add_argument('--repeat', type=int, default=3,
+                            help='Repeticiones por fase (se toma el mejor tiempo)')
+    arg_parser.add_argument('--engine', choices=ENGINES, default='closures',
+                            help='Motor de ejecución')
+    arg_parser.add_argument('--no-memory', dest='memory', action='store_false',
+                            help='No medir el pico de memoria')
+    arg_parser.add_argument('-o', '--output', help='Guardar los resultados en JSON')
+    arg_parser.add_argument('--compare', nargs='+', metavar=('BASE', 'ACTUAL'),
+                            help='Comparar con una línea base (y opcionalmente otro JSON)')
+    arg_parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                            help=f'Cambio relativo que cuenta como regresión (por defecto: {THRESHOLD})')
+    args = arg_parser.parse_args()
+
+    workloads = [w for w in args.workloads.split(',') if w]
+    for workload in workloads:
+        if workload not in WORKLOADS:
+            arg_parser.error(f"Carga desconocida: '{workload}'")
+    if args.compare and len(args.compare) > 2:
+        arg_parser.error("--compare recibe BASE y opcionalmente ACTUAL")
+
+    if args.compare and len(args.compare) == 2:
+        current = load(args.compare[1])
+    else:
+        current = run_suite(workloads, args.sizes.split(','), args.seed, args.repeat,
+                            args.engine, args.memory)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(current, f, indent=2)
+        elif not args.compare:
+            json.dump(current, sys.stdout, indent=2)
+            print()
+
+    if args.compare:
+        regressions = compare(load(args.compare[0]), current, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regresiones:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            sys.exit(1)
+        print("\nSin regresiones", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+import suite
+import bytecode
+import interpreter
+from compiler import MAX_CLOSURE_DEPTH
+from interpreter import Interpreter
+from parser import parse
+from resolver import resolve
+
+
+class SuiteTest(unittest.TestCase):
+    """Tests de humo del benchmark: cada carga se genera, mide y compara"""
+
+    def test_workload_requires_statement(self):
+        """Una carga sin statement() falla al crearse"""
+        class Incomplete(suite.Workload):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete(0)
+
+    def test_deep_passes_fallback(self):
+        """Deep genera sentencias más profundas que MAX_CLOSURE_DEPTH"""
+        statements = parse(suite.generate('deep', 2048)).statements
+        depths = [resolve(stmt).depth for stmt in statements]
+        self.assertTrue(any(depth > MAX_CLOSURE_DEPTH for depth in depths))
+        self.assertTrue(any(depth <= MAX_CLOSURE_DEPTH for depth in depths))
+
+    def test_run_uses_engine(self):
+        """La fase run compila con el motor elegido en vez de recorrer con walk()"""
+        ast = parse(suite.generate('deep', 2048))
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        try:
+            with mock.patch('interpreter.compile_node', wraps=interpreter.compile_node) as compile_node, \
+                    mock.patch('bytecode.compile_bytecode', wraps=bytecode.compile_bytecode) as fallback, \
+                    mock.patch.object(Interpreter, 'walk') as walk:
+                suite.run_phase(ast, 'closures', devnull)
+        finally:
+            os.close(devnull)
+        compile_node.assert_called_once_with(ast, 'closures')
+        fallback.assert_called_once_with(ast)
+        walk.assert_not_called()
+
+    def test_all_workloads_tiny(self):
+        """Todas las cargas se miden con un tamaño mínimo y sin regresiones contra sí mismas"""
+        with mock.patch.object(suite, 'MIN_SAMPLE_SECONDS', 0):
+            results = suite.run_suite(list(suite.WORKLOADS), ['2KB'], seed=0, repeat=1,
+                                      engine='closures', memory=True, log=io.StringIO())
+        self.assertEqual([r['workload'] for r in results['results']], list(suite.WORKLOADS))
+        for result in results['results']:
+            self.assertGreater(result['nodes'], 0, result['workload'])
+            self.assertIn('run_peak_bytes', result)
+        with mock.patch('sys.stdout', io.StringIO()):
+            self.assertEqual(suite.compare(results, results), [])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
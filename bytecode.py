@@ -0,0 +1,298 @@
+from __future__ import annotations
+import marshal
+import operator
+from array import array
+from errors import RuntimeError
+from resolver import SlotTable, UNDEFINED
+from parser import (
+    ProgramNode, NumberNode, IdNode, BinOpNode,
+    UnaryOpNode, AssignNode, PrintNode
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Tuple
+
+
+# ==================== INSTRUCCIONES ====================
+
+# Cada instrucción ocupa dos enteros en el arreglo: (opcode, argumento)
+LOAD_CONST = 0           # apila consts[arg]
+LOAD_SLOT = 1            # apila slots[arg] (variable names[arg])
+STORE_SLOT = 2           # slots[arg] = tope (sin desapilar)
+BINARY_OP = 3            # aplica BINARY_FUNCS[arg] a los dos topes
+BINARY_DIV = 4           # división entera con control de división por cero
+UNARY_OP = 5             # aplica UNARY_FUNCS[arg] al tope
+JUMP_IF_FALSE_OR_POP = 6  # si el tope es falso salta a arg, si no lo desapila
+JUMP_IF_TRUE_OR_POP = 7   # si el tope es verdadero salta a arg, si no lo desapila
+PRINT = 8                # desapila y emite el valor; el resultado pasa a None
+POP_RESULT = 9           # desapila el tope como resultado de la sentencia
+
+OPNAMES = (
+    'LOAD_CONST', 'LOAD_SLOT', 'STORE_SLOT', 'BINARY_OP', 'BINARY_DIV',
+    'UNARY_OP', 'JUMP_IF_FALSE_OR_POP', 'JUMP_IF_TRUE_OR_POP', 'PRINT',
+    'POP_RESULT',
+)
+
+BINARY_SYMBOLS = ('+', '-', '*', '==', '!=', '<', '>', '<=', '>=')
+BINARY_FUNCS: Tuple[Callable[[Any, Any], Any], ...] = (
+    operator.add, operator.sub, operator.mul,
+    operator.eq, operator.ne, operator.lt,
+    operator.gt, operator.le, operator.ge,
+)
+
+UNARY_SYMBOLS = ('-', 'not')
+UNARY_FUNCS: Tuple[Callable[[Any], Any], ...] = (operator.neg, operator.not_)
+
+# Tarea interna del compilador: fija el destino del último salto pendiente
+_JUMP_TARGET = -1
+
+# Instrucciones por operador binario: (antes del operando derecho, después)
+_BINARY_INSTRUCTIONS = {
+    symbol: (None, (BINARY_OP, index)) for index, symbol in enumerate(BINARY_SYMBOLS)
+}
+_BINARY_INSTRUCTIONS['/'] = (None, (BINARY_DIV, 0))
+_BINARY_INSTRUCTIONS['and'] = ((JUMP_IF_FALSE_OR_POP, 0), (_JUMP_TARGET, 0))
+_BINARY_INSTRUCTIONS['or'] = ((JUMP_IF_TRUE_OR_POP, 0), (_JUMP_TARGET, 0))
+
+_UNARY_INSTRUCTIONS = {
+    symbol: (UNARY_OP, index) for index, symbol in enumerate(UNARY_SYMBOLS)
+}
+
+# Versión del formato serializado; cambiarla invalida los binarios anteriores
+FORMAT_VERSION = 1
+
+
+# ==================== CÓDIGO COMPILADO ====================
+
+class Code:
+    """Programa compilado: instrucciones planas, constantes y nombres"""
+
+    def __init__(self, code: array, consts: List[Any], names: List[str]):
+        self.code = code
+        self.consts = consts
+        self.names = names
+        self._ops = None  # Copia en lista de `code` para el bucle de ejecución
+        # Carga y volcado de variables, igual que en el motor de clausuras;
+        # solo se vuelcan a env los slots que el programa asigna
+        assigned = sorted({code[pc + 1] for pc in range(0, len(code), 2)
+                           if code[pc] == STORE_SLOT})
+        self.slots = SlotTable(names, assigned)
+
+    def execute(self, env: Dict[str, Any], emit: Callable[[Any], None]) -> Any:
+        """
+        Ejecuta las instrucciones sobre `env` y retorna el último valor.
+
+        Las variables se cargan de `env` a una lista de slots al empezar y
+        las asignadas se vuelcan a `env` al terminar, incluso si hay error
+        (ver resolver.SlotTable).
+        """
+        table = self.slots
+        slots = table.load(env)
+        try:
+            return self._run(slots, emit)
+        finally:
+            table.store(slots, env)
+
+    def _run(self, slots: List[Any], emit: Callable[[Any], None]) -> Any:
+        """Bucle de despacho de instrucciones"""
+        ops = self._ops
+        if ops is None:
+            ops = self._ops = self.code.tolist()
+        consts = self.consts
+        names = self.names
+        undefined = UNDEFINED
+        binary_funcs = BINARY_FUNCS
+        unary_funcs = UNARY_FUNCS
+
+        stack: List[Any] = []
+        push = stack.append
+        pop = stack.pop
+        result = None
+        pc = 0
+        end = len(ops)
+
+        while pc < end:
+            op = ops[pc]
+            arg = ops[pc + 1]
+            pc += 2
+
+            if op == LOAD_SLOT:
+                value = slots[arg]
+                if value is undefined:
+                    raise RuntimeError(f"Variable no definida: '{names[arg]}'")
+                push(value)
+            elif op == LOAD_CONST:
+                push(consts[arg])
+            elif op == BINARY_OP:
+                right = pop()
+                stack[-1] = binary_funcs[arg](stack[-1], right)
+            elif op == UNARY_OP:
+                stack[-1] = unary_funcs[arg](stack[-1])
+            elif op == STORE_SLOT:
+                slots[arg] = stack[-1]
+            elif op == POP_RESULT:
+                result = pop()
+            elif op == BINARY_DIV:
+                right = pop()
+                if right == 0:
+                    raise RuntimeError("División por cero")
+                stack[-1] = stack[-1] // right  # División entera
+            elif op == JUMP_IF_FALSE_OR_POP:
+                if not stack[-1]:
+                    pc = arg
+                else:
+                    pop()
+            elif op == JUMP_IF_TRUE_OR_POP:
+                if stack[-1]:
+                    pc = arg
+                else:
+                    pop()
+            elif op == PRINT:
+                emit(pop())
+                result = None
+            else:
+                raise RuntimeError(f"Instrucción desconocida: {op}")
+
+        return result
+
+    # ---------- Serialización ----------
+
+    def to_bytes(self) -> bytes:
+        """Serializa el código a un bloque binario compacto"""
+        return marshal.dumps((FORMAT_VERSION, self.code.tobytes(), self.consts, self.names))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Code':
+        """Reconstruye un Code serializado con to_bytes()"""
+        try:
+            version, raw, consts, names = marshal.loads(data)
+        except (EOFError, ValueError, TypeError) as e:
+            raise ValueError(f"Bytecode inválido: {e}") from None
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Versión de bytecode no soportada: {version}")
+        code = array('i')
+        code.frombytes(raw)
+        return cls(code, list(consts), list(names))
+
+    def disassemble(self) -> List[str]:
+        """Retorna las instrucciones en formato legible (para debug)"""
+        lines = []
+        for pc in range(0, len(self.code), 2):
+            op, arg = self.code[pc], self.code[pc + 1]
+            name = OPNAMES[op]
+            if op == LOAD_CONST:
+                detail = repr(self.consts[arg])
+            elif op in (LOAD_SLOT, STORE_SLOT):
+                detail = self.names[arg]
+            elif op == BINARY_OP:
+                detail = BINARY_SYMBOLS[arg]
+            elif op == UNARY_OP:
+                detail = UNARY_SYMBOLS[arg]
+            elif op in (JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP):
+                detail = f"-> {arg}"
+            else:
+                detail = ""
+            lines.append(f"{pc:6} {name:22} {detail}".rstrip())
+        return lines
+
+
+# ==================== COMPILADOR A BYTECODE ====================
+
+class BytecodeCompiler:
+    """Traduce el AST a instrucciones de una máquina de pila"""
+
+    def __init__(self):
+        self.code = array('i')
+        self.consts: List[Any] = []
+        self.slots = SlotTable()  # Tabla de variables -> slots
+        self._const_index: Dict[Any, int] = {}
+
+    def emit(self, op: int, arg: int = 0) -> int:
+        """Agrega una instrucción y retorna su posición"""
+        pos = len(self.code)
+        self.code.append(op)
+        self.code.append(arg)
+        return pos
+
+    def const(self, value: Any) -> int:
+        # La clave incluye el tipo para no confundir True con 1
+        key = (type(value), value)
+        index = self._const_index.get(key)
+        if index is None:
+            index = self._const_index[key] = len(self.consts)
+            self.consts.append(value)
+        return index
+
+    def compile(self, node) -> Code:
+        """Compila un programa, sentencia o expresión"""
+        statements = node.statements if isinstance(node, ProgramNode) else [node]
+        for stmt in statements:
+            self.compile_statement(stmt)
+        return Code(self.code, self.consts, self.slots.names)
+
+    def compile_statement(self, node) -> None:
+        if isinstance(node, AssignNode):
+            self.compile_expr(node.value)
+            self.emit(STORE_SLOT, self.slots.slot(node.name))
+            self.emit(POP_RESULT)
+        elif isinstance(node, PrintNode):
+            self.compile_expr(node.expr)
+            self.emit(PRINT)
+        else:
+            self.compile_expr(node)
+            self.emit(POP_RESULT)
+
+    def compile_expr(self, node) -> None:
+        """
+        Compila una expresión en orden posfijo.
+
+        Usa una pila de trabajo explícita en lugar de recursión, de modo que
+        expresiones con cientos de miles de niveles de anidamiento no agotan
+        el límite de recursión de Python.
+        """
+        code = self.code
+        append = code.append
+        const = self.const
+        slot = self.slots.slot
+        jumps: List[int] = []  # Saltos de and/or pendientes de destino
+        # Tareas: un nodo a compilar, o una instrucción (opcode, argumento)
+        work: List[Any] = [node]
+        push = work.append
+
+        while work:
+            task = work.pop()
+
+            if type(task) is tuple:
+                op, arg = task
+                if op == _JUMP_TARGET:
+                    code[jumps.pop() + 1] = len(code)
+                    continue
+                if op == JUMP_IF_FALSE_OR_POP or op == JUMP_IF_TRUE_OR_POP:
+                    jumps.append(len(code))
+                append(op)
+                append(arg)
+            elif isinstance(task, NumberNode):
+                append(LOAD_CONST)
+                append(const(task.value))
+            elif isinstance(task, IdNode):
+                append(LOAD_SLOT)
+                append(slot(task.name))
+            elif isinstance(task, BinOpNode):
+                instructions = _BINARY_INSTRUCTIONS[task.op]
+                # Se apilan al revés: izquierdo, [salto], derecho, operación
+                push(instructions[1])
+                push(task.right)
+                if instructions[0] is not None:
+                    push(instructions[0])
+                push(task.left)
+            elif isinstance(task, UnaryOpNode):
+                push(_UNARY_INSTRUCTIONS[task.op])
+                push(task.operand)
+            else:
+                raise RuntimeError(f"No se puede evaluar el nodo: {type(task).__name__}")
+
+
+def compile_bytecode(node) -> Code:
+    """Función de conveniencia: compila un nodo AST a bytecode"""
+    return BytecodeCompiler().compile(node)
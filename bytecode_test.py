@@ -0,0 +1,138 @@
+import sys
+import unittest
+from bytecode import (
+    compile_bytecode, Code,
+    JUMP_IF_FALSE_OR_POP, JUMP_IF_TRUE_OR_POP
+)
+from errors import RuntimeError
+from interpreter import Interpreter, interpret
+from parser import parse, ProgramNode, NumberNode, IdNode, BinOpNode, UnaryOpNode
+
+
+class BytecodeTest(unittest.TestCase):
+    """Tests unitarios para el compilador a bytecode y la máquina virtual"""
+
+    def execute(self, code, env=None):
+        env = dict(env or {})
+        output = []
+        result = compile_bytecode(parse(code)).execute(env, output.append)
+        return result, env, output
+
+    # ---------- Equivalencia con el recorrido del árbol ----------
+
+    def test_matches_tree_walker(self):
+        """La VM produce lo mismo que los métodos eval_*"""
+        programs = [
+            "1 + 2 * 3;",
+            "(1 + 2) * 3 - 4 / 3;",
+            "--5;",
+            "not 0 or 1 and 0;",
+            "0 and 1 or 2;",
+            "5 >= 5 and 3 != 4;",
+            "x = 10; y = x * 2; print(y); y > x;",
+            "print(1); print(2);",
+        ]
+        for code in programs:
+            walker = Interpreter()
+            expected = walker.visit(parse(code))
+            result, env, output = self.execute(code)
+            self.assertEqual(result, expected, code)
+            self.assertEqual(env, walker.env, code)
+            self.assertEqual(output, walker.output, code)
+
+    def test_true_is_not_one(self):
+        """El pool de constantes distingue True de 1"""
+        result, _, _ = self.execute("(1 < 2) == 1; 1 < 2;")
+        self.assertIs(result, True)
+
+    # ---------- Instrucciones ----------
+
+    def test_and_or_become_jumps(self):
+        """and/or se traducen a saltos condicionales"""
+        code = compile_bytecode(parse("a and b or c;")).code
+        ops = code[0::2]
+        self.assertIn(JUMP_IF_FALSE_OR_POP, ops)
+        self.assertIn(JUMP_IF_TRUE_OR_POP, ops)
+
+    def test_short_circuit(self):
+        """El lado derecho no se evalúa si no hace falta"""
+        result, _, _ = self.execute("0 and 1 / 0;")
+        self.assertEqual(result, 0)
+        result, _, _ = self.execute("2 or y;")
+        self.assertEqual(result, 2)
+
+    def test_division_by_zero(self):
+        """Error: división por cero"""
+        with self.assertRaises(RuntimeError):
+            self.execute("10 / 0;")
+
+    def test_undefined_variable(self):
+        """Error: variable no definida"""
+        with self.assertRaises(RuntimeError):
+            self.execute("x + 5;")
+
+    # ---------- Serialización ----------
+
+    def test_round_trip(self):
+        """to_bytes/from_bytes conservan el programa"""
+        code = compile_bytecode(parse("x = 3; print(x * 2 > 5 and x);"))
+        restored = Code.from_bytes(code.to_bytes())
+        self.assertEqual(list(restored.code), list(code.code))
+        output = []
+        restored.execute({}, output.append)
+        self.assertEqual(output, [3])
+
+    def test_invalid_bytes(self):
+        """Un binario corrupto produce ValueError"""
+        with self.assertRaises(ValueError):
+            Code.from_bytes(b"basura")
+
+    # ---------- Integración ----------
+
+    def test_interpret_engine(self):
+        """interpret() acepta el motor bytecode"""
+        interp = interpret("y = x + 10; print(y);", env={'x': 5}, engine='bytecode')
+        self.assertEqual(interp.env['y'], 15)
+        self.assertEqual(interp.output, [15])
+
+    def test_unknown_engine(self):
+        """Error: motor desconocido"""
+        with self.assertRaises(ValueError):
+            Interpreter('jit')
+
+
+class DeepTreeTest(unittest.TestCase):
+    """Árboles muy profundos se evalúan sin recursión"""
+
+    DEPTH = 100_000
+
+    def test_deep_unary_chain(self):
+        """------x con 100k niveles"""
+        node = IdNode('x')
+        for _ in range(self.DEPTH):
+            node = UnaryOpNode('-', node)
+        output = []
+        result = compile_bytecode(ProgramNode([node])).execute({'x': 7}, output.append)
+        self.assertEqual(result, 7)
+
+    def test_deep_nested_binops(self):
+        """(((1 + 1) + 1) ... ) y anidamiento por la derecha con and"""
+        left = NumberNode(1)
+        right = NumberNode(1)
+        for _ in range(self.DEPTH):
+            left = BinOpNode(left, '+', NumberNode(1))
+            right = BinOpNode(NumberNode(1), 'and', right)
+        code = compile_bytecode(ProgramNode([left, right]))
+        self.assertEqual(code.execute({}, print), 1)
+        self.assertEqual(Interpreter('bytecode').run(ProgramNode([left])), self.DEPTH + 1)
+
+    def test_default_engine_falls_back(self):
+        """El motor por defecto usa la VM para árboles profundos"""
+        node = NumberNode(0)
+        for _ in range(self.DEPTH):
+            node = BinOpNode(node, '-', NumberNode(1))
+        self.assertEqual(Interpreter().run(ProgramNode([node])), -self.DEPTH)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
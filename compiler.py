@@ -0,0 +1,170 @@
+from __future__ import annotations
+import gc
+import operator
+from errors import RuntimeError
+from parser import (
+    ProgramNode, NumberNode, IdNode, BinOpNode,
+    UnaryOpNode, AssignNode, PrintNode
+)
+from resolver import SlotTable, UNDEFINED, resolve
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List
+
+
+# ==================== TABLAS DE OPERADORES ====================
+
+# Operadores binarios resueltos a funciones de Python en tiempo de compilación
+BINARY_OPS: Dict[str, Callable[[Any, Any], Any]] = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '>': operator.gt,
+    '<=': operator.le,
+    '>=': operator.ge,
+}
+
+UNARY_OPS: Dict[str, Callable[[Any], Any]] = {
+    '-': operator.neg,
+    'not': operator.not_,
+}
+
+
+# ==================== COMPILADOR A CLAUSURAS ====================
+
+# Profundidad máxima del AST que se compila a clausuras anidadas; debe quedar
+# holgadamente por debajo de sys.getrecursionlimit()
+MAX_CLOSURE_DEPTH = 200
+
+
+def compile_ast(node) -> Callable[[Dict[str, Any], Callable[[Any], None]], Any]:
+    """
+    Compila un nodo AST a una clausura de Python.
+
+    El resultado se invoca como fn(env, emit): `env` es el diccionario de
+    variables y `emit` recibe cada valor impreso por `print`. Internamente
+    las variables viven en una lista de slots (ver resolver.py) que se carga
+    desde `env` al empezar y se vuelca a `env` al terminar.
+
+    Las clausuras se anidan igual que el árbol, así que un árbol más profundo
+    que MAX_CLOSURE_DEPTH se compila a bytecode, cuya compilación y ejecución
+    no usan recursión.
+
+    Como en filecache.decode_program, el recolector de ciclos se pausa
+    mientras se crean las clausuras: con programas grandes sus pasadas
+    completas hacían la compilación más que lineal.
+    """
+    table = resolve(node)
+    if table.depth > MAX_CLOSURE_DEPTH:
+        from bytecode import compile_bytecode  # Solo la cargan los árboles profundos
+        return compile_bytecode(node).execute
+
+    statements = node.statements if isinstance(node, ProgramNode) else [node]
+    paused = gc.isenabled()
+    if paused:
+        gc.disable()
+    try:
+        compiled = tuple(_compile_statement(stmt, table) for stmt in statements)
+    finally:
+        if paused:
+            gc.enable()
+    load = table.load
+    store = table.store
+
+    def program(env, emit):
+        slots = load(env)
+        result = None
+        try:
+            for stmt in compiled:
+                result = stmt(slots, emit)
+        finally:
+            store(slots, env)
+        return result
+    return program
+
+
+def _compile_statement(node, table: SlotTable) -> Callable[[List[Any], Callable[[Any], None]], Any]:
+    """Compila una sentencia a una clausura fn(slots, emit) -> valor"""
+    if isinstance(node, AssignNode):
+        index = table.slot(node.name)
+        value = _compile_expr(node.value, table)
+
+        def assign(slots, emit):
+            slots[index] = result = value(slots)
+            return result
+        return assign
+
+    if isinstance(node, PrintNode):
+        expr = _compile_expr(node.expr, table)
+
+        def print_(slots, emit):
+            emit(expr(slots))
+        return print_
+
+    expr = _compile_expr(node, table)
+
+    def expression(slots, emit):
+        return expr(slots)
+    return expression
+
+
+def _compile_expr(node, table: SlotTable) -> Callable[[List[Any]], Any]:
+    """Compila una expresión a una clausura fn(slots) -> valor"""
+    if isinstance(node, NumberNode):
+        value = node.value
+        return lambda slots: value
+
+    if isinstance(node, IdNode):
+        name = node.name
+        index = table.slot(name)
+
+        def load(slots):
+            value = slots[index]
+            if value is UNDEFINED:
+                raise RuntimeError(f"Variable no definida: '{name}'")
+            return value
+        return load
+
+    if isinstance(node, BinOpNode):
+        left = _compile_expr(node.left, table)
+        right = _compile_expr(node.right, table)
+        op = node.op
+
+        if op == 'and':
+            def and_(slots):
+                value = left(slots)
+                if not value:
+                    return value
+                return right(slots)
+            return and_
+
+        if op == 'or':
+            def or_(slots):
+                value = left(slots)
+                if value:
+                    return value
+                return right(slots)
+            return or_
+
+        if op == '/':
+            def div(slots):
+                lhs = left(slots)
+                rhs = right(slots)
+                if rhs == 0:
+                    raise RuntimeError("División por cero")
+                return lhs // rhs  # División entera
+            return div
+
+        func = BINARY_OPS[op]
+        return lambda slots: func(left(slots), right(slots))
+
+    if isinstance(node, UnaryOpNode):
+        operand = _compile_expr(node.operand, table)
+        func = UNARY_OPS[node.op]
+        return lambda slots: func(operand(slots))
+
+    raise RuntimeError(f"No se puede evaluar el nodo: {type(node).__name__}")
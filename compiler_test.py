@@ -0,0 +1,80 @@
+import sys
+import unittest
+from compiler import compile_ast
+from errors import RuntimeError
+from interpreter import Interpreter
+from parser import parse
+
+
+class CompilerTest(unittest.TestCase):
+    """Tests unitarios para el compilador a clausuras"""
+
+    def execute(self, code, env=None):
+        env = dict(env or {})
+        output = []
+        result = compile_ast(parse(code))(env, output.append)
+        return result, env, output
+
+    # ---------- Equivalencia con el recorrido del árbol ----------
+
+    def test_matches_tree_walker(self):
+        """Las clausuras producen lo mismo que los métodos eval_*"""
+        programs = [
+            "1 + 2 * 3;",
+            "(1 + 2) * 3 - 4 / 3;",
+            "--5;",
+            "not 0 or 1 and 0;",
+            "5 >= 5 and 3 != 4;",
+            "x = 10; y = x * 2; print(y); y > x;",
+        ]
+        for code in programs:
+            walker = Interpreter()
+            expected = walker.visit(parse(code))
+            result, env, output = self.execute(code)
+            self.assertEqual(result, expected, code)
+            self.assertEqual(env, walker.env, code)
+            self.assertEqual(output, walker.output, code)
+
+    def test_reusable(self):
+        """Un programa compilado se puede ejecutar varias veces"""
+        program = compile_ast(parse("y = x * 2; y;"))
+        self.assertEqual(program({'x': 3}, print), 6)
+        self.assertEqual(program({'x': 5}, print), 10)
+
+    # ---------- Semántica ----------
+
+    def test_short_circuit_and(self):
+        """and no evalúa el lado derecho si el izquierdo es falso"""
+        result, _, _ = self.execute("0 and 1 / 0;")
+        self.assertEqual(result, 0)
+
+    def test_short_circuit_or(self):
+        """or no evalúa el lado derecho si el izquierdo es verdadero"""
+        result, _, _ = self.execute("3 or y;")
+        self.assertEqual(result, 3)
+
+    def test_integer_division(self):
+        """La división es entera"""
+        result, _, _ = self.execute("-7 / 2;")
+        self.assertEqual(result, -4)
+
+    def test_division_by_zero(self):
+        """Error: división por cero"""
+        with self.assertRaises(RuntimeError):
+            self.execute("10 / (2 - 2);")
+
+    def test_undefined_variable(self):
+        """Error: variable no definida"""
+        with self.assertRaises(RuntimeError) as ctx:
+            self.execute("x + 1;")
+        self.assertIn("'x'", str(ctx.exception))
+
+    def test_print_returns_none(self):
+        """print emite el valor y la sentencia vale None"""
+        result, _, output = self.execute("print(7);")
+        self.assertIsNone(result)
+        self.assertEqual(output, [7])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
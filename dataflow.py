@@ -0,0 +1,264 @@
+from __future__ import annotations
+from parser import (
+    ProgramNode, NumberNode, IdNode, BinOpNode,
+    UnaryOpNode, AssignNode, PrintNode
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Set, Tuple
+
+
+# ==================== UTILIDADES ====================
+
+def expr_key(node, numbers: Dict[Tuple, int]) -> Tuple:
+    """
+    Clave estructural de una expresión: dos expresiones con la misma clave
+    producen el mismo valor si sus variables no cambiaron.
+
+    Los operandos entran en la clave por su número en `numbers` (que asigna
+    un entero a cada clave nueva), así que la clave es una tupla plana aunque
+    el árbol sea profundo. Solo son comparables las claves calculadas con el
+    mismo `numbers`.
+    """
+    return expr_keys(node, numbers)[id(node)]
+
+
+def expr_keys(node, numbers: Dict[Tuple, int]) -> Dict[int, Tuple]:
+    """Claves (ver expr_key) de una expresión y de todas sus subexpresiones, por id"""
+    keys: Dict[int, Tuple] = {}
+    # Orden posfijo con una pila explícita: (nodo, hijos ya apilados)
+    pending = [(node, False)]
+    while pending:
+        node, expanded = pending.pop()
+        kind = type(node)
+        if kind is BinOpNode:
+            if not expanded:
+                pending.append((node, True))
+                pending.append((node.right, False))
+                pending.append((node.left, False))
+                continue
+            key = ('bin', node.op, _number(numbers, keys[id(node.left)]),
+                   _number(numbers, keys[id(node.right)]))
+        elif kind is UnaryOpNode:
+            if not expanded:
+                pending.append((node, True))
+                pending.append((node.operand, False))
+                continue
+            key = ('un', node.op, _number(numbers, keys[id(node.operand)]))
+        elif kind is NumberNode:
+            # El tipo distingue True de 1
+            key = ('num', type(node.value), node.value)
+        elif kind is IdNode:
+            key = ('id', node.name)
+        else:
+            key = ('other', id(node))
+        keys[id(node)] = key
+    return keys
+
+
+def _number(numbers: Dict[Tuple, int], key: Tuple) -> int:
+    number = numbers.get(key)
+    if number is None:
+        number = numbers[key] = len(numbers)
+    return number
+
+
+def reads(node) -> Set[str]:
+    """Variables leídas por una expresión"""
+    names = set()
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, IdNode):
+            names.add(node.name)
+        elif isinstance(node, BinOpNode):
+            pending.append(node.left)
+            pending.append(node.right)
+        elif isinstance(node, UnaryOpNode):
+            pending.append(node.operand)
+    return names
+
+
+def may_fail(node, defined: Set[str]) -> bool:
+    """
+    Indica si evaluar la expresión podría lanzar un error: lee una variable
+    que no se sabe definida o divide por algo que no es un literal distinto
+    de cero.
+    """
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, IdNode):
+            if node.name not in defined:
+                return True
+        elif isinstance(node, BinOpNode):
+            if node.op == '/' and not (isinstance(node.right, NumberNode) and node.right.value != 0):
+                return True
+            pending.append(node.left)
+            pending.append(node.right)
+        elif isinstance(node, UnaryOpNode):
+            pending.append(node.operand)
+    return False
+
+
+# ==================== SUBEXPRESIONES COMUNES ====================
+
+class CommonSubexpressionEliminator:
+    """
+    Reutiliza el valor de expresiones ya asignadas a una variable.
+
+    Tras `y = a * b + c;`, cualquier aparición posterior de `a * b + c`
+    (completa o como subexpresión) se reemplaza por `y` mientras no se
+    reasigne ni `y` ni ninguna de `a`, `b`, `c`. Las expresiones del lenguaje
+    no tienen efectos secundarios, así que el valor guardado es el mismo que
+    se obtendría al reevaluarlas.
+    """
+
+    def __init__(self):
+        self.available: Dict[Tuple, str] = {}     # clave -> variable que la contiene
+        self.dependents: Dict[str, Set[Tuple]] = {}  # variable -> claves que invalida
+        self.numbers: Dict[Tuple, int] = {}       # clave -> número (ver expr_key)
+
+    def run(self, program: ProgramNode) -> ProgramNode:
+        statements = []
+        for stmt in program.statements:
+            if isinstance(stmt, AssignNode):
+                keys = expr_keys(stmt.value, self.numbers)
+                value = self.rewrite(stmt.value, keys)
+                self.kill(stmt.name)
+                self.record(stmt.value, stmt.name, keys)
+                statements.append(stmt if value is stmt.value else AssignNode(stmt.name, value))
+            elif isinstance(stmt, PrintNode):
+                expr = self.rewrite(stmt.expr)
+                statements.append(stmt if expr is stmt.expr else PrintNode(expr))
+            else:
+                statements.append(self.rewrite(stmt))
+        return ProgramNode(statements)
+
+    def rewrite(self, node, keys: Dict[int, Tuple] = None) -> Any:
+        """
+        Reemplaza las subexpresiones disponibles por la variable que las contiene.
+
+        Reconstruye en orden posfijo con una pila explícita; no baja a las
+        subexpresiones de una expresión que se reemplaza entera.
+        """
+        if not self.available or not isinstance(node, (BinOpNode, UnaryOpNode)):
+            return node
+        if keys is None:
+            keys = expr_keys(node, self.numbers)
+        available = self.available
+        values: list = []
+        # (nodo, hijos ya reescritos en `values`)
+        pending = [(node, False)]
+        while pending:
+            node, expanded = pending.pop()
+            kind = type(node)
+            if kind is BinOpNode:
+                if expanded:
+                    right = values.pop()
+                    left = values.pop()
+                    if left is not node.left or right is not node.right:
+                        node = BinOpNode(left, node.op, right)
+                    values.append(node)
+                    continue
+            elif kind is UnaryOpNode:
+                if expanded:
+                    operand = values.pop()
+                    if operand is not node.operand:
+                        node = UnaryOpNode(node.op, operand)
+                    values.append(node)
+                    continue
+            else:
+                values.append(node)
+                continue
+
+            holder = available.get(keys[id(node)])
+            if holder is not None:
+                values.append(IdNode(holder))
+            elif kind is BinOpNode:
+                pending.append((node, True))
+                pending.append((node.right, False))
+                pending.append((node.left, False))
+            else:
+                pending.append((node, True))
+                pending.append((node.operand, False))
+        return values[-1]
+
+    def kill(self, name: str) -> None:
+        """Invalida lo que depende de una variable reasignada"""
+        for key in self.dependents.pop(name, ()):
+            self.available.pop(key, None)
+
+    def record(self, value, name: str, keys: Dict[int, Tuple] = None) -> None:
+        if not isinstance(value, (BinOpNode, UnaryOpNode)):
+            return
+        inputs = reads(value)
+        if name in inputs:
+            # En `x = x + 1` la expresión usa el valor anterior de x
+            return
+        key = keys[id(value)] if keys is not None else expr_key(value, self.numbers)
+        self.available[key] = name
+        for var in inputs | {name}:
+            self.dependents.setdefault(var, set()).add(key)
+
+
+# ==================== ASIGNACIONES MUERTAS ====================
+
+def eliminate_dead_stores(program: ProgramNode) -> ProgramNode:
+    """
+    Elimina asignaciones que se sobrescriben antes de ser leídas.
+
+    La última asignación de cada variable se conserva porque el entorno final
+    es observable. Si la expresión de una asignación eliminada podría fallar
+    (división, variable posiblemente indefinida) se conserva como sentencia
+    de expresión para no ocultar el error.
+
+    El entorno que queda tras un error también es observable, así que una
+    sentencia que podría fallar es una barrera: las asignaciones anteriores
+    a ella se conservan aunque se sobrescriban después.
+    """
+    statements = program.statements
+
+    # Una sola pasada hacia delante: si cada sentencia podría fallar con las
+    # variables definidas hasta ese punto
+    failing: List[bool] = []
+    defined: Set[str] = set()
+    for stmt in statements:
+        if isinstance(stmt, AssignNode):
+            failing.append(may_fail(stmt.value, defined))
+            defined.add(stmt.name)
+        elif isinstance(stmt, PrintNode):
+            failing.append(may_fail(stmt.expr, defined))
+        else:
+            failing.append(may_fail(stmt, defined))
+
+    # Recorrido hacia atrás: `overwritten` son las variables que se vuelven
+    # a asignar más adelante sin ser leídas antes ni pasar por una barrera
+    overwritten: Set[str] = set()
+    result = []
+    for index in range(len(statements) - 1, -1, -1):
+        stmt = statements[index]
+        if isinstance(stmt, AssignNode):
+            if stmt.name in overwritten:
+                overwritten -= reads(stmt.value)
+                if failing[index]:
+                    result.append(stmt.value)
+                    overwritten.clear()
+                continue
+            overwritten.add(stmt.name)
+            overwritten -= reads(stmt.value)
+        elif isinstance(stmt, PrintNode):
+            overwritten -= reads(stmt.expr)
+        else:
+            overwritten -= reads(stmt)
+        if failing[index]:
+            overwritten.clear()
+        result.append(stmt)
+    result.reverse()
+    return ProgramNode(result)
+
+
+def eliminate_common_subexpressions(program: ProgramNode) -> ProgramNode:
+    """Función de conveniencia: aplica CommonSubexpressionEliminator"""
+    return CommonSubexpressionEliminator().run(program)
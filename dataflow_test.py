@@ -0,0 +1,147 @@
+import sys
+import unittest
+from dataflow import eliminate_common_subexpressions, eliminate_dead_stores
+from errors import RuntimeError
+from interpreter import Interpreter, interpret, compile_program
+from optimizer import optimize
+from parser import parse, IdNode, BinOpNode, PrintNode
+
+
+class CommonSubexpressionTest(unittest.TestCase):
+    """Tests unitarios para la eliminación de subexpresiones comunes"""
+
+    def test_reuse_assigned_expression(self):
+        """Una expresión repetida se reemplaza por la variable que la contiene"""
+        ast = eliminate_common_subexpressions(parse("y = a * b + c; z = a * b + c;"))
+        self.assertIsInstance(ast.statements[1].value, IdNode)
+        self.assertEqual(ast.statements[1].value.name, 'y')
+
+    def test_reuse_as_subexpression(self):
+        """También se reutiliza dentro de expresiones mayores"""
+        ast = eliminate_common_subexpressions(parse("y = a * b; print(a * b + 1);"))
+        expr = ast.statements[1].expr
+        self.assertIsInstance(expr, BinOpNode)
+        self.assertEqual(expr.left.name, 'y')
+
+    def test_input_reassigned(self):
+        """No se reutiliza si una entrada cambió"""
+        ast = eliminate_common_subexpressions(parse("y = a * b; a = 2; z = a * b;"))
+        self.assertIsInstance(ast.statements[2].value, BinOpNode)
+
+    def test_holder_reassigned(self):
+        """No se reutiliza si la variable que la contenía cambió"""
+        ast = eliminate_common_subexpressions(parse("y = a * b; y = 0; z = a * b;"))
+        self.assertIsInstance(ast.statements[2].value, BinOpNode)
+
+    def test_self_reference(self):
+        """x = x + 1 no deja la expresión disponible"""
+        ast = eliminate_common_subexpressions(parse("x = x + 1; y = x + 1;"))
+        self.assertIsInstance(ast.statements[1].value, BinOpNode)
+
+    def test_deep_expression(self):
+        """Cadenas tan largas como acepta el parser, sin RecursionError"""
+        chain = " + ".join(["x"] * 20_000)
+        ast = eliminate_common_subexpressions(parse(f"y = {chain}; print(({chain}) * 2);"))
+        expr = ast.statements[1].expr
+        self.assertEqual((expr.left.name, expr.right.value), ('y', 2))
+
+
+class DeadStoreTest(unittest.TestCase):
+    """Tests unitarios para la eliminación de asignaciones muertas"""
+
+    def test_overwritten_store(self):
+        """Se elimina una asignación sobrescrita sin lectura"""
+        ast = eliminate_dead_stores(parse("x = 1; x = 2; print(x);"))
+        self.assertEqual(len(ast.statements), 2)
+        self.assertEqual(ast.statements[0].value.value, 2)
+
+    def test_read_keeps_store(self):
+        """Una asignación leída antes de sobrescribirse se conserva"""
+        ast = eliminate_dead_stores(parse("x = 1; print(x); x = 2;"))
+        self.assertEqual(len(ast.statements), 3)
+
+    def test_self_read_keeps_store(self):
+        """x = x + 1 lee la asignación anterior"""
+        ast = eliminate_dead_stores(parse("x = 1; x = x + 1;"))
+        self.assertEqual(len(ast.statements), 2)
+
+    def test_final_store_kept(self):
+        """La última asignación de cada variable se conserva"""
+        ast = eliminate_dead_stores(parse("x = 1; y = 2;"))
+        self.assertEqual(len(ast.statements), 2)
+
+    def test_failing_expression_kept(self):
+        """Una expresión que puede fallar se conserva sin la asignación"""
+        ast = eliminate_dead_stores(parse("x = 1 / q; x = 2;"))
+        self.assertEqual(len(ast.statements), 2)
+        self.assertIsInstance(ast.statements[0], BinOpNode)
+        with self.assertRaises(RuntimeError):
+            Interpreter().run(ast)
+
+    def test_store_before_failure_kept(self):
+        """Una asignación seguida de una sentencia que puede fallar se conserva"""
+        ast = eliminate_dead_stores(parse("a = 0; print(1 / q); a = y;"))
+        self.assertEqual(len(ast.statements), 3)
+
+    def test_env_after_error(self):
+        """Tras un error el entorno es el mismo con y sin optimizar"""
+        for code in ("a = 0; a = y;", "b = 1; c = 2 / q; b = 2;", "a = 1; a = 2; x; a = 3;"):
+            plain, optimized = Interpreter(), Interpreter()
+            with self.assertRaises(RuntimeError):
+                plain.run(parse(code))
+            with self.assertRaises(RuntimeError):
+                optimized.run(optimize(parse(code))[0])
+            self.assertEqual(optimized.env, plain.env, code)
+
+    def test_many_statements(self):
+        """Programas con muchas asignaciones distintas, en tiempo lineal"""
+        code = "w = 1;" + "".join(f"v{i} = {i} + w;" for i in range(10_000)) + "v0 = 1;"
+        ast = eliminate_dead_stores(parse(code))
+        self.assertEqual(len(ast.statements), 10_001)
+        self.assertEqual(ast.statements[1].name, 'v1')
+
+    def test_prints_kept(self):
+        """Los print nunca se eliminan"""
+        ast = eliminate_dead_stores(parse("print(1); x = 1; print(2); x = 2;"))
+        self.assertEqual(sum(isinstance(s, PrintNode) for s in ast.statements), 2)
+
+
+class DataflowProgramTest(unittest.TestCase):
+    """El programa optimizado conserva salida, entorno y valor final"""
+
+    def test_same_results(self):
+        code = """
+        t = 5;
+        y = a * b + c;
+        t = a * b + c;
+        z = (a * b + c) * 2;
+        print(z);
+        a = 10;
+        w = a * b + c;
+        w;
+        """
+        env = {'a': 2, 'b': 3, 'c': 1}
+        plain, optimized = Interpreter(), Interpreter()
+        plain.env.update(env)
+        optimized.env.update(env)
+        expected = plain.run(parse(code))
+        ast, removed = optimize(parse(code))
+        result = optimized.run(ast)
+        self.assertGreater(removed, 0)
+        self.assertEqual(result, expected)
+        self.assertEqual(optimized.output, plain.output)
+        self.assertEqual(optimized.env, plain.env)
+
+    def test_deep_program_optimized(self):
+        """interpret y compile_program con optimize=True aceptan árboles profundos"""
+        chain = " + ".join(["x"] * 20_000)
+        code = f"y = {chain}; z = {chain}; print(z - y); w = " + "-" * 20_000 + "x;"
+        interp = interpret(code, env={'x': 1}, optimize=True, cache=None)
+        self.assertEqual(interp.output, [0])
+        self.assertEqual(interp.env['w'], 1)
+        result = compile_program(code, optimize=True, cache=None)({'x': 2})
+        self.assertEqual(result.output, [0])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
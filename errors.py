@@ -0,0 +1,5 @@
+# ==================== ERRORES ====================
+
+class RuntimeError(Exception):
+    """Error en tiempo de ejecución del lenguaje (variable no definida, división por cero...)"""
+    pass
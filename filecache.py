@@ -0,0 +1,474 @@
+from __future__ import annotations
+import codecs
+import gc
+import marshal
+import os
+import struct
+import zlib
+from array import array
+from hashlib import sha256
+from parser import (
+    parse_stream, ProgramNode, NumberNode, IdNode, BinOpNode,
+    UnaryOpNode, AssignNode, PrintNode,
+    BINARY_OPERATORS, UNARY_OPERATORS
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# ==================== FORMATO ====================
+
+# Directorio de caché junto a cada archivo (como __pycache__)
+CACHE_DIR = '__interpcache__'
+
+# Versión del intérprete para la caché: cambiarla invalida todas las entradas.
+# Hay que incrementarla cuando cambian el parser, el optimizador o el formato.
+# 2: con -O cada sentencia se optimiza por separado (como en interpret_stream)
+# 3: el contenido es una secuencia de bloques de sentencias
+# 4: la longitud del contenido en la cabecera es de 64 bits
+CACHE_VERSION = 4
+
+# Tamaño de los trozos en que se leen el archivo fuente y las entradas
+CHUNK_SIZE = 1 << 16
+
+# Sentencias por bloque de una entrada: cada bloque se codifica y comprime
+# por separado, así que ni al escribir ni al leer se tiene el AST entero
+BLOCK_STATEMENTS = 4096
+
+MAGIC = b'IPC\x00'
+
+# Cabecera: magia, versión, versión de marshal, optimizado, hash del código,
+# longitud y CRC32 del contenido
+_HEADER = struct.Struct('<4sHHB32sQI')
+
+# El contenido es una secuencia de bloques: la longitud de cada uno y su
+# programa (ver encode_program) comprimido con zlib
+_BLOCK = struct.Struct('<I')
+
+# Codificación posfija del AST: una palabra (argumento << 3 | etiqueta) por
+# nodo, en el tipo de arreglo más chico en que caben todas
+_NUMBER = 0     # consts[arg]
+_ID = 1         # names[arg]
+_BINOP = 2      # código de operador binario; desapila derecho e izquierdo
+_UNARY = 3      # código de operador unario; desapila el operando
+_ASSIGN = 4     # names[arg]; desapila el valor
+_PRINT = 5      # desapila la expresión
+_PROGRAM = 6    # desapila arg sentencias
+
+_TAG_BITS = 3
+_TAG_MASK = (1 << _TAG_BITS) - 1
+
+
+# ==================== CODIFICACIÓN ====================
+
+def encode_program(node: ProgramNode) -> bytes:
+    """Serializa un AST en forma posfija (sin recursión)"""
+    ops: List[int] = []
+    append = ops.append
+    consts: List[Any] = []
+    const_index: Dict[Any, int] = {}
+    names: List[str] = []
+    name_index: Dict[str, int] = {}
+
+    def const(value):
+        # La clave incluye el tipo para no confundir True con 1
+        key = (type(value), value)
+        index = const_index.get(key)
+        if index is None:
+            index = const_index[key] = len(consts)
+            consts.append(value)
+        return index
+
+    def name(value):
+        index = name_index.get(value)
+        if index is None:
+            index = name_index[value] = len(names)
+            names.append(value)
+        return index
+
+    # Tareas: un nodo a codificar, o una palabra ya codificada a emitir
+    work: List[Any] = [node]
+    push = work.append
+    while work:
+        task = work.pop()
+        kind = type(task)
+        if kind is int:
+            append(task)
+        elif kind is NumberNode:
+            append(const(task.value) << _TAG_BITS | _NUMBER)
+        elif kind is IdNode:
+            append(name(task.name) << _TAG_BITS | _ID)
+        elif kind is BinOpNode:
+            push(task.opcode << _TAG_BITS | _BINOP)
+            push(task.right)
+            push(task.left)
+        elif kind is UnaryOpNode:
+            push(task.opcode << _TAG_BITS | _UNARY)
+            push(task.operand)
+        elif kind is AssignNode:
+            push(name(task.name) << _TAG_BITS | _ASSIGN)
+            push(task.value)
+        elif kind is PrintNode:
+            push(_PRINT)
+            push(task.expr)
+        elif kind is ProgramNode:
+            push(len(task.statements) << _TAG_BITS | _PROGRAM)
+            work.extend(reversed(task.statements))
+        else:
+            raise ValueError(f"No se puede serializar el nodo: {kind.__name__}")
+
+    largest = max(ops, default=0)
+    typecode = 'B' if largest < 1 << 8 else 'H' if largest < 1 << 16 else 'I'
+    return marshal.dumps((typecode, array(typecode, ops).tobytes(), consts, names))
+
+
+def decode_program(data: bytes) -> ProgramNode:
+    """
+    Reconstruye un AST serializado con encode_program().
+
+    El AST no tiene ciclos, así que el recolector de ciclos se pausa mientras
+    se crean los nodos: con árboles grandes sus pasadas completas costarían
+    más que la decodificación misma.
+    """
+    paused = gc.isenabled()
+    if paused:
+        gc.disable()
+    try:
+        typecode, raw, consts, names = marshal.loads(data)
+        if typecode not in ('B', 'H', 'I'):
+            raise ValueError(f"tipo de arreglo {typecode!r}")
+        ops = array(typecode)
+        ops.frombytes(raw)
+        stack: List[Any] = []
+        push = stack.append
+        pop = stack.pop
+        for word in ops:
+            tag = word & _TAG_MASK
+            arg = word >> _TAG_BITS
+            if tag == _NUMBER:
+                push(NumberNode(consts[arg]))
+            elif tag == _ID:
+                push(IdNode(names[arg]))
+            elif tag == _BINOP:
+                right = pop()
+                stack[-1] = BinOpNode(stack[-1], BINARY_OPERATORS[arg], right)
+            elif tag == _UNARY:
+                stack[-1] = UnaryOpNode(UNARY_OPERATORS[arg], stack[-1])
+            elif tag == _ASSIGN:
+                stack[-1] = AssignNode(names[arg], stack[-1])
+            elif tag == _PRINT:
+                stack[-1] = PrintNode(stack[-1])
+            elif tag == _PROGRAM:
+                if not 0 <= arg <= len(stack):
+                    raise ValueError("sentencias fuera de rango")
+                statements = stack[len(stack) - arg:]
+                del stack[len(stack) - arg:]
+                push(ProgramNode(statements))
+            else:
+                raise ValueError(f"etiqueta desconocida {tag}")
+    except (EOFError, ValueError, TypeError, IndexError) as e:
+        raise ValueError(f"Programa serializado inválido: {e}") from None
+    finally:
+        if paused:
+            gc.enable()
+
+    if len(stack) != 1 or type(stack[0]) is not ProgramNode:
+        raise ValueError("Programa serializado inválido: estructura incompleta")
+    return stack[0]
+
+
+# ==================== CACHÉ EN DISCO ====================
+
+def source_hash(source: bytes) -> bytes:
+    """Hash del contenido del código fuente (clave de la caché)"""
+    return sha256(source).digest()
+
+
+def cache_path(filename: str, optimize: bool = False, cache_dir: Optional[str] = None) -> str:
+    """
+    Ruta de la entrada de caché de un archivo.
+
+    Por defecto, en __interpcache__/ junto al archivo; con `cache_dir`,
+    en ese directorio, con el nombre derivado de la ruta absoluta para que
+    archivos homónimos no se pisen.
+    """
+    suffix = '.O.icache' if optimize else '.icache'
+    if cache_dir is None:
+        directory, base = os.path.split(os.path.abspath(filename))
+        return os.path.join(directory, CACHE_DIR, base + suffix)
+    path_key = sha256(os.path.abspath(filename).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{os.path.basename(filename)}-{path_key}{suffix}")
+
+
+def _read_chunks(f) -> Iterator[bytes]:
+    """Trozos de CHUNK_SIZE bytes de un archivo binario"""
+    return iter(lambda: f.read(CHUNK_SIZE), b'')
+
+
+def read_entry(path: str, digest: bytes, optimize: bool = False) -> Optional[Iterator[Any]]:
+    """
+    Abre una entrada de caché para leer sus sentencias bloque a bloque.
+
+    El contenido se valida antes de decodificar nada (se recorre por trozos
+    para calcular el CRC32, sin cargarlo entero), y los bloques se leen del
+    mismo descriptor: si otro proceso reemplaza la entrada mientras tanto, se
+    sigue leyendo la validada.
+
+    Returns:
+        Un generador de las sentencias, o None si la entrada no existe, es de
+        otra versión o de otro código fuente, o está corrupta
+    """
+    try:
+        f = open(path, 'rb')
+    except OSError:
+        return None
+    try:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            f.close()
+            return None
+        magic, version, marshal_version, optimized, stored_digest, length, crc = \
+            _HEADER.unpack(header)
+        if (magic != MAGIC or version != CACHE_VERSION or marshal_version != marshal.version
+                or optimized != optimize or stored_digest != digest):
+            f.close()
+            return None
+        actual_length = actual_crc = 0
+        for chunk in _read_chunks(f):
+            actual_length += len(chunk)
+            actual_crc = zlib.crc32(chunk, actual_crc)
+        if length != actual_length or crc != actual_crc:
+            f.close()
+            return None
+        f.seek(_HEADER.size)
+    except OSError:
+        f.close()
+        return None
+    return _read_blocks(f)
+
+
+def _read_blocks(f) -> Iterator[Any]:
+    """Genera las sentencias de los bloques de una entrada ya validada"""
+    with f:
+        while True:
+            prefix = f.read(_BLOCK.size)
+            if not prefix:
+                return
+            try:
+                size, = _BLOCK.unpack(prefix)
+                block = decode_program(zlib.decompress(f.read(size)))
+            except (struct.error, zlib.error) as e:
+                raise ValueError(f"Programa serializado inválido: {e}") from None
+            yield from block.statements
+
+
+def load_program(path: str, digest: bytes, optimize: bool = False) -> Optional[ProgramNode]:
+    """
+    Lee una entrada de caché completa (ver read_entry).
+
+    Retorna None si no existe, si es de otra versión o de otro código fuente,
+    o si está corrupta.
+    """
+    statements = read_entry(path, digest, optimize)
+    if statements is None:
+        return None
+    try:
+        return ProgramNode(list(statements))
+    except ValueError:
+        return None
+
+
+# Apertura exclusiva de los temporales: como open(), con permisos 0666 menos
+# la umask (mkstemp usaría 0600 y otros usuarios no leerían la entrada)
+_TEMP_FLAGS = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0)
+_TEMP_ATTEMPTS = 100
+
+
+def _create_temp(directory: str) -> Tuple[int, str]:
+    """Crea un temporal con nombre único en `directory`: (descriptor, ruta)"""
+    for _ in range(_TEMP_ATTEMPTS):
+        path = os.path.join(directory, f'.tmp-{os.urandom(8).hex()}')
+        try:
+            return os.open(path, _TEMP_FLAGS, 0o666), path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"No hay nombres temporales libres en '{directory}'")
+
+
+class EntryWriter:
+    """
+    Escribe una entrada de caché sentencia a sentencia.
+
+    Las sentencias se acumulan en bloques de BLOCK_STATEMENTS que se
+    codifican y comprimen por separado, así que la memoria no depende del
+    tamaño del programa. Se escribe en un archivo temporal del mismo
+    directorio (la cabecera, con la longitud y el CRC32 del contenido, se
+    completa al final) que commit() renombra: otro proceso nunca ve una
+    entrada a medio escribir. Los errores de escritura (directorio de solo
+    lectura, disco lleno) no son fatales: la entrada simplemente no se guarda.
+    """
+
+    def __init__(self, path: str, digest: bytes, optimize: bool = False):
+        self.path = path
+        self.digest = digest
+        self.optimize = optimize
+        self.pending: List[Any] = []  # Sentencias del bloque en curso
+        self.length = 0
+        self.crc = 0
+        self.file = None
+        self.temp_path: Optional[str] = None
+        try:
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            fd, self.temp_path = _create_temp(directory)
+            self.file = os.fdopen(fd, 'wb')
+            self.file.write(bytes(_HEADER.size))
+        except OSError:
+            self.discard()
+
+    def write(self, stmt: Any) -> None:
+        """Agrega una sentencia a la entrada"""
+        if self.file is None:
+            return
+        self.pending.append(stmt)
+        if len(self.pending) >= BLOCK_STATEMENTS:
+            self._flush()
+
+    def _flush(self) -> None:
+        block = zlib.compress(encode_program(ProgramNode(self.pending)), 1)
+        self.pending = []
+        try:
+            data = _BLOCK.pack(len(block)) + block
+            self.file.write(data)
+        except (OSError, struct.error):  # struct.error: bloque de 4 GiB o más
+            self.discard()
+            return
+        self.length += len(data)
+        self.crc = zlib.crc32(data, self.crc)
+
+    def commit(self) -> bool:
+        """
+        Completa la entrada y la publica.
+
+        Returns:
+            True si la entrada quedó guardada
+        """
+        if self.file is not None and self.pending:
+            self._flush()
+        if self.file is None:
+            return False
+        try:
+            self.file.seek(0)
+            self.file.write(_HEADER.pack(MAGIC, CACHE_VERSION, marshal.version, self.optimize,
+                                         self.digest, self.length, self.crc))
+            self.file.close()
+            self.file = None
+            os.replace(self.temp_path, self.path)
+        except (OSError, struct.error):
+            self.discard()
+            return False
+        self.temp_path = None
+        return True
+
+    def discard(self) -> None:
+        """Abandona la entrada y borra el temporal"""
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError:
+                pass
+            self.file = None
+        if self.temp_path is not None:
+            try:
+                os.unlink(self.temp_path)
+            except OSError:
+                pass
+            self.temp_path = None
+
+
+def store_program(path: str, digest: bytes, node: ProgramNode, optimize: bool = False) -> bool:
+    """
+    Escribe una entrada de caché de forma atómica (ver EntryWriter).
+
+    Returns:
+        True si la entrada quedó guardada
+    """
+    writer = EntryWriter(path, digest, optimize)
+    for stmt in node.statements:
+        writer.write(stmt)
+    return writer.commit()
+
+
+def cached_statements(filename: str, optimize: bool = False,
+                      cache_dir: Optional[str] = None) -> Iterator[Any]:
+    """
+    Genera las sentencias de un archivo usando la caché en disco.
+
+    Si hay una entrada válida para el contenido actual del archivo, las
+    sentencias salen de ella bloque a bloque sin pasar por el lexer, el
+    parser ni el optimizador. Si no, el texto se parsea por bloques y cada
+    sentencia se genera en cuanto está completa, así que quien las ejecuta no
+    espera al final del archivo; la entrada se escribe a la par y se publica
+    al agotarse el generador (no si se abandona antes o hay un error de
+    sintaxis).
+
+    Ningún camino carga el archivo ni el AST enteros: la memoria depende del
+    tamaño de un bloque, no del programa.
+
+    Args:
+        filename: Archivo de código fuente
+        optimize: Optimizar cada sentencia por separado (ver
+            optimizer.optimize_stream), igual que interpret_stream
+        cache_dir: Directorio de caché (por defecto __interpcache__ junto al archivo)
+    """
+    digest = sha256()
+    with open(filename, 'rb') as f:
+        for chunk in _read_chunks(f):
+            digest.update(chunk)
+    path = cache_path(filename, optimize, cache_dir)
+
+    statements = read_entry(path, digest.digest(), optimize)
+    if statements is not None:
+        yield from statements
+        return
+
+    # El archivo se vuelve a leer por bloques para parsearlo; el hash se
+    # recalcula para no guardar la entrada si cambió entre las dos lecturas
+    reread = sha256()
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    def chunks(f):
+        for chunk in _read_chunks(f):
+            reread.update(chunk)
+            yield decoder.decode(chunk)
+        yield decoder.decode(b'', final=True)
+
+    writer = EntryWriter(path, digest.digest(), optimize)
+    try:
+        with open(filename, 'rb') as f:
+            statements = parse_stream(chunks(f))
+            if optimize:
+                from optimizer import optimize_stream
+                statements = optimize_stream(statements)
+            for stmt in statements:
+                writer.write(stmt)
+                yield stmt
+        if reread.digest() == digest.digest():
+            writer.commit()
+    finally:
+        writer.discard()
+
+
+def cached_parse(filename: str, optimize: bool = False,
+                 cache_dir: Optional[str] = None) -> ProgramNode:
+    """
+    Parsea un archivo completo usando la caché en disco (ver cached_statements).
+
+    Args:
+        filename: Archivo de código fuente
+        optimize: Usar (y guardar) el AST optimizado sentencia a sentencia
+        cache_dir: Directorio de caché (por defecto __interpcache__ junto al archivo)
+    """
+    return ProgramNode(list(cached_statements(filename, optimize, cache_dir)))
@@ -0,0 +1,233 @@
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+from unittest import mock
+import filecache
+from filecache import (
+    encode_program, decode_program, cache_path, cached_parse, cached_statements,
+    load_program, store_program, source_hash
+)
+from main import run_file
+from optimizer import optimize
+from parser import parse, ParseError, ProgramNode, NumberNode, BinOpNode, UnaryOpNode, PrintNode
+from sinks import CaptureSink
+
+
+class EncodingTest(unittest.TestCase):
+    """Tests de la serialización compacta del AST"""
+
+    def test_round_trip(self):
+        """encode/decode conservan el programa"""
+        program = parse("x = 3; print(-x * 2 > 5 and not x); y = x / 2 or 1;")
+        self.assertEqual(decode_program(encode_program(program)), program)
+
+    def test_booleans_kept(self):
+        """Las constantes booleanas (del optimizador) no se confunden con 1"""
+        program = ProgramNode([NumberNode(True), NumberNode(1)])
+        decoded = decode_program(encode_program(program))
+        self.assertIs(decoded.statements[0].value, True)
+        self.assertIs(type(decoded.statements[1].value), int)
+
+    def test_deep_tree(self):
+        """Árboles muy profundos se codifican sin recursión"""
+        node = NumberNode(1)
+        for _ in range(100_000):
+            node = UnaryOpNode('-', BinOpNode(node, '+', NumberNode(1)))
+        program = ProgramNode([node])
+        decoded = decode_program(encode_program(program))
+        self.assertEqual(encode_program(decoded), encode_program(program))
+
+    def test_invalid_data(self):
+        """Datos corruptos producen ValueError"""
+        with self.assertRaises(ValueError):
+            decode_program(b"basura")
+        data = encode_program(parse("1 + 2;"))
+        with self.assertRaises(ValueError):
+            decode_program(data[:-3])
+
+
+class FileCacheTest(unittest.TestCase):
+    """Tests de la caché de programas en disco"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.script = os.path.join(self.tmp.name, 'programa.txt')
+        self.write("x = 2; print(x * 21);")
+
+    def write(self, code):
+        with open(self.script, 'w', encoding='utf-8') as f:
+            f.write(code)
+
+    def test_entry_written_next_to_file(self):
+        """La primera ejecución crea la entrada en __interpcache__"""
+        program = cached_parse(self.script)
+        self.assertEqual(program, parse("x = 2; print(x * 21);"))
+        path = cache_path(self.script)
+        self.assertEqual(os.path.dirname(path),
+                         os.path.join(self.tmp.name, filecache.CACHE_DIR))
+        self.assertTrue(os.path.exists(path))
+
+    def test_hit_skips_parser(self):
+        """Con una entrada válida no se vuelve a parsear"""
+        expected = cached_parse(self.script)
+        with mock.patch.object(filecache, 'parse_stream') as parse_mock:
+            self.assertEqual(cached_parse(self.script), expected)
+        parse_mock.assert_not_called()
+
+    def test_changed_source_invalidates(self):
+        """Si el código cambia, la entrada anterior no se usa"""
+        cached_parse(self.script)
+        self.write("print(7);")
+        self.assertEqual(cached_parse(self.script), parse("print(7);"))
+
+    def test_optimized_entry_is_separate(self):
+        """El AST optimizado se guarda aparte"""
+        plain = cached_parse(self.script)
+        optimized = cached_parse(self.script, optimize=True)
+        self.assertNotEqual(cache_path(self.script), cache_path(self.script, optimize=True))
+        self.assertEqual(cached_parse(self.script), plain)
+        self.assertEqual(cached_parse(self.script, optimize=True), optimized)
+
+    def test_optimized_per_statement(self):
+        """Con -O se optimiza cada sentencia por separado, como sin caché"""
+        code = "x = a * b; y = a * b; x = 2 + 3; print(x + y);"
+        self.write(code)
+        expected = ProgramNode([optimize(stmt)[0] for stmt in parse(code).statements])
+        self.assertEqual(cached_parse(self.script, optimize=True), expected)
+        self.assertEqual(cached_parse(self.script, optimize=True), expected)
+
+    def test_statements_before_end_of_parse(self):
+        """Sin entrada, las sentencias se generan antes de parsear todo el archivo"""
+        self.write("print(1);\n" * 10 + "x = (;")
+        statements = cached_statements(self.script)
+        self.assertEqual(next(statements), PrintNode(NumberNode(1)))
+        with self.assertRaises(ParseError):
+            list(statements)
+        self.assertFalse(os.path.exists(cache_path(self.script)))
+
+    def test_entry_in_blocks(self):
+        """La entrada se escribe y se lee por bloques de sentencias"""
+        self.write("".join(f"x{i} = {i};\n" for i in range(10)) + "print(x9);")
+        with mock.patch.object(filecache, 'BLOCK_STATEMENTS', 3):
+            with mock.patch.object(filecache, 'encode_program',
+                                   wraps=encode_program) as encode_mock:
+                expected = cached_parse(self.script)
+            self.assertEqual(encode_mock.call_count, 4)
+            with mock.patch.object(filecache, 'decode_program',
+                                   wraps=decode_program) as decode_mock:
+                statements = cached_statements(self.script)
+                self.assertEqual(next(statements), expected.statements[0])
+                self.assertEqual(decode_mock.call_count, 1)
+                self.assertEqual(list(statements), expected.statements[1:])
+            self.assertEqual(decode_mock.call_count, 4)
+        self.assertEqual(expected, parse("".join(f"x{i} = {i};" for i in range(10)) + "print(x9);"))
+
+    def test_source_changed_while_parsing(self):
+        """Si el archivo cambia entre el hash y el parseo, no se guarda la entrada"""
+        # Más largo que el búfer de lectura, para que el cambio se vea a mitad
+        body = "x = 2;\n" + "print(1);\n" * 5000
+        self.write(body + "print(x * 21);")
+        with mock.patch.object(filecache, 'CHUNK_SIZE', 4):
+            statements = cached_statements(self.script)
+            self.assertEqual(next(statements), parse("x = 2;").statements[0])
+            self.write(body + "print(x * 99);")
+            self.assertEqual(list(statements)[-1], parse("print(x * 99);").statements[0])
+        self.assertFalse(os.path.exists(cache_path(self.script)))
+
+    def test_multibyte_characters_across_chunks(self):
+        """Un carácter de varios bytes partido entre dos trozos se decodifica bien"""
+        with open(self.script, 'wb') as f:
+            f.write(b"x = 1;" + "\u00e9".encode('utf-8'))
+        with mock.patch.object(filecache, 'CHUNK_SIZE', 7):
+            with self.assertRaisesRegex(RuntimeError, "\u00e9"):
+                cached_parse(self.script)
+
+    def test_corrupt_entry_ignored(self):
+        """Una entrada corrupta se ignora y se reescribe"""
+        cached_parse(self.script)
+        path = cache_path(self.script)
+        with open(path, 'r+b') as f:
+            f.seek(-2, os.SEEK_END)
+            f.write(b'\xff\xff')
+        digest = source_hash(b"x = 2; print(x * 21);")
+        self.assertIsNone(load_program(path, digest))
+        self.assertEqual(cached_parse(self.script), parse("x = 2; print(x * 21);"))
+        self.assertIsNotNone(load_program(path, digest))
+
+    def test_truncated_and_foreign_entries_ignored(self):
+        """Entradas truncadas, de otra versión o de otro código se ignoran"""
+        digest = source_hash(b"1;")
+        path = os.path.join(self.tmp.name, 'entrada.icache')
+        self.assertTrue(store_program(path, digest, parse("1;")))
+        self.assertIsNone(load_program(path, source_hash(b"2;")))
+        with mock.patch.object(filecache, 'CACHE_VERSION', filecache.CACHE_VERSION + 1):
+            self.assertIsNone(load_program(path, digest))
+        with open(path, 'r+b') as f:
+            f.truncate(10)
+        self.assertIsNone(load_program(path, digest))
+
+    def test_atomic_write_leaves_no_temporaries(self):
+        """La escritura usa un temporal que se renombra"""
+        cached_parse(self.script)
+        directory = os.path.dirname(cache_path(self.script))
+        self.assertEqual(os.listdir(directory), [os.path.basename(cache_path(self.script))])
+
+    def test_oversized_entry_not_stored(self):
+        """Si la cabecera no admite la entrada, no se guarda y no hay error"""
+        path = os.path.join(self.tmp.name, 'entrada.icache')
+        writer = filecache.EntryWriter(path, source_hash(b"1;"))
+        writer.write(NumberNode(1))
+        writer.length = 1 << 64
+        self.assertFalse(writer.commit())
+        self.assertEqual(os.listdir(self.tmp.name), ['programa.txt'])
+
+    @unittest.skipIf(os.name != 'posix', "permisos POSIX")
+    def test_entry_mode_follows_umask(self):
+        """La entrada tiene los permisos de un archivo nuevo, no los 0600 de mkstemp"""
+        umask = os.umask(0o022)
+        try:
+            cached_parse(self.script)
+        finally:
+            os.umask(umask)
+        self.assertEqual(os.stat(cache_path(self.script)).st_mode & 0o777, 0o644)
+
+    def test_unwritable_cache_dir(self):
+        """Si no se puede escribir la caché, se ejecuta igual"""
+        blocker = os.path.join(self.tmp.name, 'archivo')
+        open(blocker, 'w').close()
+        program = cached_parse(self.script, cache_dir=os.path.join(blocker, 'cache'))
+        self.assertEqual(program, parse("x = 2; print(x * 21);"))
+
+    # ---------- main.py ----------
+
+    def test_run_file_output_before_parse_ends(self):
+        """Con la caché, la salida empieza antes de terminar de parsear"""
+        self.write("print(1); print(2);\ny = (;")
+        sink = CaptureSink()
+        with redirect_stdout(StringIO()):
+            self.assertFalse(run_file(self.script, sink=sink))
+        self.assertEqual(sink.values, [1, 2])
+        self.assertFalse(os.path.exists(cache_path(self.script)))
+
+    def test_run_file_uses_cache(self):
+        """run_file ejecuta desde la caché y --no-cache no la crea"""
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        for _ in range(2):
+            out = StringIO()
+            with redirect_stdout(out):
+                self.assertTrue(run_file(self.script, cache_dir=cache_dir))
+            self.assertEqual(out.getvalue(), "42\n")
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        os.remove(os.path.join(cache_dir, os.listdir(cache_dir)[0]))
+        with redirect_stdout(StringIO()):
+            self.assertTrue(run_file(self.script, cache=False, cache_dir=cache_dir))
+        self.assertEqual(os.listdir(cache_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
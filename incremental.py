@@ -0,0 +1,247 @@
+from __future__ import annotations
+from collections import namedtuple
+from lexer import tokenize
+from parser import Parser, ParseError, ProgramNode
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List, Optional, Tuple
+
+
+# Segmentos por bloque (ver IncrementalParser)
+BLOCK_SIZE = 256
+
+# Resultado de un segmento sin sentencia (solo espacios y saltos de línea)
+_EMPTY = None
+
+
+# ==================== SEGMENTOS ====================
+
+class _Block:
+    """Grupo contiguo de segmentos con su longitud y su cantidad de sentencias"""
+    __slots__ = ('texts', 'results', 'length', 'statements')
+
+    def __init__(self, texts: List[str], results: List[Any]):
+        self.texts = texts
+        self.results = results
+        self.length = sum(map(len, texts))
+        self.statements = sum(1 for result in results if _is_statement(result))
+
+
+def _is_statement(result: Any) -> bool:
+    return result is not _EMPTY and not isinstance(result, Exception)
+
+
+def _split(text: str) -> List[str]:
+    """Corta el texto después de cada ';' (el último trozo puede no tenerlo)"""
+    pieces = [piece + ';' for piece in text.split(';')]
+    pieces[-1] = pieces[-1][:-1]
+    if not pieces[-1]:
+        pieces.pop()
+    return pieces
+
+
+def _parse_segment(text: str, first_line: int = 1) -> Any:
+    """La sentencia del segmento, _EMPTY si no tiene, o el error de sintaxis"""
+    try:
+        statements = list(Parser(tokenize(text, first_line)).parse_statements())
+    except (ParseError, RuntimeError) as e:
+        # RuntimeError: carácter inesperado en el lexer
+        return e
+    return statements[0] if statements else _EMPTY
+
+
+class Edit(namedtuple('Edit', ('index', 'removed', 'added'))):
+    """
+    Efecto de IncrementalParser.edit sobre program.statements: la posición
+    de la primera sentencia reemplazada y las sentencias quitadas e insertadas.
+    """
+    __slots__ = ()
+
+
+# ==================== PARSER INCREMENTAL ====================
+
+class IncrementalParser:
+    """
+    Mantiene el AST de un texto que se edita, re-parseando solo lo que cambia.
+
+    Como ';' no aparece en ningún otro token, el texto se divide en
+    segmentos que terminan en ';' (salvo quizás el último) y cada segmento
+    contiene a lo sumo una sentencia. Al editar, solo se vuelven a analizar
+    (lexer y parser) los segmentos que tocan el rango editado, más el
+    siguiente si la edición borró un ';'; las sentencias nuevas reemplazan
+    a las viejas en `program.statements`.
+
+    Los segmentos se agrupan en bloques de hasta BLOCK_SIZE para ubicar
+    una posición sin recorrer todo el texto. Un segmento con errores no
+    aporta sentencias a `program` (ver errors).
+    """
+
+    def __init__(self, text: str = ''):
+        texts = _split(text)
+        results = [_parse_segment(segment) for segment in texts]
+        self._blocks = self._make_blocks(texts, results)
+        self.program = ProgramNode([result for result in results if _is_statement(result)])
+        self._text: Optional[str] = text
+
+    # ---------- Consultas ----------
+
+    @property
+    def text(self) -> str:
+        """Texto actual (se arma al pedirlo después de una edición)"""
+        if self._text is None:
+            self._text = ''.join(text for block in self._blocks for text in block.texts)
+        return self._text
+
+    def __len__(self) -> int:
+        return sum(block.length for block in self._blocks)
+
+    def errors(self) -> List[Tuple[int, Exception]]:
+        """
+        Errores de sintaxis como (posición del segmento, excepción).
+
+        Los segmentos con error se vuelven a analizar con su línea actual,
+        para que los mensajes tengan el número de línea correcto.
+        """
+        errors = []
+        offset, line = 0, 1
+        for block in self._blocks:
+            for text, result in zip(block.texts, block.results):
+                if isinstance(result, Exception):
+                    errors.append((offset, _parse_segment(text, line)))
+                offset += len(text)
+                line += text.count('\n')
+        return errors
+
+    # ---------- Edición ----------
+
+    def edit(self, start: int, end: int, new_text: str) -> Edit:
+        """
+        Reemplaza text[start:end] por `new_text` y actualiza `program`.
+
+        El costo es proporcional al tamaño de la edición y de los segmentos
+        que toca (más un recorrido de los bloques), no al del texto.
+
+        Returns:
+            Qué sentencias de program.statements se reemplazaron
+        """
+        length = len(self)
+        if not 0 <= start <= end <= length:
+            raise ValueError(f"Rango de edición inválido: [{start}, {end}) en un texto de {length}")
+
+        # Al escribir al final se incluye el último segmento: puede no tener ';'
+        first, first_offset, first_stmt = self._locate(start if start < length else start - 1)
+        last, _, _ = self._locate(max(start, end - 1))
+        # Texto de los segmentos afectados, con el reemplazo aplicado
+        old = self._segments(first, last)
+        combined = ''.join(old)
+        local = start - first_offset
+        combined = combined[:local] + new_text + combined[end - first_offset:]
+        # Si se borró el ';' final, el segmento siguiente también cambia
+        following = self._next(last)
+        while not combined.endswith(';') and following is not None:
+            last = following
+            next_text = self._segment(following)
+            old.append(next_text)
+            combined += next_text
+            following = self._next(following)
+
+        texts = _split(combined)
+        results = [_parse_segment(text) for text in texts]
+        removed = sum(1 for result in self._results(first, last) if _is_statement(result))
+        added = [result for result in results if _is_statement(result)]
+        self._replace(first, last, texts, results)
+        self.program.statements[first_stmt:first_stmt + removed] = added
+        self._text = None
+        return Edit(first_stmt, removed, len(added))
+
+    def insert(self, offset: int, new_text: str) -> Edit:
+        return self.edit(offset, offset, new_text)
+
+    def delete(self, start: int, end: int) -> Edit:
+        return self.edit(start, end, '')
+
+    # ---------- Bloques ----------
+    # Una posición de segmento es (índice de bloque, índice en el bloque);
+    # (len(bloques), 0) es un segmento vacío virtual al final del texto.
+
+    @staticmethod
+    def _make_blocks(texts: List[str], results: List[Any]) -> List[_Block]:
+        """Agrupa en bloques de entre BLOCK_SIZE / 2 y 2 * BLOCK_SIZE segmentos"""
+        if len(texts) <= 2 * BLOCK_SIZE:
+            return [_Block(texts, results)] if texts else []
+        cuts = list(range(0, len(texts), BLOCK_SIZE))
+        if len(texts) - cuts[-1] < BLOCK_SIZE // 2:
+            cuts.pop()  # El resto se agrega al último bloque
+        cuts.append(len(texts))
+        return [_Block(texts[lo:hi], results[lo:hi]) for lo, hi in zip(cuts, cuts[1:])]
+
+    def _locate(self, offset: int) -> Tuple[Tuple[int, int], int, int]:
+        """Segmento que contiene `offset`, su posición y el índice de su sentencia"""
+        position = statement = 0
+        for b, block in enumerate(self._blocks):
+            if offset < position + block.length:
+                for i, text in enumerate(block.texts):
+                    if offset < position + len(text):
+                        return (b, i), position, statement
+                    position += len(text)
+                    if _is_statement(block.results[i]):
+                        statement += 1
+            position += block.length
+            statement += block.statements
+        return (len(self._blocks), 0), position, statement
+
+    def _next(self, segment: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        b, i = segment
+        if b == len(self._blocks):
+            return None
+        if i + 1 < len(self._blocks[b].texts):
+            return b, i + 1
+        if b + 1 < len(self._blocks):
+            return b + 1, 0
+        return None
+
+    def _segment(self, segment: Tuple[int, int]) -> str:
+        b, i = segment
+        return self._blocks[b].texts[i]
+
+    def _segments(self, first: Tuple[int, int], last: Tuple[int, int]) -> List[str]:
+        return self._slice(first, last, 'texts')
+
+    def _results(self, first: Tuple[int, int], last: Tuple[int, int]) -> List[Any]:
+        return self._slice(first, last, 'results')
+
+    def _slice(self, first, last, field: str) -> List[Any]:
+        """Elementos de los segmentos first..last (inclusive)"""
+        (b1, i1), (b2, i2) = first, last
+        items = []
+        for b in range(b1, min(b2, len(self._blocks) - 1) + 1):
+            values = getattr(self._blocks[b], field)
+            lo = i1 if b == b1 else 0
+            hi = i2 + 1 if b == b2 else len(values)
+            items.extend(values[lo:hi])
+        return items
+
+    def _replace(self, first, last, texts: List[str], results: List[Any]) -> None:
+        """Reemplaza los segmentos first..last y rearma solo los bloques afectados"""
+        (b1, i1), (b2, i2) = first, last
+        blocks = self._blocks
+        if b1 == len(blocks):
+            blocks.extend(self._make_blocks(texts, results))
+            return
+        end_block = min(b2, len(blocks) - 1)
+        head_texts = blocks[b1].texts[:i1]
+        head_results = blocks[b1].results[:i1]
+        if b2 == len(blocks):
+            tail_texts, tail_results = [], []
+        else:
+            tail_texts = blocks[b2].texts[i2 + 1:]
+            tail_results = blocks[b2].results[i2 + 1:]
+        texts = head_texts + texts + tail_texts
+        results = head_results + results + tail_results
+        if len(texts) < BLOCK_SIZE // 2 and end_block + 1 < len(blocks):
+            # Un bloque chico se une al siguiente para no fragmentar
+            end_block += 1
+            texts += blocks[end_block].texts
+            results += blocks[end_block].results
+        blocks[b1:end_block + 1] = self._make_blocks(texts, results)
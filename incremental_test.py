@@ -0,0 +1,93 @@
+import random
+import sys
+import unittest
+import incremental
+from incremental import IncrementalParser, Edit
+from parser import parse, ParseError
+
+
+class IncrementalParserTest(unittest.TestCase):
+    """Tests para el re-parseo incremental"""
+
+    TEXT = "x = 1;\ny = x + 2;\nprint(y);\n"
+
+    def assertMatchesFullParse(self, inc):
+        self.assertEqual(inc.program, parse(inc.text))
+
+    def test_initial(self):
+        """Sin ediciones, el programa es el de parse"""
+        inc = IncrementalParser(self.TEXT)
+        self.assertMatchesFullParse(inc)
+        self.assertEqual(inc.text, self.TEXT)
+        self.assertEqual(len(inc), len(self.TEXT))
+
+    def test_edit_inside_statement(self):
+        """Solo se reemplaza la sentencia editada"""
+        inc = IncrementalParser(self.TEXT)
+        unchanged = inc.program.statements[0], inc.program.statements[2]
+        edit = inc.edit(11, 12, "40")  # y = x + 40;
+        self.assertEqual(edit, Edit(1, 1, 1))
+        self.assertMatchesFullParse(inc)
+        self.assertIs(inc.program.statements[0], unchanged[0])
+        self.assertIs(inc.program.statements[2], unchanged[1])
+
+    def test_insert_and_delete_semicolon(self):
+        """Agregar un ';' divide el segmento; borrarlo une dos"""
+        inc = IncrementalParser(self.TEXT)
+        inc.insert(5, "; z = 3")  # x = 1; z = 3;
+        self.assertEqual(inc.text, "x = 1; z = 3;\ny = x + 2;\nprint(y);\n")
+        self.assertMatchesFullParse(inc)
+        inc.delete(12, 13)  # Se borra el ';' de z = 3: el segmento queda mal
+        self.assertEqual(len(inc.program.statements), 2)
+        self.assertEqual(len(inc.errors()), 1)
+        inc.insert(12, ";")
+        self.assertMatchesFullParse(inc)
+        self.assertEqual(inc.errors(), [])
+
+    def test_typing_at_end(self):
+        """Escribir al final, carácter a carácter"""
+        inc = IncrementalParser("")
+        for char in "a = 5;\nprint(a * 2);":
+            inc.insert(len(inc), char)
+        self.assertMatchesFullParse(inc)
+        self.assertEqual(len(inc.program.statements), 2)
+
+    def test_errors_with_current_line(self):
+        """Los errores se reportan con la línea actual del segmento"""
+        inc = IncrementalParser("x = 1;\ny = $;\n")
+        inc.insert(0, "\n\n")
+        [(offset, error)] = inc.errors()
+        self.assertEqual(offset, 8)
+        self.assertIn("line 4", str(error))
+        inc = IncrementalParser("x = ;")
+        self.assertIsInstance(inc.errors()[0][1], ParseError)
+
+    def test_invalid_range(self):
+        """Error: rango fuera del texto"""
+        with self.assertRaises(ValueError):
+            IncrementalParser("x;").edit(1, 5, "")
+
+    def test_random_edits_many_blocks(self):
+        """Ediciones al azar sobre muchos bloques coinciden con parse"""
+        rng = random.Random(0)
+        pieces = ['x', ' = ', '1', ';', '\n', ' + ', '(', ')', 'print(', 'y', 'not ']
+        saved = incremental.BLOCK_SIZE
+        incremental.BLOCK_SIZE = 4
+        try:
+            text = "".join(f"v{i} = {i};\n" for i in range(100))
+            inc = IncrementalParser(text)
+            for _ in range(500):
+                start = rng.randrange(len(text) + 1)
+                end = rng.randrange(start, min(len(text), start + 8) + 1)
+                new = "".join(rng.choice(pieces) for _ in range(rng.randrange(4)))
+                inc.edit(start, end, new)
+                text = text[:start] + new + text[end:]
+                self.assertEqual(inc.text, text)
+                if not inc.errors():
+                    self.assertMatchesFullParse(inc)
+        finally:
+            incremental.BLOCK_SIZE = saved
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
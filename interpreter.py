@@ -1,27 +1,286 @@
-from typing import Any, Dict
+from __future__ import annotations
+import operator
+import sys
+from collections import namedtuple
+from errors import RuntimeError
 from parser import (
-    parse, ProgramNode, NumberNode, IdNode, BinOpNode,
-    UnaryOpNode, AssignNode, PrintNode
+    parse, parse_stream, ProgramNode, NumberNode, IdNode, BinOpNode,
+    UnaryOpNode, AssignNode, PrintNode,
+    BINARY_OPERATORS, UNARY_OPERATORS, OP_DIV, OP_AND
 )
+from compiler import compile_ast, BINARY_OPS, UNARY_OPS
+from parsecache import ParseCache, default_cache
+from sinks import Sink, CaptureSink
+from options import ENGINES
 
+# El bytecode, el optimizador y la evaluación vectorial se importan en las
+# ramas que los usan, y typing solo en anotaciones (sin evaluar, ver
+# __future__): `main.py -c` no los carga (ver bench/startup.py)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
-# ==================== ERRORES ====================
 
-class RuntimeError(Exception):
-    pass
+# Motores que compilan el programa una sola vez (ver compile_program)
+COMPILED_ENGINES = ('closures', 'bytecode', 'python')
+
+# Nodos compilados que recuerda cada Interpreter (ver Interpreter._compile)
+COMPILED_CACHE_SIZE = 1024
+
+# Eventos que se pueden observar con Interpreter.subscribe
+TRACE_EVENTS = ('statement_enter', 'statement_exit', 'assign', 'print')
+
+
+# ==================== TRAZAS ====================
+
+class TraceEvent(namedtuple('TraceEvent', ('kind', 'node', 'value'))):
+    """
+    Evento de ejecución entregado a los suscriptores de Interpreter.
+
+    kind es uno de TRACE_EVENTS y node la sentencia en curso; value es el
+    resultado (exit), el valor asignado (assign) o el valor impreso (print).
+    """
+    __slots__ = ()
+
+
+class Subscription:
+    """
+    Suscriptor de Interpreter.subscribe: filtra por tipo de evento y de
+    sentencia y entrega solo uno de cada `every` eventos que pasan el filtro
+    (el primero, el every+1-ésimo, ...).
+    """
+
+    def __init__(self, callback: Callable[[TraceEvent], None],
+                 events: Optional[Iterable[str]] = None,
+                 node_types: Optional[Tuple[type, ...]] = None, every: int = 1):
+        if every < 1:
+            raise ValueError("El muestreo debe ser positivo")
+        if events is not None:
+            events = frozenset(events)
+            unknown = events.difference(TRACE_EVENTS)
+            if unknown:
+                raise ValueError(f"Evento desconocido: '{min(unknown)}' "
+                                 f"(opciones: {', '.join(TRACE_EVENTS)})")
+        self.callback = callback
+        self.events = events
+        self.node_types = tuple(node_types) if node_types is not None else None
+        self.every = every
+        self.delivered = 0  # Eventos entregados al callback
+        self._skip = 0      # Eventos a descartar antes del próximo
+
+    def __call__(self, event: TraceEvent) -> None:
+        if self.events is not None and event.kind not in self.events:
+            return
+        if self.node_types is not None and not isinstance(event.node, self.node_types):
+            return
+        if self._skip:
+            self._skip -= 1
+            return
+        self._skip = self.every - 1
+        self.delivered += 1
+        self.callback(event)
 
 
 # ==================== INTÉRPRETE ====================
 
+# Marcas de las tareas pendientes de Interpreter.walk_expr
+_BINARY = object()
+_UNARY = object()
+_LEAVE = object()  # Solo con ganchos: el valor del and/or está listo
+
+# Funciones indexadas por código de operador (None: '/', 'and' y 'or')
+_BINARY_FUNCS = tuple(BINARY_OPS.get(symbol) for symbol in BINARY_OPERATORS)
+_UNARY_FUNCS = tuple(UNARY_OPS[symbol] for symbol in UNARY_OPERATORS)
+
+
+def _same_items(a: tuple, b: tuple) -> bool:
+    """Las tuplas tienen los mismos objetos (por identidad, sin __eq__)"""
+    return len(a) == len(b) and all(map(operator.is_, a, b))
+
+
 class Interpreter:
     
     
-    def __init__(self):
+    def __init__(self, engine: str = 'closures', sink: Optional[Sink] = None):
+        """
+        Args:
+            engine: Motor de ejecución (ver ENGINES)
+            sink: Destino de la salida de print (ver sinks.py). Sin destino,
+                cada valor se imprime con print() y se captura en `output`;
+                con un destino, `output` solo tiene valores si es un
+                CaptureSink (y son los mismos que sink.values).
+        """
+        if engine not in ENGINES:
+            raise ValueError(f"Motor desconocido: '{engine}' (opciones: {', '.join(ENGINES)})")
+        self.engine = engine  # Motor de ejecución (ver ENGINES)
         self.env: Dict[str, Any] = {}  # Entorno de variables
-        self.output: list = []  # Captura la salida de print para testing
+        self.sink = sink
+        if sink is None:
+            self.output: list = []  # Captura la salida de print para testing
+        else:
+            self.output = sink.values if isinstance(sink, CaptureSink) else []
+            self.emit = sink.write  # Sin indirección en cada print
+        self._subscribers: List[Subscription] = []  # Ver subscribe
+        # id(nodo) -> (nodo, sentencias al compilar, fn(env, emit)); ver _compile
+        self._compiled: Dict[int, Tuple[Any, Any, Callable]] = {}
     
     def run(self, node) -> Any:
-        """Punto de entrada: ejecuta un nodo AST"""
+        """
+        Punto de entrada: ejecuta un nodo AST.
+
+        Con el motor 'closures' (por defecto) el nodo se compila una sola vez
+        a clausuras (ver compiler.py); con 'bytecode' se traduce a
+        instrucciones de una máquina de pila (ver bytecode.py); con 'python'
+        se traduce a una función nativa de Python (ver transpiler.py); con
+        'stack' se recorre el árbol con una pila explícita (ver walk); con
+        'tree' se recorre el árbol recursivamente; con 'vector' se evalúa una
+        sola vez sobre columnas de NumPy (ver vectorized.py).
+
+        Con los motores compilados, ejecutar otra vez el mismo nodo reutiliza
+        lo ya compilado (ver _compile).
+        """
+        if self.engine in COMPILED_ENGINES:
+            return self._compile(node)(self.env, self.emit)
+        if self.engine == 'stack':
+            return self.walk(node)
+        if self.engine == 'vector':
+            from vectorized import evaluate_vectorized
+            return evaluate_vectorized(node, self.env, self.emit)
+        return self.visit(node)
+
+    def _compile(self, node, each: bool = False) -> Any:
+        """
+        Compila un nodo con el motor del intérprete, una sola vez por nodo.
+
+        Se recuerdan los últimos COMPILED_CACHE_SIZE nodos. La entrada guarda
+        el nodo (su id no se reutiliza mientras esté en la caché) y, para un
+        ProgramNode, sus sentencias: si la lista cambió (por ejemplo, con
+        IncrementalParser) el programa se vuelve a compilar.
+
+        Con `each` se compila cada sentencia por separado (ver _traced_run) y
+        se retorna la tupla de funciones, en una sola entrada por programa:
+        un programa largo no desaloja a sus propias sentencias.
+        """
+        compiled = self._compiled
+        statements = tuple(node.statements) if type(node) is ProgramNode else None
+        key = (id(node), 'each') if each else id(node)
+        entry = compiled.get(key)
+        if entry is not None and entry[0] is node and (
+                statements is None or _same_items(entry[1], statements)):
+            return entry[2]
+        if each:
+            fn = tuple(compile_node(stmt, self.engine)
+                       for stmt in (statements if statements is not None else (node,)))
+        else:
+            fn = compile_node(node, self.engine)
+        if entry is None and len(compiled) >= COMPILED_CACHE_SIZE:
+            del compiled[next(iter(compiled))]  # El más antiguo
+        compiled[key] = (node, statements, fn)
+        return fn
+
+    # ---------- Trazas ----------
+    
+    def subscribe(self, callback: Callable[[TraceEvent], None],
+                  events: Optional[Iterable[str]] = None,
+                  node_types: Optional[Tuple[type, ...]] = None,
+                  every: int = 1) -> Subscription:
+        """
+        Registra un suscriptor de eventos de ejecución (ver TRACE_EVENTS).
+
+        Con al menos un suscriptor, run() ejecuta sentencia a sentencia y
+        notifica la entrada y la salida de cada una, cada asignación y cada
+        valor impreso. Una sentencia que falla no produce 'statement_exit'.
+        Sin suscriptores, run() y emit() son los métodos originales, así que
+        la ejecución no paga ningún costo.
+
+        Args:
+            callback: Recibe cada TraceEvent
+            events: Eventos a recibir (por defecto, todos)
+            node_types: Tipos de sentencia a recibir, por ejemplo (AssignNode,)
+            every: Entregar solo uno de cada `every` eventos
+
+        Returns:
+            La suscripción (para unsubscribe; cuenta los eventos entregados)
+        """
+        subscription = Subscription(callback, events, node_types, every)
+        if not self._subscribers:
+            # Se reemplazan run y emit solo en esta instancia
+            self._untraced_emit = self.__dict__.get('emit')
+            self._statement = None
+            self.run = self._traced_run
+            self.emit = self._traced_emit
+        self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Quita un suscriptor; sin suscriptores se vuelve a run() original"""
+        self._subscribers.remove(subscription)
+        if not self._subscribers:
+            del self.run
+            if self._untraced_emit is None:
+                del self.emit
+            else:
+                self.emit = self._untraced_emit
+
+    def _notify(self, kind: str, node: Any, value: Any) -> None:
+        event = TraceEvent(kind, node, value)
+        for subscription in tuple(self._subscribers):
+            subscription(event)
+
+    def _traced_run(self, node) -> Any:
+        """run() con suscriptores: cada sentencia se ejecuta y se notifica por separado"""
+        run = type(self).run
+        statements = node.statements if isinstance(node, ProgramNode) else [node]
+        # Con los motores compilados, las sentencias del programa se compilan
+        # juntas una sola vez (ver _compile)
+        compiled = self._compile(node, each=True) if self.engine in COMPILED_ENGINES else None
+        result = None
+        try:
+            for index, stmt in enumerate(statements):
+                self._statement = stmt
+                self._notify('statement_enter', stmt, None)
+                if compiled is None:
+                    result = run(self, stmt)
+                else:
+                    result = compiled[index](self.env, self.emit)
+                if type(stmt) is AssignNode:
+                    self._notify('assign', stmt, self.env[stmt.name])
+                self._notify('statement_exit', stmt, result)
+        finally:
+            # Si una sentencia falla, los print posteriores no se le atribuyen
+            self._statement = None
+        return result
+
+    def _traced_emit(self, value: Any) -> None:
+        untraced = self._untraced_emit
+        if untraced is None:
+            type(self).emit(self, value)
+        else:
+            untraced(value)
+        self._notify('print', self._statement, value)
+
+    def run_stream(self, statements: Iterable[Any]) -> Any:
+        """
+        Ejecuta las sentencias a medida que se generan (ver parser.parse_stream).
+
+        Cada sentencia se ejecuta en cuanto llega, así que la salida aparece
+        antes de terminar de leer el código; un error de sintaxis posterior
+        no deshace lo ya ejecutado.
+
+        Con los motores compilados cada sentencia se evalúa con walk(): se
+        ejecuta una sola vez, así que compilarla costaría más que recorrerla.
+        """
+        if self.engine in COMPILED_ENGINES and 'run' not in self.__dict__:
+            run = self.walk  # Sin suscriptores (ver subscribe)
+        else:
+            run = self.run
+        result = None
+        for stmt in statements:
+            result = run(stmt)
+        return result
+
+    def visit(self, node) -> Any:
+        """Evalúa un nodo recorriendo el árbol (despacho por eval_*)"""
         method_name = f'eval_{type(node).__name__}'
         method = getattr(self, method_name, None)
         
@@ -36,7 +295,7 @@ class Interpreter:
         """Evalúa todas las sentencias del programa"""
         result = None
         for stmt in node.statements:
-            result = self.run(stmt)
+            result = self.visit(stmt)
         return result
     
     def eval_NumberNode(self, node: NumberNode) -> int:
@@ -51,19 +310,19 @@ class Interpreter:
     
     def eval_BinOpNode(self, node: BinOpNode) -> Any:
         """Evalúa una operación binaria"""
-        left = self.run(node.left)
+        left = self.visit(node.left)
         
         if node.op == 'and':
             if not left:
                 return left
-            return self.run(node.right)
+            return self.visit(node.right)
         
         if node.op == 'or':
             if left:
                 return left
-            return self.run(node.right)
+            return self.visit(node.right)
         
-        right = self.run(node.right)
+        right = self.visit(node.right)
         
         # Operadores aritméticos
         if node.op == '+':
@@ -96,7 +355,7 @@ class Interpreter:
     
     def eval_UnaryOpNode(self, node: UnaryOpNode) -> Any:
         """Evalúa una operación unaria"""
-        operand = self.run(node.operand)
+        operand = self.visit(node.operand)
         
         if node.op == '-':
             return -operand
@@ -107,52 +366,340 @@ class Interpreter:
     
     def eval_AssignNode(self, node: AssignNode) -> Any:
         """Evalúa una asignación"""
-        value = self.run(node.value)
+        value = self.visit(node.value)
         self.env[node.name] = value
         return value
     
     def eval_PrintNode(self, node: PrintNode) -> None:
         """Evalúa una sentencia print"""
-        value = self.run(node.expr)
+        self.emit(self.visit(node.expr))
+        return None
+    
+    def emit(self, value: Any) -> None:
+        """Imprime un valor y lo captura en la salida"""
         print(value)
         self.output.append(value)  # Captura para testing
-        return None
+    
+    # ---------- Evaluación iterativa ----------
+    
+    def walk(self, node, enter: Optional[Callable[[Any], None]] = None,
+             leave: Optional[Callable[[], None]] = None) -> Any:
+        """
+        Evalúa un nodo con una pila de trabajo explícita, sin recursión.
+
+        Soporta expresiones con cientos de miles de niveles de anidamiento y
+        en árboles profundos es más rápido que visit(), porque no crea un
+        frame de Python por nivel.
+
+        Con los ganchos se llama a enter(nodo) antes de evaluar cada nodo y a
+        leave() cuando su valor está listo; las llamadas se anidan como el
+        árbol (ver profiler.py). Si hay un error, los nodos abiertos no
+        reciben leave().
+        """
+        is_program = isinstance(node, ProgramNode)
+        statements = node.statements if is_program else [node]
+        if is_program and enter is not None:
+            enter(node)
+        result = None
+        for stmt in statements:
+            if isinstance(stmt, AssignNode):
+                if enter is not None:
+                    enter(stmt)
+                result = self.env[stmt.name] = self.walk_expr(stmt.value, enter, leave)
+            elif isinstance(stmt, PrintNode):
+                if enter is not None:
+                    enter(stmt)
+                self.emit(self.walk_expr(stmt.expr, enter, leave))
+                result = None
+            else:
+                result = self.walk_expr(stmt, enter, leave)
+                continue
+            if leave is not None:
+                leave()
+        if is_program and enter is not None:
+            leave()
+        return result
+    
+    def walk_expr(self, node, enter: Optional[Callable[[Any], None]] = None,
+                  leave: Optional[Callable[[], None]] = None) -> Any:
+        """
+        Evalúa una expresión en orden posfijo con pilas de trabajo y valores.
+
+        `enter` y `leave` son los ganchos por nodo de walk().
+        """
+        env = self.env
+        values: list = []
+        push_value = values.append
+        pop_value = values.pop
+        # Tareas: un nodo a evaluar, o (código de operador, tipo) pendiente.
+        # Para and/or el segundo elemento es el operando derecho.
+        work: list = [node]
+        push = work.append
+        pop = work.pop
+        
+        while work:
+            task = pop()
+            kind = type(task)
+            if enter is not None and kind is not tuple:
+                enter(task)
+            
+            if kind is NumberNode:
+                push_value(task.value)
+            elif kind is IdNode:
+                if task.name not in env:
+                    raise RuntimeError(f"Variable no definida: '{task.name}'")
+                push_value(env[task.name])
+            elif kind is BinOpNode:
+                opcode = task.opcode
+                if opcode >= OP_AND:  # and/or son los últimos códigos
+                    push((opcode, task.right))
+                else:
+                    push((opcode, _BINARY))
+                    push(task.right)
+                push(task.left)
+            elif kind is UnaryOpNode:
+                push((task.opcode, _UNARY))
+                push(task.operand)
+            elif kind is tuple:
+                opcode, arg = task
+                if arg is _BINARY:
+                    right = pop_value()
+                    if opcode == OP_DIV:
+                        if right == 0:
+                            raise RuntimeError("División por cero")
+                        values[-1] = values[-1] // right  # División entera
+                    else:
+                        values[-1] = _BINARY_FUNCS[opcode](values[-1], right)
+                elif arg is _UNARY:
+                    values[-1] = _UNARY_FUNCS[opcode](values[-1])
+                elif arg is _LEAVE:
+                    pass
+                elif bool(values[-1]) == (opcode == OP_AND):
+                    # Sin cortocircuito: el resultado es el operando derecho
+                    pop_value()
+                    if leave is not None:
+                        push((opcode, _LEAVE))
+                    push(arg)
+                    continue
+            else:
+                raise RuntimeError(f"No se puede evaluar el nodo: {kind.__name__}")
+            
+            # El valor del nodo está listo, salvo que falten sus operandos
+            if leave is not None and (kind is tuple or kind is NumberNode or kind is IdNode):
+                leave()
+        
+        return values[-1]
+
+
+# ==================== PROGRAMAS COMPILADOS ====================
+
+class RunResult(namedtuple('RunResult', ('value', 'output', 'env'))):
+    """
+    Resultado de ejecutar un CompiledProgram: el valor de la última
+    sentencia, los valores impresos (en orden) y el entorno final.
+    """
+    __slots__ = ()
+
+
+class CompiledProgram:
+    """
+    Programa parseado y compilado una sola vez, ejecutable muchas veces.
+
+    Cada ejecución trabaja sobre una copia del entorno recibido, así que las
+    ejecuciones son independientes entre sí (y pueden hacerse desde varios
+    hilos a la vez). La salida de print se captura en RunResult.output en
+    lugar de escribirse en stdout. Si el entorno contiene arreglos de NumPy,
+    el programa se evalúa por columnas (ver vectorized.py).
+    """
+
+    def __init__(self, ast: Any, engine: str = 'closures'):
+        if engine not in COMPILED_ENGINES:
+            raise ValueError(f"Motor no compilable: '{engine}' "
+                             f"(opciones: {', '.join(COMPILED_ENGINES)})")
+        self.ast = ast
+        self.engine = engine
+        self._execute = compile_node(ast, engine)
+
+    def run(self, env: Dict[str, Any] = None,
+            emit: Callable[[Any], None] = None) -> RunResult:
+        """
+        Ejecuta el programa sobre un entorno nuevo.
+
+        Args:
+            env: Variables iniciales (no se modifica)
+            emit: Recibe cada valor impreso además de capturarlo (opcional)
+        """
+        env = dict(env) if env else {}
+        output: List[Any] = []
+        if emit is None:
+            sink = output.append
+        else:
+            def sink(value):
+                output.append(value)
+                emit(value)
+        if _has_arrays(env):
+            # Columnas de NumPy: una sola pasada vectorial sobre todas las filas
+            from vectorized import evaluate_vectorized
+            value = evaluate_vectorized(self.ast, env, sink)
+        else:
+            value = self._execute(env, sink)
+        return RunResult(value, output, env)
+
+    __call__ = run
+
+
+def compile_node(node, engine: str) -> Callable[[Dict[str, Any], Callable[[Any], None]], Any]:
+    """Compila un nodo con un motor de COMPILED_ENGINES a una función fn(env, emit)"""
+    if engine == 'closures':
+        return compile_ast(node)
+    if engine == 'bytecode':
+        from bytecode import compile_bytecode
+        return compile_bytecode(node).execute
+    from transpiler import compile_python  # Importa ast: solo si se usa
+    return compile_python(node).execute
+
+
+def compile_program(text: str, engine: str = 'closures', optimize: bool = False,
+                    cache: Optional[ParseCache] = default_cache) -> CompiledProgram:
+    """
+    Parsea y compila código una sola vez para ejecutarlo muchas veces.
+
+    Ejemplo:
+        prog = compile_program("total = precio * cantidad; total > 100;")
+        for registro in registros:
+            value, output, env = prog(registro)
+
+    Args:
+        text: Código fuente
+        engine: Motor compilado (ver COMPILED_ENGINES)
+        optimize: Aplicar el optimizador (ver optimizer.py) antes de compilar
+        cache: Caché de programas parseados (ver parsecache.py); None para
+            parsear siempre
+    """
+    return CompiledProgram(_parse(text, optimize, cache), engine)
 
 
 # ==================== FUNCIONES DE CONVENIENCIA ====================
 
-def interpret(text: str, env: Dict[str, Any] = None) -> Interpreter:
+def interpret(text: str, env: Dict[str, Any] = None, engine: Optional[str] = None,
+              optimize: bool = False,
+              cache: Optional[ParseCache] = default_cache,
+              sink: Optional[Sink] = None) -> Interpreter:
     """
     Función de conveniencia: lexer + parser + interpreter en un solo paso.
     
     Args:
         text: Código fuente a interpretar
         env: Entorno inicial opcional con variables predefinidas
+        engine: Motor de ejecución (ver ENGINES). Por defecto, 'vector' si
+            `env` contiene arreglos de NumPy (el programa se evalúa una sola
+            vez sobre todas las filas) y 'closures' si no
+        optimize: Aplicar el optimizador (ver optimizer.py) antes de ejecutar
+        cache: Caché de programas parseados (ver parsecache.py); con los
+            motores compilados (ver COMPILED_ENGINES) guarda también el
+            programa compilado.
+            None para parsear y compilar siempre
+        sink: Destino de la salida de print (ver sinks.py); se vacía con
+            flush() al terminar, pero no se cierra
     
     Returns:
         El intérprete después de ejecutar (contiene env y output)
+    
+    Raises:
+        ValueError: Si `env` contiene arreglos y se pidió otro motor que 'vector'
     """
-    ast = parse(text)
-    interpreter = Interpreter()
+    arrays = _has_arrays(env)
+    if engine is None:
+        engine = 'vector' if arrays else 'closures'
+    elif arrays and engine != 'vector':
+        raise ValueError(f"El entorno contiene arreglos de NumPy: se requiere el motor "
+                         f"'vector', no '{engine}'")
+    interpreter = Interpreter(engine, sink)
     if env:
         interpreter.env.update(env)
-    interpreter.run(ast)
+    try:
+        if cache is not None and engine in COMPILED_ENGINES:
+            cache.compile(text, optimize, engine, compile_node)(interpreter.env, interpreter.emit)
+        else:
+            interpreter.run(_parse(text, optimize, cache))
+    finally:
+        if sink is not None:
+            sink.flush()
     return interpreter
 
 
-def run(text: str) -> Any:
+def run(text: str, engine: str = 'closures', optimize: bool = False,
+        cache: Optional[ParseCache] = default_cache) -> Any:
     """
     Ejecuta código y retorna el último valor evaluado.
     
     Args:
         text: Código fuente a ejecutar
+        engine: Motor de ejecución (ver ENGINES)
+        optimize: Aplicar el optimizador (ver optimizer.py) antes de ejecutar
+        cache: Caché de programas parseados y compilados (ver interpret);
+            None para parsear y compilar siempre
     
     Returns:
         El resultado de la última expresión evaluada
     """
+    interpreter = Interpreter(engine)
+    if cache is not None and engine in COMPILED_ENGINES:
+        return cache.compile(text, optimize, engine, compile_node)(interpreter.env, interpreter.emit)
+    return interpreter.run(_parse(text, optimize, cache))
+
+
+def _parse(text: str, optimize: bool, cache: Optional[ParseCache]) -> Any:
+    """Parsea (y optimiza) usando la caché si hay una"""
+    if cache is not None:
+        return cache.get(text, optimize)
     ast = parse(text)
-    interpreter = Interpreter()
-    return interpreter.run(ast)
+    if optimize:
+        from optimizer import optimize as optimize_ast
+        ast, _ = optimize_ast(ast)
+    return ast
+
+
+def _has_arrays(env: Optional[Dict[str, Any]]) -> bool:
+    """vectorized.has_arrays sin importar vectorized si NumPy no está cargado"""
+    if not env or 'numpy' not in sys.modules:
+        return False
+    from vectorized import has_arrays
+    return has_arrays(env)
+
+
+def interpret_stream(chunks: Iterable[str], env: Dict[str, Any] = None,
+                     engine: str = 'closures', optimize: bool = False,
+                     sink: Optional[Sink] = None) -> Interpreter:
+    """
+    Lexer + parser + interpreter en flujo: cada sentencia se ejecuta en
+    cuanto se termina de leer.
+    
+    Args:
+        chunks: Fragmentos del código fuente (por ejemplo, bloques de un archivo)
+        env: Entorno inicial opcional con variables predefinidas
+        engine: Motor de ejecución (ver ENGINES)
+        optimize: Plegar constantes en cada sentencia (las optimizaciones
+            entre sentencias requieren el programa completo)
+        sink: Destino de la salida de print (ver sinks.py); se vacía con
+            flush() al terminar, pero no se cierra
+    
+    Returns:
+        El intérprete después de ejecutar (contiene env y output)
+    """
+    interpreter = Interpreter(engine, sink)
+    if env:
+        interpreter.env.update(env)
+    statements = parse_stream(chunks)
+    if optimize:
+        from optimizer import optimize_stream
+        statements = optimize_stream(statements)
+    try:
+        interpreter.run_stream(statements)
+    finally:
+        if sink is not None:
+            sink.flush()
+    return interpreter
 
 
 # ==================== REPL ====================
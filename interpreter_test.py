@@ -1,9 +1,20 @@
 import argparse
+import os
+import subprocess
 import sys
+import tempfile
 import unittest
+from importlib.util import find_spec
 from io import StringIO
-from interpreter import interpret, run, Interpreter, RuntimeError
-from parser import parse
+from unittest import mock
+from contextlib import redirect_stdout
+from interpreter import (
+    interpret, interpret_stream, run, Interpreter, RuntimeError,
+    compile_program, compile_node, CompiledProgram, RunResult,
+    COMPILED_CACHE_SIZE, COMPILED_ENGINES, ENGINES
+)
+from parser import parse, parse_stream, ProgramNode, NumberNode, IdNode, BinOpNode, UnaryOpNode, PrintNode, AssignNode
+from sinks import CaptureSink
 class InterpreterTest(unittest.TestCase):
     """Tests unitarios para el intérprete"""
     
@@ -222,6 +233,292 @@ class InterpreterTest(unittest.TestCase):
         """
         interp = interpret(code)
         self.assertEqual(interp.output, [True])
+    
+    # ---------- Tests de ejecución en flujo ----------
+    
+    def test_stream_execution(self):
+        """interpret_stream produce el mismo resultado que interpret"""
+        code = "a = 5;\nb = a * 2;\nprint(b);\nprint(a > b);\n"
+        chunks = [code[i:i + 3] for i in range(0, len(code), 3)]
+        interp = interpret_stream(chunks, env={'z': 1})
+        self.assertEqual(interp.output, [10, False])
+        self.assertEqual(interp.env, {'z': 1, 'a': 5, 'b': 10})
+    
+    def test_stream_runs_before_error(self):
+        """Las sentencias se ejecutan antes de leer el resto del código"""
+        interp = Interpreter()
+        def chunks():
+            yield "print(1); x = "
+            self.assertEqual(interp.output, [1])
+            yield "2; print(x); y = ("
+        with self.assertRaises(Exception):
+            interp.run_stream(parse_stream(chunks()))
+        self.assertEqual(interp.output, [1, 2])
+    
+    # ---------- Tests de la compilación por nodo ----------
+    
+    def test_run_reuses_compiled(self):
+        """Ejecutar otra vez el mismo nodo no lo vuelve a compilar"""
+        for engine in COMPILED_ENGINES:
+            interp = Interpreter(engine, CaptureSink())
+            program = parse("x = x + 1; print(x);")
+            interp.env['x'] = 0
+            interp.run(program)
+            compiled = interp._compile(program)
+            interp.run(program)
+            self.assertIs(interp._compile(program), compiled, engine)
+            self.assertEqual(interp.output, [1, 2], engine)
+    
+    def test_run_recompiles_edited_program(self):
+        """Si cambian las sentencias del programa, se vuelve a compilar"""
+        interp = Interpreter('closures', CaptureSink())
+        program = parse("print(1);")
+        interp.run(program)
+        program.statements.append(PrintNode(NumberNode(2)))
+        interp.run(program)
+        self.assertEqual(interp.output, [1, 1, 2])
+    
+    def test_stream_not_compiled(self):
+        """run_stream() recorre las sentencias en lugar de compilarlas"""
+        for engine in COMPILED_ENGINES:
+            interp = Interpreter(engine, CaptureSink())
+            interp.run_stream(parse_stream(["x = 2; print(x * 3);"]))
+            self.assertEqual(interp._compiled, {}, engine)
+            self.assertEqual(interp.output, [6], engine)
+
+
+class StackEngineTest(unittest.TestCase):
+    """Tests para la evaluación iterativa (motor 'stack')"""
+    
+    def test_matches_tree_walker(self):
+        """walk() produce lo mismo que visit()"""
+        programs = [
+            "1 + 2 * 3 - 8 / 3;",
+            "--5;",
+            "not 0 or 1 and 0;",
+            "0 and 1 / 0;",
+            "2 or y;",
+            "x = 10; y = x * 2; print(y); y > x;",
+        ]
+        for code in programs:
+            walker, stack = Interpreter('tree'), Interpreter('stack')
+            self.assertEqual(stack.run(parse(code)), walker.run(parse(code)), code)
+            self.assertEqual(stack.env, walker.env, code)
+            self.assertEqual(stack.output, walker.output, code)
+    
+    def test_errors(self):
+        """Errores de ejecución con el motor stack"""
+        with self.assertRaises(RuntimeError):
+            run("10 / 0;", engine='stack')
+        with self.assertRaises(RuntimeError):
+            run("x + 1;", engine='stack')
+    
+    def test_deep_tree(self):
+        """Anidamiento de 100k niveles sin recursión"""
+        node = IdNode('x')
+        for i in range(100_000):
+            node = UnaryOpNode('-', node) if i % 2 else BinOpNode(node, 'and', NumberNode(1))
+        interp = Interpreter('stack')
+        interp.env['x'] = 3
+        interp.run(ProgramNode([PrintNode(node)]))
+        self.assertEqual(interp.output, [-1])
+
+
+class CompiledProgramTest(unittest.TestCase):
+    """Tests para compile_program: compilar una vez, ejecutar muchas"""
+    
+    CODE = "total = precio * cantidad; print(total); total > 100;"
+    
+    def test_run_many_records(self):
+        """Cada ejecución devuelve valor, salida y entorno propios"""
+        prog = compile_program(self.CODE)
+        first = prog({'precio': 30, 'cantidad': 5})
+        second = prog.run({'precio': 2, 'cantidad': 3})
+        self.assertEqual(first, RunResult(True, [150], {'precio': 30, 'cantidad': 5, 'total': 150}))
+        self.assertEqual(second.value, False)
+        self.assertEqual(second.output, [6])
+        self.assertEqual(second.env['total'], 6)
+    
+    def test_env_not_modified(self):
+        """El entorno recibido no se modifica"""
+        env = {'precio': 1, 'cantidad': 1}
+        compile_program(self.CODE)(env)
+        self.assertEqual(env, {'precio': 1, 'cantidad': 1})
+    
+    def test_no_stdout(self):
+        """La salida se captura sin escribirse en stdout"""
+        out = StringIO()
+        with redirect_stdout(out):
+            result = compile_program("print(7);").run()
+        self.assertEqual(out.getvalue(), "")
+        self.assertEqual(result.output, [7])
+    
+    def test_emit_callback(self):
+        """emit recibe cada valor impreso además de capturarlo"""
+        seen = []
+        result = compile_program("print(1); print(2);").run(emit=seen.append)
+        self.assertEqual(seen, [1, 2])
+        self.assertEqual(result.output, [1, 2])
+    
+    def test_compiled_engines(self):
+        """Todos los motores compilados dan el mismo resultado"""
+        record = {'precio': 30, 'cantidad': 5}
+        expected = compile_program(self.CODE)(record)
+        for engine in COMPILED_ENGINES:
+            prog = compile_program(self.CODE, engine=engine, optimize=True)
+            self.assertIsInstance(prog, CompiledProgram)
+            self.assertEqual(prog(record), expected, engine)
+        with self.assertRaises(ValueError):
+            compile_program(self.CODE, engine='tree')
+    
+    def test_errors(self):
+        """Los errores de ejecución se propagan en cada llamada"""
+        prog = compile_program("x / y;")
+        self.assertEqual(prog({'x': 6, 'y': 3}).value, 2)
+        with self.assertRaises(RuntimeError):
+            prog({'x': 6, 'y': 0})
+        with self.assertRaises(RuntimeError):
+            prog({'x': 6})
+
+
+class TraceTest(unittest.TestCase):
+    """Tests para los suscriptores de eventos de ejecución"""
+    
+    CODE = "x = 1; print(x + 1); x * 5; y = x - 3;"
+    
+    def traced(self, engine='closures', **options):
+        interp = Interpreter(engine, CaptureSink())
+        events = []
+        subscription = interp.subscribe(events.append, **options)
+        result = interp.run(parse(self.CODE))
+        return interp, subscription, events, result
+    
+    def test_all_events(self):
+        """Entrada, salida, asignación e impresión, en orden, con todos los motores"""
+        for engine in ENGINES:
+            if engine == 'vector' and find_spec('numpy') is None:
+                continue  # El motor vectorial requiere NumPy
+            interp, _, events, result = self.traced(engine)
+            self.assertEqual([(e.kind, type(e.node).__name__, e.value) for e in events], [
+                ('statement_enter', 'AssignNode', None), ('assign', 'AssignNode', 1),
+                ('statement_exit', 'AssignNode', 1),
+                ('statement_enter', 'PrintNode', None), ('print', 'PrintNode', 2),
+                ('statement_exit', 'PrintNode', None),
+                ('statement_enter', 'BinOpNode', None), ('statement_exit', 'BinOpNode', 5),
+                ('statement_enter', 'AssignNode', None), ('assign', 'AssignNode', -2),
+                ('statement_exit', 'AssignNode', -2),
+            ], engine)
+            self.assertEqual(result, -2)
+            self.assertEqual(interp.output, [2])
+    
+    def test_filters(self):
+        """Filtrado por evento y por tipo de sentencia"""
+        _, _, events, _ = self.traced(events=['assign'])
+        self.assertEqual([e.node.name for e in events], ['x', 'y'])
+        _, _, events, _ = self.traced(node_types=(PrintNode,))
+        self.assertEqual([e.kind for e in events], ['statement_enter', 'print', 'statement_exit'])
+        with self.assertRaises(ValueError):
+            Interpreter().subscribe(print, events=['otro'])
+    
+    def test_sampling(self):
+        """Con every=N se entrega uno de cada N eventos"""
+        _, subscription, events, _ = self.traced(events=['statement_enter'], every=3)
+        self.assertEqual([type(e.node) for e in events], [AssignNode, AssignNode])
+        self.assertEqual(subscription.delivered, 2)
+    
+    def test_multiple_subscribers(self):
+        """Cada suscriptor recibe sus eventos"""
+        interp = Interpreter('closures', CaptureSink())
+        first, second = [], []
+        interp.subscribe(first.append, events=['print'])
+        interp.subscribe(second.append, events=['assign'])
+        interp.run(parse(self.CODE))
+        self.assertEqual([e.value for e in first], [2])
+        self.assertEqual([e.value for e in second], [1, -2])
+    
+    def test_unsubscribe_restores_methods(self):
+        """Sin suscriptores se usan los métodos originales"""
+        for sink in (None, CaptureSink()):
+            interp = Interpreter('closures', sink)
+            emit = interp.emit
+            subscription = interp.subscribe(lambda event: None)
+            self.assertIn('run', interp.__dict__)
+            interp.unsubscribe(subscription)
+            self.assertNotIn('run', interp.__dict__)
+            self.assertEqual(interp.emit, emit)
+    
+    def test_program_larger_than_cache(self):
+        """Un programa trazado con más sentencias que la caché se compila una sola vez"""
+        code = "".join(f"x{i} = {i};" for i in range(COMPILED_CACHE_SIZE + 100))
+        ast = parse(code)
+        interp = Interpreter('closures', CaptureSink())
+        events = []
+        interp.subscribe(events.append, events=['assign'])
+        with mock.patch('interpreter.compile_node', wraps=compile_node) as compile_mock:
+            for _ in range(2):
+                interp.run(ast)
+        self.assertEqual(compile_mock.call_count, COMPILED_CACHE_SIZE + 100)
+        self.assertEqual(len(events), 2 * (COMPILED_CACHE_SIZE + 100))
+        self.assertEqual(interp.env[f"x{COMPILED_CACHE_SIZE}"], COMPILED_CACHE_SIZE)
+    
+    def test_failed_statement(self):
+        """Una sentencia que falla no produce statement_exit"""
+        interp = Interpreter('closures', CaptureSink())
+        events = []
+        interp.subscribe(events.append)
+        with self.assertRaises(RuntimeError):
+            interp.run(parse("1 / 0;"))
+        self.assertEqual([e.kind for e in events], ['statement_enter'])
+        # Un valor impreso después no se atribuye a la sentencia que falló
+        interp.emit(7)
+        self.assertEqual((events[-1].kind, events[-1].node), ('print', None))
+
+
+class StartupTest(unittest.TestCase):
+    """Tests de los módulos que carga main.py en cada modo (ver bench/startup.py)"""
+    
+    MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+    
+    # Módulos de otros modos, que ningún camino de abajo debe cargar
+    OTHER_MODES = ('typing', 'bytecode', 'optimizer', 'dataflow', 'vectorized',
+                   'records', 'profiler', 'batch')
+    
+    def imported(self, *args):
+        """Salida de `main.py args` y módulos que importó"""
+        result = subprocess.run([sys.executable, '-X', 'importtime', self.MAIN, *args],
+                                capture_output=True, text=True, check=True)
+        modules = {line.rsplit('|', 1)[1].strip() for line in result.stderr.splitlines()
+                   if line.startswith('import time:')}
+        return result.stdout, modules
+    
+    def test_no_typing_at_startup(self):
+        """Ni typing ni argparse ni los módulos de otros modos se importan"""
+        output, modules = self.imported('-c', 'print(1);')
+        self.assertEqual(output, "1\n")
+        self.assertIn('interpreter', modules)
+        for module in ('argparse',) + self.OTHER_MODES:
+            self.assertNotIn(module, modules)
+    
+    def test_no_typing_running_file(self):
+        """Ejecutar un archivo solo carga el intérprete y la caché en disco"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'programa.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write("x = 2; print(x * 3);")
+            for _ in range(2):  # Sin entrada en la caché y con ella
+                output, modules = self.imported(path)
+                self.assertEqual(output, "6\n")
+                self.assertIn('filecache', modules)
+                for module in self.OTHER_MODES:
+                    self.assertNotIn(module, modules)
+    
+    def test_no_interpreter_for_tokens(self):
+        """--tokens solo carga el lexer"""
+        output, modules = self.imported('--tokens', '1;')
+        self.assertIn('Total: 2 tokens', output)
+        self.assertIn('lexer', modules)
+        for module in ('parser', 'interpreter', 'sinks') + self.OTHER_MODES:
+            self.assertNotIn(module, modules)
 
 
 def manual_test():
@@ -1,69 +1,245 @@
+from __future__ import annotations
 import re
-from dataclasses import dataclass
+from array import array
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Iterable, Iterator
+
+
+# ==================== TIPOS DE TOKEN ====================
+
+# El tipo de un token es un entero pequeño: el índice en esta tupla es el
+# código y el elemento es su nombre
+TOKEN_TYPES = (
+    'NUMBER', 'ID', 'PRINT', 'AND', 'OR', 'NOT',
+    'EQ', 'NEQ', 'LTE', 'GTE', 'LT', 'GT',
+    'ASSIGN', 'PLUS', 'MINUS', 'DIV', 'MULT',
+    'LPAREN', 'RPAREN', 'LBRACE', 'RBRACE', 'COMMA', 'SEMI',
+    'NEWLINE',
+)
+
+(NUMBER, ID, PRINT, AND, OR, NOT,
+ EQ, NEQ, LTE, GTE, LT, GT,
+ ASSIGN, PLUS, MINUS, DIV, MULT,
+ LPAREN, RPAREN, LBRACE, RBRACE, COMMA, SEMI,
+ NEWLINE) = range(len(TOKEN_TYPES))
+
+TOKEN_KINDS = {name: kind for kind, name in enumerate(TOKEN_TYPES)}
+
+
+# ==================== ESPECIFICACIÓN ====================
+
+# Palabras reservadas: se reconocen como ID y se reclasifican con este diccionario
+KEYWORDS = {
+    'print': 'PRINT',
+
+    # operadores booleanos
+    'and': 'AND',
+    'or': 'OR',
+    'not': 'NOT',
+}
+
+token_specs = [
+    ('NUMBER', r'\d+'),
+    ('ID',     r'[A-Za-z_]\w*'),
+
+    # operadores logicos
+
+    ("EQ", r'=='),
+    ("NEQ", r'!='),
+    ("LTE", r'<='),
+    ("GTE", r'>='),
+    ('LT', r'<'),
+    ('GT', r'>'),
+
+    #Operaciones aritmeticas y asignacion
+
+    ('ASSIGN', r'='),
+    ('PLUS',   r'\+'),
+    ('MINUS',  r'-'),
+    ('DIV', r'/'),
+    ('MULT', r'\*'),
+
+    # Delimitadores
+
+    ('LPAREN', r'\('),
+    ('RPAREN', r'\)'),
+    ('LBRACE', r'\{'),
+    ('RBRACE', r'\}'),
+    ('COMMA', r','),
+    ('SEMI', r';'),
+
+    ('NEWLINE', r'\n'),
+    # \r se ignora para aceptar archivos con fin de línea CRLF
+    ('SKIP',   r'[ \t\r\f\v]+'),
+
+    # Cualquier otro carácter es un error
+    ('MISMATCH', r'.'),
+]
+
+# Se compila una sola vez al importar el módulo. Los espacios delante de un
+# token se consumen en el mismo match (SKIP solo queda para los del final),
+# así que cada token cuesta una sola coincidencia
+tok_regex = re.compile(r'[ \t\r\f\v]*(?:'
+                       + '|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specs)
+                       + ')')
+
+# Grupos sin token asociado
+_SKIP = -1
+_MISMATCH = -2
+
+# Tipo de token por número de grupo de la expresión regular (mo.lastindex)
+_GROUP_KINDS = (None,) + tuple(
+    TOKEN_KINDS.get(name, _SKIP if name == 'SKIP' else _MISMATCH)
+    for name, _ in token_specs
+)
+
+_KEYWORD_KINDS = {word: TOKEN_KINDS[name] for word, name in KEYWORDS.items()}
+
+
+# ==================== TOKENS ====================
 
-@dataclass
 class Token:
-    type: str
-    value: str
-
-def lexer(text):
-    line_num = 1
-    line_start = 0
-
-    token_specs = [
-        ('NUMBER', r'\d+'),
-        ('PRINT',  r'\bprint\b'),
-
-        # operadores booleanos
-        ('AND', r'\band\b'),
-        ('OR', r'\bor\b'),
-        ('NOT', r'\bnot\b'),
-
-        ('ID',     r'[A-Za-z_]\w*'),
-
-        # operadores logicos
-
-        ("EQ", r'=='),
-        ("NEQ", r'!='),
-        ("LTE", r'<='),
-        ("GTE", r'>='),
-        ('LT', r'<'),
-        ('GT', r'>'),
-
-        #Operaciones aritmeticas y asignacion
-
-        ('ASSIGN', r'='),
-        ('PLUS',   r'\+'),
-        ('MINUS',  r'-'),
-        ('DIV', r'/'),
-        ('MULT', r'\*'),
-
-        # Delimitadores
-
-        ('LPAREN', r'\('),
-        ('RPAREN', r'\)'),
-        ('LBRACE', r'\{'),
-        ('RBRACE', r'\}'),
-        ('COMMA', r','),
-        ('SEMI', r';'),
-
-        ('NEWLINE', r'\n'),
-        ('SKIP',   r'[ \t]+'),
-
-    ]
-    tok_regex = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in token_specs)
-    for mo in re.finditer(tok_regex, text):
-        kind = mo.lastgroup
-        value = mo.group()
-        if kind == 'NUMBER':
-            yield Token('NUMBER', value)
-        elif kind == 'ID':
-            yield Token('ID', value)
-        elif kind == 'NEWLINE':
-            yield Token('NEWLINE', value)
-        elif kind == 'SKIP':
-            continue
-        elif kind == 'MISMATCH':
-            raise RuntimeError(f'Unexpected character: {value!r}')
-        else:
-            yield Token(kind, value)
\ No newline at end of file
+    """
+    Un token: tipo entero y posición [start, end) en el código fuente.
+
+    El texto del token no se copia al crearlo; `value` lo recorta del código
+    fuente solo cuando se pide.
+    """
+
+    __slots__ = ('kind', 'start', 'end', 'source')
+
+    def __init__(self, kind: int, start: int, end: int, source: str):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.source = source
+
+    @property
+    def type(self) -> str:
+        """Nombre del tipo ('ID', 'SEMI', ...)"""
+        return TOKEN_TYPES[self.kind]
+
+    @property
+    def value(self) -> str:
+        """Texto del token"""
+        return self.source[self.start:self.end]
+
+    def __repr__(self):
+        return f'Token(type={self.type!r}, value={self.value!r})'
+
+    def __eq__(self, other):
+        if not isinstance(other, Token):
+            return NotImplemented
+        return self.kind == other.kind and self.value == other.value
+
+    __hash__ = None
+
+
+class TokenStream:
+    """
+    Secuencia de tokens en arreglos paralelos.
+
+    El token i es (kinds[i], starts[i], ends[i]) sobre `text`: no hay un
+    objeto por token ni copias del texto. Indexar la secuencia crea un Token
+    bajo demanda; el parser lee los arreglos directamente.
+    """
+
+    __slots__ = ('text', 'kinds', 'starts', 'ends')
+
+    def __init__(self, text: str):
+        self.text = text
+        self.kinds = array('B')
+        self.starts = array('q')
+        self.ends = array('q')
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> Token:
+        return Token(self.kinds[index], self.starts[index], self.ends[index], self.text)
+
+    def __iter__(self) -> Iterator[Token]:
+        text = self.text
+        for kind, start, end in zip(self.kinds, self.starts, self.ends):
+            yield Token(kind, start, end, text)
+
+    def value(self, index: int) -> str:
+        """Texto del token `index`"""
+        return self.text[self.starts[index]:self.ends[index]]
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable) -> 'TokenStream':
+        """
+        Construye una secuencia a partir de objetos con `type` y `value`.
+
+        Los valores se concatenan en un texto nuevo, separados por espacios.
+        """
+        parts = []
+        kinds = []
+        starts = []
+        ends = []
+        offset = 0
+        for token in tokens:
+            value = token.value
+            kinds.append(TOKEN_KINDS[token.type])
+            starts.append(offset)
+            offset += len(value)
+            ends.append(offset)
+            offset += 1
+            parts.append(value)
+        stream = cls(' '.join(parts))
+        stream.kinds.extend(kinds)
+        stream.starts.extend(starts)
+        stream.ends.extend(ends)
+        return stream
+
+
+# ==================== ANALIZADOR LÉXICO ====================
+
+def tokenize(text: str, first_line: int = 1) -> TokenStream:
+    """Analiza todo el texto y retorna sus tokens en arreglos paralelos"""
+    stream = TokenStream(text)
+    add_kind = stream.kinds.append
+    add_start = stream.starts.append
+    add_end = stream.ends.append
+    group_kinds = _GROUP_KINDS
+    keywords = _KEYWORD_KINDS
+    for mo in tok_regex.finditer(text):
+        group = mo.lastindex
+        kind = group_kinds[group]
+        if kind < 0:
+            if kind == _SKIP:
+                continue
+            _mismatch(text, mo, first_line)
+        start, end = mo.span(group)
+        if kind == ID:
+            kind = keywords.get(text[start:end], ID)
+        add_kind(kind)
+        add_start(start)
+        add_end(end)
+    return stream
+
+
+def lexer(text, first_line=1):
+    """Genera los tokens uno a uno (ver tokenize para la versión en arreglos)"""
+    group_kinds = _GROUP_KINDS
+    keywords = _KEYWORD_KINDS
+    for mo in tok_regex.finditer(text):
+        group = mo.lastindex
+        kind = group_kinds[group]
+        if kind < 0:
+            if kind == _SKIP:
+                continue
+            _mismatch(text, mo, first_line)
+        start, end = mo.span(group)
+        if kind == ID:
+            kind = keywords.get(text[start:end], ID)
+        yield Token(kind, start, end, text)
+
+
+def _mismatch(text, mo, first_line):
+    group = mo.lastindex
+    line_num = text.count('\n', 0, mo.start(group)) + first_line
+    raise RuntimeError(f'Unexpected character: {mo.group(group)!r} (line {line_num})')
@@ -1,7 +1,8 @@
 import argparse
 import sys
 import unittest
-from lexer import lexer
+from lexer import lexer, tokenize, TokenStream, TOKEN_TYPES, ID, SEMI
+from parser import Parser, parse
 
 class LexerTest(unittest.TestCase):
     def test_token_types_and_values(self):
@@ -31,6 +32,58 @@ class LexerTest(unittest.TestCase):
         self.assertEqual(values['NUMBER'], '123')
         self.assertEqual(values['ID'], 'abc')
 
+    def test_keywords_need_whole_identifier(self):
+        """Palabras reservadas solo si el identificador completo coincide"""
+        toks = list(lexer("printer not_x notx or1 and"))
+        self.assertEqual([t.type for t in toks], ['ID', 'ID', 'ID', 'ID', 'AND'])
+
+    def test_invalid_character_raises(self):
+        """Un carácter desconocido produce un error con la línea"""
+        with self.assertRaises(RuntimeError) as ctx:
+            list(lexer("x = 1;\ny = 2 @ 3;"))
+        self.assertIn("'@'", str(ctx.exception))
+        self.assertIn("line 2", str(ctx.exception))
+
+    def test_whitespace_skipped(self):
+        """Espacios, tabulaciones y retornos de carro (CRLF) se ignoran"""
+        toks = list(lexer("x\t =  1;\r\n"))
+        self.assertEqual([t.type for t in toks], ['ID', 'ASSIGN', 'NUMBER', 'SEMI', 'NEWLINE'])
+    # ---------- Tokens compactos ----------
+
+    def test_token_offsets(self):
+        """Cada token guarda su tipo entero y su posición en el texto"""
+        text = "  abc = 12;"
+        toks = list(lexer(text))
+        self.assertEqual(toks[0].kind, ID)
+        self.assertEqual((toks[0].start, toks[0].end), (2, 5))
+        self.assertEqual(toks[0].value, 'abc')
+        self.assertEqual(repr(toks[2]), "Token(type='NUMBER', value='12')")
+
+    def test_tokenize_arrays(self):
+        """tokenize() produce arreglos paralelos equivalentes a lexer()"""
+        text = "x = 10 ;\nprint(x and not y) ;  "
+        stream = tokenize(text)
+        self.assertIsInstance(stream, TokenStream)
+        self.assertEqual(list(stream), list(lexer(text)))
+        self.assertEqual(len(stream), len(stream.kinds))
+        self.assertEqual(stream.kinds[3], SEMI)
+        self.assertEqual(stream.value(2), '10')
+        self.assertEqual(TOKEN_TYPES[stream.kinds[2]], 'NUMBER')
+
+    def test_tokenize_invalid_character(self):
+        """tokenize() reporta el mismo error que lexer()"""
+        with self.assertRaises(RuntimeError) as ctx:
+            tokenize("x = 1;\n\n   $")
+        self.assertEqual(str(ctx.exception), "Unexpected character: '$' (line 3)")
+
+    def test_parser_accepts_token_list(self):
+        """Parser acepta también una lista de tokens"""
+        tokens = list(lexer("y = 2 * (x + 1);"))
+        self.assertEqual(Parser(tokens).parse(), parse("y = 2 * (x + 1);"))
+        self.assertEqual(Parser(TokenStream.from_tokens(tokens)).parse(),
+                         parse("y = 2 * (x + 1);"))
+
+
 def manual_test():
     text = "print(123);\nfoo = 42 and not 0;"
     tokens = list(lexer(text))
@@ -1,19 +1,44 @@
+import sys
 
+# Los módulos de cada modo se importan dentro de su función: ejecutar
+# `-c "1;"` no carga la caché en disco, el pool de procesos ni el
+# perfilador (ver bench/startup.py)
+
+
+# Tamaño de los bloques en que se lee un archivo a ejecutar
+CHUNK_SIZE = 1 << 16
 
-import argparse
-import sys
-from lexer import lexer
-from parser import parse, print_ast
-from interpreter import interpret, repl
 
+def run_file(filename: str, engine: str = 'closures', optimize: bool = False,
+             cache: bool = True, cache_dir: str = None, sink=None):
+    """
+    Ejecuta un archivo de código fuente.
 
-def run_file(filename: str):
-    """Ejecuta un archivo de código fuente"""
+    Cada sentencia se ejecuta en cuanto se termina de parsear, así que la
+    salida empieza antes de leer todo el archivo. Con la caché activada el
+    AST se guarda además en disco (ver filecache.py) y las ejecuciones
+    siguientes del mismo contenido no vuelven a parsearlo. Con o sin caché
+    el archivo y el AST se procesan por bloques, así que la memoria no
+    depende de su tamaño.
+    Con `optimize`, en los dos casos cada sentencia se optimiza por separado.
+
+    `sink` es el destino de la salida de print (ver sinks.py); por defecto
+    se usa print().
+    """
+    from interpreter import Interpreter, interpret_stream
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            code = f.read()
-        
-        interp = interpret(code)
+        if cache:
+            from filecache import cached_statements
+            statements = cached_statements(filename, optimize, cache_dir)
+            try:
+                Interpreter(engine, sink).run_stream(statements)
+            finally:
+                if sink is not None:
+                    sink.flush()
+        else:
+            with open(filename, 'r', encoding='utf-8') as f:
+                chunks = iter(lambda: f.read(CHUNK_SIZE), '')
+                interpret_stream(chunks, engine=engine, optimize=optimize, sink=sink)
         return True
         
     except FileNotFoundError:
@@ -24,10 +49,114 @@ def run_file(filename: str):
         return False
 
 
-def run_code(code: str):
+def run_code(code: str, engine: str = 'closures', optimize: bool = False, sink=None):
     """Ejecuta código directamente"""
+    from interpreter import interpret
     try:
-        interp = interpret(code)
+        interp = interpret(code, engine=engine, optimize=optimize, sink=sink)
+        return True
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+
+def run_over(data: str, code: str, engine: str = 'closures', optimize: bool = False,
+             format: str = None, chunk_size: int = None,
+             output: str = None, emit: str = None, vectorize: bool = True):
+    """
+    Ejecuta el código una vez por registro de un archivo CSV o JSONL.
+
+    El código se parsea y compila una sola vez; cada columna del registro
+    queda ligada a la variable del mismo nombre. Los registros se leen y se
+    evalúan por bloques (vectorizados si es posible, ver records.py) y cada
+    resultado se escribe en una línea de `output` (stdout por defecto).
+    """
+    from interpreter import compile_program
+    from records import (
+        read_records, chunked, evaluate_records, detect_format, default_emit_mode, CHUNK_SIZE
+    )
+    if chunk_size is None:
+        chunk_size = CHUNK_SIZE
+
+    def report(number, error):
+        print(f"Error en el registro {number}: {error}", file=sys.stderr)
+    
+    def write(value):
+        out.write(f"{value}\n")
+
+    try:
+        prog = compile_program(code, engine=engine, optimize=optimize)
+        if format is None:
+            format = detect_format(data)
+        if emit is None:
+            emit = default_emit_mode(prog)
+        out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+        try:
+            with open(data, 'r', encoding='utf-8', newline='') as f:
+                chunks = chunked(read_records(f, format), chunk_size)
+                failed = evaluate_records(prog, chunks, write, emit, vectorize, report)
+        finally:
+            if output:
+                out.close()
+        return failed == 0
+    except FileNotFoundError as e:
+        print(f"Error: No se encontró el archivo '{e.filename}'")
+        return False
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+
+def run_batch_files(sources, engine: str = 'closures', optimize: bool = False,
+                    jobs: int = None, timeout: float = None, output: str = None):
+    """
+    Ejecuta muchos scripts en paralelo (ver batch.py).
+
+    Escribe un objeto JSON por script, en el orden de entrada, en `output`
+    (stdout por defecto) y un resumen con el rendimiento en stderr. Devuelve
+    True solo si todos los scripts terminaron bien.
+    """
+    from batch import collect_scripts, run_batch
+
+    def write(result):
+        out.write(result.to_json() + "\n")
+
+    try:
+        scripts = collect_scripts(sources)
+        out = open(output, 'w', encoding='utf-8') if output else sys.stdout
+        try:
+            summary = run_batch(scripts, jobs, engine, optimize, timeout, write)
+        finally:
+            if output:
+                out.close()
+        print(summary, file=sys.stderr)
+        return summary.ok == summary.scripts
+    except FileNotFoundError as e:
+        print(f"Error: No se encontró el archivo '{e.filename}'")
+        return False
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+
+def run_profile(code: str, top: int = None, collapsed: str = None, sink=None):
+    """
+    Ejecuta el código midiendo el tiempo por fase, por tipo de nodo, por
+    operador y por sentencia (ver profiler.py).
+
+    El informe se escribe en stderr, para no mezclarse con la salida del
+    programa; con `collapsed` las pilas se guardan además en ese archivo en
+    formato colapsado, para generar un gráfico de llama.
+    """
+    from profiler import profile, TOP_STATEMENTS
+    if top is None:
+        top = TOP_STATEMENTS
+    try:
+        result = profile(code, sink)
+        print(result.format_table(top), file=sys.stderr)
+        if collapsed:
+            with open(collapsed, 'w', encoding='utf-8') as f:
+                result.write_collapsed(f)
         return True
     except Exception as e:
         print(f"Error: {e}")
@@ -36,6 +165,7 @@ def run_code(code: str):
 
 def show_tokens(code: str):
     """Muestra los tokens del código"""
+    from lexer import lexer
     print("=" * 40)
     print("Tokens:")
     print("=" * 40)
@@ -45,19 +175,36 @@ def show_tokens(code: str):
     print(f"\nTotal: {len(tokens)} tokens")
 
 
-def show_ast(code: str):
+def show_ast(code: str, optimize: bool = False):
     """Muestra el AST del código"""
+    from parser import parse, print_ast
+    from optimizer import optimize as optimize_ast
     print("=" * 40)
     print("AST (Árbol de Sintaxis Abstracta):")
     print("=" * 40)
     try:
         ast = parse(code)
+        if optimize:
+            ast, removed = optimize_ast(ast)
         print_ast(ast)
+        if optimize:
+            print(f"\nOptimizador: {removed} nodos eliminados")
     except Exception as e:
         print(f"Error de sintaxis: {e}")
 
 
 def main():
+    # Camino rápido para el caso más común, `main.py -c CODIGO`: sin argparse
+    # ni las constantes de los demás modos
+    argv = sys.argv[1:]
+    if len(argv) == 2 and argv[0] in ('-c', '--code') and not argv[1].startswith('-'):
+        sys.exit(0 if run_code(argv[1]) else 1)
+
+    import argparse
+    # Solo las opciones: options.py no importa nada, así que --tokens o un
+    # archivo no cargan los módulos de los demás modos
+    from options import ENGINES, RECORDS_CHUNK_SIZE, FORMATS, EMIT_MODES, SINKS, TOP_STATEMENTS
+
     parser = argparse.ArgumentParser(
         description="Interpretador de Lenguaje Simple",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -68,6 +215,13 @@ Ejemplos:
   python main.py -c "x = 5; print(x);" # Ejecutar código
   python main.py --tokens "1 + 2;"     # Ver tokens
   python main.py --ast "1 + 2 * 3;"    # Ver AST
+  python main.py --engine bytecode programa.txt  # Ejecutar con la VM
+  python main.py -O --ast "x * 1 + 0;"  # Ver AST optimizado
+  python main.py --no-cache programa.txt  # Ejecutar sin caché en disco
+  python main.py --over datos.csv reglas.txt  # Ejecutar por cada registro
+  python main.py --batch scripts/ --jobs 8 --timeout 5  # Ejecutar muchos scripts
+  python main.py --sink buffered programa.txt  # Escribir la salida por bloques
+  python main.py --profile programa.txt  # Medir el tiempo por nodo y por línea
         """
     )
     
@@ -94,6 +248,121 @@ Ejemplos:
         help='Mostrar AST del código'
     )
     
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        help='Motor de ejecución (por defecto: closures; --profile usa siempre tree)'
+    )
+    
+    parser.add_argument(
+        '-O', '--optimize',
+        action='store_true',
+        help='Plegar constantes y simplificar el AST antes de ejecutar'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        dest='cache',
+        action='store_false',
+        help='No leer ni escribir la caché de programas en disco'
+    )
+    
+    parser.add_argument(
+        '--cache-dir',
+        metavar='DIR',
+        help='Directorio de caché (por defecto: __interpcache__ junto al archivo)'
+    )
+    
+    parser.add_argument(
+        '--over',
+        metavar='DATOS',
+        help='Ejecutar el programa una vez por registro de un archivo CSV o JSONL'
+    )
+    
+    parser.add_argument(
+        '--format',
+        choices=FORMATS,
+        help='Formato de DATOS (por defecto: según la extensión)'
+    )
+    
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=RECORDS_CHUNK_SIZE,
+        metavar='N',
+        help=f'Registros por bloque con --over (por defecto: {RECORDS_CHUNK_SIZE})'
+    )
+    
+    parser.add_argument(
+        '--emit',
+        choices=EMIT_MODES,
+        help='Con --over: escribir el valor final o los valores impresos '
+             '(por defecto: print si el programa imprime)'
+    )
+    
+    parser.add_argument(
+        '-o', '--output',
+        metavar='ARCHIVO',
+        help='Con --over o --batch: archivo de salida (por defecto: stdout)'
+    )
+    
+    parser.add_argument(
+        '--no-vectorize',
+        dest='vectorize',
+        action='store_false',
+        help='Con --over: no evaluar los bloques por columnas con NumPy'
+    )
+    
+    parser.add_argument(
+        '--batch',
+        nargs='+',
+        metavar='FUENTE',
+        help='Ejecutar muchos scripts en paralelo: directorios, patrones glob '
+             'o @manifiesto (una ruta por línea)'
+    )
+    
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        metavar='N',
+        help='Con --batch: procesos en paralelo (por defecto: un proceso por núcleo)'
+    )
+    
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        metavar='SEG',
+        help='Con --batch: tiempo límite por script en segundos'
+    )
+    
+    parser.add_argument(
+        '--sink',
+        choices=SINKS,
+        default='print',
+        help='Destino de la salida de print: print() por valor, buffered '
+             '(stdout por bloques) o null (descartar) (por defecto: print)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Medir el tiempo por fase, tipo de nodo, operador y sentencia (informe en stderr)'
+    )
+    
+    parser.add_argument(
+        '--profile-top',
+        type=int,
+        default=TOP_STATEMENTS,
+        metavar='N',
+        help=f'Con --profile: sentencias más lentas a mostrar (por defecto: {TOP_STATEMENTS})'
+    )
+    
+    parser.add_argument(
+        '--profile-output',
+        metavar='ARCHIVO',
+        help='Con --profile: guardar las pilas en formato colapsado (gráficos de llama)'
+    )
+    
     args = parser.parse_args()
     
     # Mostrar tokens
@@ -103,20 +372,70 @@ Ejemplos:
     
     # Mostrar AST
     if args.ast:
-        show_ast(args.ast)
+        show_ast(args.ast, args.optimize)
         return
     
+    # Ejecutar midiendo tiempos
+    if args.profile:
+        if args.engine is not None:
+            # El perfilado mide cada nodo del recorrido del árbol (ver profiler.py)
+            parser.error("--profile usa siempre el motor 'tree' y no admite --engine")
+        if args.code:
+            code = args.code
+        elif args.archivo:
+            try:
+                with open(args.archivo, 'r', encoding='utf-8') as f:
+                    code = f.read()
+            except FileNotFoundError:
+                print(f"Error: No se encontró el archivo '{args.archivo}'")
+                sys.exit(1)
+        else:
+            parser.error("--profile requiere un archivo de programa o -c")
+        from sinks import make_sink
+        success = run_profile(code, args.profile_top, args.profile_output, make_sink(args.sink))
+        sys.exit(0 if success else 1)
+    
+    if args.engine is None:
+        args.engine = 'closures'
+    
+    from sinks import make_sink
+    
+    # Ejecutar muchos scripts en paralelo
+    if args.batch:
+        success = run_batch_files(args.batch, args.engine, args.optimize,
+                                  args.jobs, args.timeout, args.output)
+        sys.exit(0 if success else 1)
+    
+    # Ejecutar por cada registro de un archivo de datos
+    if args.over:
+        if args.code:
+            code = args.code
+        elif args.archivo:
+            try:
+                with open(args.archivo, 'r', encoding='utf-8') as f:
+                    code = f.read()
+            except FileNotFoundError:
+                print(f"Error: No se encontró el archivo '{args.archivo}'")
+                sys.exit(1)
+        else:
+            parser.error("--over requiere un archivo de programa o -c")
+        success = run_over(args.over, code, args.engine, args.optimize, args.format,
+                           args.chunk_size, args.output, args.emit, args.vectorize)
+        sys.exit(0 if success else 1)
+    
     # Ejecutar código directamente
     if args.code:
-        success = run_code(args.code)
+        success = run_code(args.code, args.engine, args.optimize, make_sink(args.sink))
         sys.exit(0 if success else 1)
     
     # Ejecutar archivo
     if args.archivo:
-        success = run_file(args.archivo)
+        success = run_file(args.archivo, args.engine, args.optimize,
+                           args.cache, args.cache_dir, make_sink(args.sink))
         sys.exit(0 if success else 1)
     
     # REPL interactivo
+    from interpreter import repl
     repl()
 
 
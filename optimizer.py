@@ -0,0 +1,237 @@
+from __future__ import annotations
+from parser import (
+    ProgramNode, NumberNode, BinOpNode,
+    UnaryOpNode, AssignNode, PrintNode, count_nodes
+)
+from compiler import BINARY_OPS, UNARY_OPS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Iterable, Iterator, Tuple
+
+
+# Operadores cuyo resultado es siempre un entero (nunca un booleano)
+ARITHMETIC_OPS = ('+', '-', '*', '/')
+
+
+# ==================== UTILIDADES ====================
+
+def is_integer(node) -> bool:
+    """
+    Indica si una expresión produce siempre un entero (no un booleano).
+
+    Solo en ese caso son seguras identidades como x * 1 -> x: con un
+    booleano cambiaría el valor impreso (True * 1 es 1).
+    """
+    if isinstance(node, NumberNode):
+        return type(node.value) is int
+    if isinstance(node, BinOpNode):
+        return node.op in ARITHMETIC_OPS
+    if isinstance(node, UnaryOpNode):
+        return node.op == '-'
+    return False
+
+
+def is_boolean(node) -> bool:
+    """Indica si una expresión produce siempre un booleano"""
+    if isinstance(node, NumberNode):
+        return type(node.value) is bool
+    if isinstance(node, BinOpNode):
+        return node.op in ('==', '!=', '<', '>', '<=', '>=')
+    if isinstance(node, UnaryOpNode):
+        return node.op == 'not'
+    return False
+
+
+# ==================== OPTIMIZADOR ====================
+
+# Marcas de las tareas pendientes de Optimizer.visit
+_LEFT = object()
+_DONE = object()
+
+
+class Optimizer:
+    """
+    Plegado de constantes y simplificación algebraica sobre el AST.
+
+    No modifica el árbol recibido: construye nodos nuevos donde hay cambios,
+    por lo que un AST compartido (por ejemplo, cacheado) sigue siendo válido.
+    El recorrido usa una pila de trabajo explícita (como Interpreter.walk),
+    así que acepta árboles tan profundos como el parser.
+    """
+
+    def __init__(self):
+        self.removed = 0  # Nodos eliminados en la última optimización
+
+    def optimize(self, node) -> Any:
+        """Punto de entrada: optimiza un programa, sentencia o expresión"""
+        before = count_nodes(node)
+        result = self.visit(node)
+        self.removed = before - count_nodes(result)
+        return result
+
+    def visit(self, node, boolean: bool = False) -> Any:
+        """
+        Optimiza un nodo. `boolean` indica que solo importa la veracidad del
+        resultado (operando de `not`).
+
+        Recorre el árbol en orden posfijo: cada nodo se reconstruye (ver
+        opt_*) cuando sus hijos ya están optimizados en la pila de valores.
+        """
+        values: list = []
+        push_value = values.append
+        pop_value = values.pop
+        # Tareas pendientes: (nodo, boolean) a optimizar, o (marca, nodo, dato):
+        # _LEFT tras el operando izquierdo de un BinOpNode (dato: boolean) y
+        # _DONE con todos los hijos listos (dato según el tipo de nodo)
+        work: list = []
+        push = work.append
+        pop = work.pop
+
+        while True:
+            # Bajada: se desciende por el primer hijo hasta una hoja
+            while True:
+                kind = type(node)
+                if kind is BinOpNode:
+                    push((_LEFT, node, boolean))
+                    node, boolean = node.left, False
+                elif kind is UnaryOpNode:
+                    push((_DONE, node, boolean))
+                    node, boolean = node.operand, node.op == 'not'
+                elif kind is AssignNode:
+                    push((_DONE, node, None))
+                    node, boolean = node.value, False
+                elif kind is PrintNode:
+                    push((_DONE, node, None))
+                    node, boolean = node.expr, False
+                elif kind is ProgramNode and node.statements:
+                    push((_DONE, node, len(node.statements)))
+                    for stmt in reversed(node.statements[1:]):
+                        push((stmt, False))
+                    node, boolean = node.statements[0], False
+                elif kind is ProgramNode:
+                    push_value(ProgramNode([]))
+                    break
+                else:
+                    push_value(node)
+                    break
+
+            # Subida: se completan las tareas hasta encontrar otro nodo a bajar
+            while work:
+                task = pop()
+                marker = task[0]
+                if marker is _DONE:
+                    _, node, extra = task
+                    kind = type(node)
+                    if kind is BinOpNode:
+                        push_value(self.opt_BinOpNode(node, extra, pop_value()))
+                    elif kind is UnaryOpNode:
+                        push_value(self.opt_UnaryOpNode(node, pop_value(), extra))
+                    elif kind is AssignNode:
+                        value = pop_value()
+                        push_value(node if value is node.value else AssignNode(node.name, value))
+                    elif kind is PrintNode:
+                        expr = pop_value()
+                        push_value(node if expr is node.expr else PrintNode(expr))
+                    else:
+                        statements = values[len(values) - extra:]
+                        del values[len(values) - extra:]
+                        push_value(ProgramNode(statements))
+                elif marker is _LEFT:
+                    _, node, boolean = task
+                    left = pop_value()
+                    # Cortocircuito con lado izquierdo constante
+                    if node.op in ('and', 'or') and isinstance(left, NumberNode):
+                        if bool(left.value) == (node.op == 'or'):
+                            push_value(left)
+                            continue
+                        node = node.right
+                        break
+                    push((_DONE, node, left))
+                    node, boolean = node.right, False
+                    break
+                else:
+                    node, boolean = task
+                    break
+            else:
+                return values[-1]
+
+    # ---------- Expresiones ----------
+
+    def opt_BinOpNode(self, node: BinOpNode, left: Any, right: Any) -> Any:
+        """Simplifica una operación binaria con los operandos ya optimizados"""
+        op = node.op
+
+        if isinstance(left, NumberNode) and isinstance(right, NumberNode):
+            if op == '/':
+                # La división por cero se deja para que la reporte el runtime
+                if right.value != 0:
+                    return NumberNode(left.value // right.value)
+            elif op in BINARY_OPS:
+                return NumberNode(BINARY_OPS[op](left.value, right.value))
+
+        # Identidades: x + 0, 0 + x, x - 0, x * 1, 1 * x, x / 1
+        if op in ('+', '-', '*', '/'):
+            neutral = 0 if op in ('+', '-') else 1
+            if _is_literal(right, neutral) and is_integer(left):
+                return left
+            if op in ('+', '*') and _is_literal(left, neutral) and is_integer(right):
+                return right
+
+        if left is node.left and right is node.right:
+            return node
+        return BinOpNode(left, op, right)
+
+    def opt_UnaryOpNode(self, node: UnaryOpNode, operand: Any, boolean: bool) -> Any:
+        """Simplifica una operación unaria con el operando ya optimizado"""
+        if isinstance(operand, NumberNode) and node.op in UNARY_OPS:
+            return NumberNode(UNARY_OPS[node.op](operand.value))
+
+        if isinstance(operand, UnaryOpNode) and operand.op == node.op:
+            # --x -> x
+            if node.op == '-' and is_integer(operand.operand):
+                return operand.operand
+            # not not x -> x (si x ya es booleano o solo importa su veracidad)
+            if node.op == 'not' and (boolean or is_boolean(operand.operand)):
+                return operand.operand
+
+        if operand is node.operand:
+            return node
+        return UnaryOpNode(node.op, operand)
+
+
+def _is_literal(node, value) -> bool:
+    return isinstance(node, NumberNode) and type(node.value) is int and node.value == value
+
+
+def optimize(node) -> Tuple[Any, int]:
+    """
+    Función de conveniencia: optimiza un AST.
+
+    Aplica el plegado de constantes y, sobre programas completos, la
+    eliminación de subexpresiones comunes y de asignaciones muertas
+    (ver dataflow.py).
+
+    Returns:
+        El AST optimizado y la cantidad de nodos eliminados
+    """
+    before = count_nodes(node)
+    result = Optimizer().optimize(node)
+    if isinstance(result, ProgramNode):
+        from dataflow import eliminate_common_subexpressions, eliminate_dead_stores
+        result = eliminate_common_subexpressions(result)
+        result = eliminate_dead_stores(result)
+    return result, before - count_nodes(result)
+
+
+def optimize_stream(statements: Iterable[Any]) -> Iterator[Any]:
+    """
+    Optimiza sentencia a sentencia, para ejecutar en flujo.
+
+    Solo se pliegan constantes y se simplifica cada sentencia: la
+    eliminación de subexpresiones comunes y de asignaciones muertas requiere
+    el programa completo.
+    """
+    optimizer = Optimizer()
+    for stmt in statements:
+        yield optimizer.optimize(stmt)
@@ -0,0 +1,118 @@
+import sys
+import unittest
+from errors import RuntimeError
+from interpreter import Interpreter, run
+from optimizer import Optimizer, optimize, optimize_stream, count_nodes
+from parser import parse, parse_stream, NumberNode, IdNode, BinOpNode, UnaryOpNode
+
+
+class OptimizerTest(unittest.TestCase):
+    """Tests unitarios para el plegado de constantes y la simplificación"""
+
+    def optimized(self, code):
+        ast, _ = optimize(parse(code))
+        return ast.statements[0]
+
+    # ---------- Plegado de constantes ----------
+
+    def test_fold_arithmetic(self):
+        """Subexpresiones constantes se reducen a un número"""
+        stmt = self.optimized("(3 * 4) + 2 - 10 / 3;")
+        self.assertIsInstance(stmt, NumberNode)
+        self.assertEqual(stmt.value, 11)
+
+    def test_fold_comparison_and_not(self):
+        """Comparaciones y not constantes se pliegan"""
+        self.assertIs(self.optimized("not (1 < 2);").value, False)
+
+    def test_fold_inside_variables(self):
+        """Se pliega la parte constante de una expresión con variables"""
+        stmt = self.optimized("x + 2 * 3;")
+        self.assertIsInstance(stmt, BinOpNode)
+        self.assertEqual(stmt.right.value, 6)
+
+    def test_division_by_zero_left_for_runtime(self):
+        """1 / 0 no se pliega y el error lo reporta la ejecución"""
+        stmt = self.optimized("1 / 0;")
+        self.assertIsInstance(stmt, BinOpNode)
+        with self.assertRaises(RuntimeError):
+            run("1 / 0;", optimize=True)
+
+    # ---------- Identidades ----------
+
+    def test_multiply_by_one(self):
+        """(x + y) * 1 -> x + y"""
+        stmt = self.optimized("(x + y) * 1 - 0;")
+        self.assertEqual(stmt.op, '+')
+
+    def test_identity_keeps_booleans(self):
+        """x * 1 se conserva si x podría ser booleano"""
+        self.assertEqual(self.optimized("x * 1;").op, '*')
+        self.assertEqual(run("x = 1 < 2; x * 1;", optimize=True), 1)
+
+    def test_double_negation(self):
+        """--(x + 1) -> x + 1"""
+        stmt = self.optimized("--(x + 1);")
+        self.assertIsInstance(stmt, BinOpNode)
+
+    def test_not_not_in_boolean_context(self):
+        """not not not x -> not x; not not x se conserva"""
+        stmt = self.optimized("not not not x;")
+        self.assertIsInstance(stmt, UnaryOpNode)
+        self.assertIsInstance(stmt.operand, IdNode)
+        stmt = self.optimized("not not x;")
+        self.assertIsInstance(stmt.operand, UnaryOpNode)
+
+    def test_constant_and_or(self):
+        """and/or con lado izquierdo constante se cortocircuitan"""
+        self.assertEqual(self.optimized("0 and x;").value, 0)
+        self.assertIsInstance(self.optimized("1 and x;"), IdNode)
+        self.assertEqual(self.optimized("2 or x;").value, 2)
+        self.assertIsInstance(self.optimized("0 or x;"), IdNode)
+
+    # ---------- Conteo y semántica ----------
+
+    def test_removed_count(self):
+        """Se reporta la cantidad de nodos eliminados"""
+        ast = parse("(3 * 4) + (x + 1) * 1 - 0;")
+        result, removed = optimize(ast)
+        self.assertEqual(removed, count_nodes(ast) - count_nodes(result))
+        self.assertEqual(removed, 6)
+
+    def test_does_not_mutate_input(self):
+        """El AST original no se modifica"""
+        ast = parse("x = 1 + 2;")
+        optimize(ast)
+        self.assertIsInstance(ast.statements[0].value, BinOpNode)
+
+    def test_same_results(self):
+        """El programa optimizado produce la misma salida"""
+        code = """
+        a = 2 * 3 + 0;
+        b = (a + 1) * 1;
+        c = not not (a < b) and 1 or 0;
+        print(a); print(b); print(c);
+        --b - 0;
+        """
+        plain, optimized = Interpreter(), Interpreter()
+        expected = plain.run(parse(code))
+        result = optimized.run(optimize(parse(code))[0])
+        self.assertEqual(result, expected)
+        self.assertEqual(optimized.output, plain.output)
+        self.assertEqual(optimized.env, plain.env)
+
+    def test_deep_tree(self):
+        """Árboles tan profundos como acepta el parser, sin RecursionError"""
+        depth = 20_000
+        stmt = parse("y = " + "-" * depth + "(x + 0 * 2);").statements[0]
+        # --(x + 0) -> x + 0: la profundidad es par, se cancelan todas
+        self.assertEqual(count_nodes(Optimizer().optimize(stmt)), 4)
+        folded = parse("(" * depth + "1" + " + 1)" * depth + ";").statements[0]
+        self.assertEqual(Optimizer().optimize(folded), NumberNode(depth + 1))
+        [streamed] = optimize_stream(parse_stream(["print(" + "not " * depth + "x);"]))
+        # print(not not x): x no es booleano, así que queda un par de not
+        self.assertEqual(count_nodes(streamed), 4)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
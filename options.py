@@ -0,0 +1,22 @@
+# Opciones de main.py que se validan con argparse. Este módulo no importa
+# nada, así que main.py puede armar la línea de comandos sin cargar el
+# intérprete ni los módulos de los demás modos (ver bench/startup.py); cada
+# módulo reexporta las suyas.
+
+# Motores de ejecución disponibles para Interpreter.run (ver interpreter.py)
+ENGINES = ('closures', 'bytecode', 'python', 'stack', 'tree', 'vector')
+
+# Registros por bloque con --over (ver records.evaluate_records)
+RECORDS_CHUNK_SIZE = 10_000
+
+# Formatos de datos de --over (ver records.py)
+FORMATS = ('csv', 'jsonl')
+
+# Qué se escribe por registro: el valor final o los valores impresos
+EMIT_MODES = ('value', 'print')
+
+# Destinos de la salida de print que se pueden elegir en main.py --sink
+SINKS = ('print', 'buffered', 'null')
+
+# Sentencias más lentas que se muestran por defecto con --profile
+TOP_STATEMENTS = 10
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from parser import parse, count_nodes
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, List, Optional, Tuple
+
+
+# Bytes estimados por nodo del AST (ver bench/ast_memory.py)
+NODE_BYTES = 64
+
+# Límites de default_cache: un proceso de larga vida que interpreta
+# programas grandes no los retiene indefinidamente
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 32 << 20
+
+
+class CacheInfo(namedtuple('CacheInfo', ('hits', 'misses', 'evictions', 'entries', 'bytes'))):
+    """Estadísticas de una ParseCache"""
+    __slots__ = ()
+
+
+class ParseCache:
+    """
+    Caché LRU de programas parseados, indexada por el texto del código.
+
+    El tamaño se limita en entradas (`max_entries`), en bytes estimados
+    (`max_bytes`: texto más AST) o en ambos; al superarse se descartan las
+    entradas usadas hace más tiempo. Es segura entre hilos: dos hilos que
+    piden el mismo texto a la vez pueden parsearlo los dos, pero solo una de
+    las copias queda guardada.
+
+    Los AST guardados se comparten entre llamadas, así que no deben
+    modificarse (los motores y el optimizador no lo hacen). Junto a cada AST
+    se guarda lo compilado para cada motor (ver compile), que se descarta con
+    la entrada.
+    """
+
+    def __init__(self, max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+                 max_bytes: Optional[int] = None):
+        if max_entries is not None and max_entries < 0:
+            raise ValueError("max_entries no puede ser negativo")
+        if max_bytes is not None and max_bytes < 0:
+            raise ValueError("max_bytes no puede ser negativo")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # (texto, optimize) -> [AST, bytes estimados, {motor: compilado}, bytes del AST]
+        self._entries: 'OrderedDict[Tuple[str, bool], List[Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text: str, optimize: bool = False) -> Any:
+        """Retorna el AST de `text` (optimizado si se pide), parseándolo si hace falta"""
+        return self._entry(text, optimize)[0]
+
+    def compile(self, text: str, optimize: bool, engine: str,
+                compile_node: Callable[[Any, str], Any]) -> Any:
+        """
+        Retorna `text` compilado para `engine`, compilándolo si hace falta.
+
+        compile_node(ast, engine) se llama a lo sumo una vez por entrada y
+        motor (salvo que dos hilos lo pidan a la vez); cada motor compilado
+        cuenta en los bytes estimados como otra copia del AST.
+        """
+        entry = self._entry(text, optimize)
+        compiled = entry[2].get(engine)
+        if compiled is not None:
+            return compiled
+
+        # Se compila fuera del lock, como se parsea en _entry
+        compiled = compile_node(entry[0], engine)
+        with self._lock:
+            if engine not in entry[2]:
+                entry[2][engine] = compiled
+                if self._entries.get((text, optimize)) is entry:
+                    entry[1] += entry[3]
+                    self._bytes += entry[3]
+                    self._evict()
+            return entry[2][engine]
+
+    def _entry(self, text: str, optimize: bool) -> List[Any]:
+        """Retorna la entrada de `text`, parseándolo si hace falta"""
+        key = (text, optimize)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Se parsea fuera del lock para no bloquear a los demás hilos
+        ast = parse(text)
+        if optimize:
+            from optimizer import optimize as optimize_ast
+            ast, _ = optimize_ast(ast)
+        ast_bytes = count_nodes(ast) * NODE_BYTES
+        size = sys.getsizeof(text) + ast_bytes
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [ast, size, {}, ast_bytes]
+                self._bytes += size
+                self._evict()
+        return entry
+
+    def _evict(self) -> None:
+        """Descarta las entradas más antiguas hasta respetar los límites"""
+        entries = self._entries
+        while entries and (
+                (self.max_entries is not None and len(entries) > self.max_entries)
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            _, entry = entries.popitem(last=False)
+            self._bytes -= entry[1]
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Vacía la caché y reinicia los contadores"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """Retorna aciertos, fallos, descartes, entradas y bytes estimados"""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             len(self._entries), self._bytes)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Caché compartida por interpreter.interpret(), interpreter.run() e
+# interpreter.compile_program()
+default_cache = ParseCache(DEFAULT_MAX_ENTRIES, DEFAULT_MAX_BYTES)
@@ -0,0 +1,185 @@
+import sys
+import threading
+import unittest
+from unittest import mock
+from compiler import compile_ast
+from interpreter import interpret, run
+from parser import parse, ParseError
+from parsecache import ParseCache, CacheInfo, default_cache, DEFAULT_MAX_ENTRIES, DEFAULT_MAX_BYTES
+
+
+class ParseCacheTest(unittest.TestCase):
+    """Tests unitarios para la caché LRU de programas parseados"""
+
+    def test_hit_returns_same_ast(self):
+        """La segunda petición del mismo texto no vuelve a parsear"""
+        cache = ParseCache()
+        first = cache.get("x = 1 + 2;")
+        self.assertIs(cache.get("x = 1 + 2;"), first)
+        self.assertEqual(first, parse("x = 1 + 2;"))
+        self.assertEqual(cache.info(), CacheInfo(1, 1, 0, 1, cache.info().bytes))
+
+    def test_optimized_is_separate_entry(self):
+        """El AST optimizado se guarda aparte del original"""
+        cache = ParseCache()
+        plain = cache.get("x * 1 + 0;")
+        optimized = cache.get("x * 1 + 0;", optimize=True)
+        self.assertNotEqual(plain, optimized)
+        self.assertEqual(len(cache), 2)
+
+    def test_lru_eviction_by_entries(self):
+        """Al superar max_entries se descarta la menos usada"""
+        cache = ParseCache(max_entries=2)
+        a = cache.get("1;")
+        cache.get("2;")
+        cache.get("1;")           # "1;" pasa a ser la más reciente
+        cache.get("3;")           # descarta "2;"
+        self.assertIs(cache.get("1;"), a)
+        info = cache.info()
+        self.assertEqual((info.evictions, info.entries), (1, 2))
+        cache.get("2;")
+        self.assertEqual(cache.info().misses, 4)
+
+    def test_eviction_by_bytes(self):
+        """max_bytes limita el tamaño estimado total"""
+        cache = ParseCache(max_entries=None, max_bytes=1)
+        cache.get("1 + 2;")
+        info = cache.info()
+        self.assertEqual((info.entries, info.bytes, info.evictions), (0, 0, 1))
+
+        cache = ParseCache(max_entries=None, max_bytes=10_000)
+        for i in range(100):
+            cache.get(f"x = {i} * y + {i};")
+        self.assertLessEqual(cache.info().bytes, 10_000)
+        self.assertGreater(cache.info().evictions, 0)
+
+    def test_clear(self):
+        """clear() vacía la caché y los contadores"""
+        cache = ParseCache()
+        cache.get("1;")
+        cache.get("1;")
+        cache.clear()
+        self.assertEqual(cache.info(), CacheInfo(0, 0, 0, 0, 0))
+
+    def test_syntax_error_not_cached(self):
+        """Un error de sintaxis se propaga y no se guarda"""
+        cache = ParseCache()
+        with self.assertRaises(ParseError):
+            cache.get("1 +;")
+        self.assertEqual(len(cache), 0)
+
+    def test_invalid_limits(self):
+        """Error: límites negativos"""
+        with self.assertRaises(ValueError):
+            ParseCache(max_entries=-1)
+
+    def test_threads(self):
+        """Muchos hilos usando la misma caché mantienen los contadores consistentes"""
+        cache = ParseCache(max_entries=8)
+        texts = [f"x = {i} + y;" for i in range(16)]
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(500):
+                    text = texts[(i + offset) % len(texts)]
+                    self.assertEqual(cache.get(text), parse(text))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        info = cache.info()
+        self.assertEqual(info.hits + info.misses, 8 * 500)
+        self.assertLessEqual(info.entries, 8)
+
+    def test_compiled_per_engine(self):
+        """Lo compilado se guarda una vez por motor y se descarta con la entrada"""
+        cache = ParseCache(max_entries=1)
+        calls = []
+
+        def compile_node(ast, engine):
+            calls.append(engine)
+            return (ast, engine)
+
+        first = cache.compile("1;", False, 'closures', compile_node)
+        self.assertIs(cache.compile("1;", False, 'closures', compile_node), first)
+        self.assertIs(first[0], cache.get("1;"))
+        cache.compile("1;", False, 'bytecode', compile_node)
+        self.assertEqual(calls, ['closures', 'bytecode'])
+        cache.get("2;")  # Descarta la entrada de "1;"
+        cache.compile("1;", False, 'closures', compile_node)
+        self.assertEqual(calls, ['closures', 'bytecode', 'closures'])
+
+    def test_compiled_counts_bytes(self):
+        """Cada motor compilado suma al tamaño estimado de la entrada"""
+        cache = ParseCache()
+        cache.get("x = 1 + 2;")
+        parsed = cache.info().bytes
+        cache.compile("x = 1 + 2;", False, 'closures', lambda ast, engine: engine)
+        self.assertGreater(cache.info().bytes, parsed)
+
+    # ---------- Integración ----------
+
+    def test_interpret_uses_default_cache(self):
+        """interpret() y run() reutilizan el programa parseado"""
+        default_cache.clear()
+        self.addCleanup(default_cache.clear)
+        code = "y = x * 2; print(y);"
+        self.assertEqual(interpret(code, env={'x': 1}).output, [2])
+        self.assertEqual(interpret(code, env={'x': 5}).output, [10])
+        self.assertEqual(run("1 + 1;"), 2)
+        self.assertEqual(run("1 + 1;"), 2)
+        info = default_cache.info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+
+    def test_interpret_reuses_compiled(self):
+        """interpret() y run() no vuelven a compilar un texto ya ejecutado"""
+        default_cache.clear()
+        self.addCleanup(default_cache.clear)
+        code = "y = x * 2; print(y);"
+        with mock.patch('interpreter.compile_ast', wraps=compile_ast) as compile_mock:
+            self.assertEqual(interpret(code, env={'x': 1}).output, [2])
+            self.assertEqual(interpret(code, env={'x': 5}).output, [10])
+            self.assertEqual(run("x = 3; x * x;"), 9)
+            self.assertEqual(run("x = 3; x * x;"), 9)
+        self.assertEqual(compile_mock.call_count, 2)
+
+    def test_interpret_reuses_transpiled(self):
+        """Con engine='python' el objeto code se reutiliza con otro env"""
+        default_cache.clear()
+        self.addCleanup(default_cache.clear)
+        code = "y = x * 2; print(y);"
+        with mock.patch('transpiler.compile', wraps=compile) as compile_mock:
+            self.assertEqual(interpret(code, env={'x': 1}, engine='python').output, [2])
+            self.assertEqual(interpret(code, env={'x': 5}, engine='python').output, [10])
+            self.assertEqual(run("x = 3; x * x;", engine='python'), 9)
+            self.assertEqual(run("x = 3; x * x;", engine='python'), 9)
+        self.assertEqual(compile_mock.call_count, 2)
+
+    def test_default_cache_is_bounded(self):
+        """La caché por defecto limita entradas y bytes"""
+        self.assertEqual(default_cache.max_entries, DEFAULT_MAX_ENTRIES)
+        self.assertEqual(default_cache.max_bytes, DEFAULT_MAX_BYTES)
+        default_cache.clear()
+        self.addCleanup(default_cache.clear)
+        with mock.patch.object(default_cache, 'max_bytes', 2_000):
+            for i in range(20):
+                interpret(f"x = {i} * y + {i};", env={'y': 1})
+            self.assertLessEqual(default_cache.info().bytes, 2_000)
+
+    def test_interpret_without_cache(self):
+        """cache=None parsea siempre"""
+        default_cache.clear()
+        self.addCleanup(default_cache.clear)
+        interpret("1;", cache=None)
+        self.assertEqual(len(default_cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
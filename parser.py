@@ -1,47 +1,132 @@
-from dataclasses import dataclass
-from typing import List, Any, Optional
-from lexer import lexer, Token
+from __future__ import annotations
+from lexer import (
+    tokenize, Token, TokenStream, TOKEN_TYPES,
+    NUMBER, ID, PRINT, AND, OR, NOT, EQ, NEQ, LTE, GTE, LT, GT,
+    ASSIGN, PLUS, MINUS, DIV, MULT, LPAREN, RPAREN, SEMI, NEWLINE
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Any, Iterable, Iterator, Optional
+
+
+# ==================== CÓDIGOS DE OPERADOR ====================
+
+# Los operadores se guardan en los nodos como enteros pequeños; el índice en
+# estas tuplas es el código y el elemento es el símbolo
+BINARY_OPERATORS = ('+', '-', '*', '/', '==', '!=', '<', '>', '<=', '>=', 'and', 'or')
+UNARY_OPERATORS = ('-', 'not')
+
+(OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_EQ, OP_NE,
+ OP_LT, OP_GT, OP_LE, OP_GE, OP_AND, OP_OR) = range(len(BINARY_OPERATORS))
+OP_NEG, OP_NOT = range(len(UNARY_OPERATORS))
+
+BINARY_OPCODES = {symbol: code for code, symbol in enumerate(BINARY_OPERATORS)}
+UNARY_OPCODES = {symbol: code for code, symbol in enumerate(UNARY_OPERATORS)}
 
 
 # ==================== NODOS AST ====================
 
-@dataclass
-class NumberNode:
-    value: int
+class Node:
+    """
+    Base de los nodos del AST.
+
+    Los nodos usan __slots__ (sin __dict__ por instancia) para ocupar poca
+    memoria. `_fields` enumera los campos públicos en el orden del
+    constructor; se usa para __repr__ y __eq__.
+    """
+
+    __slots__ = ()
+    _fields: tuple = ()
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._fields)
+        return f'{type(self).__name__}({fields})'
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    __hash__ = None  # Mutables, como los dataclass con eq
+
+
+class NumberNode(Node):
+    __slots__ = ('value',)
+    _fields = ('value',)
+
+    def __init__(self, value: int):
+        self.value = value
+
+
+class IdNode(Node):
+    __slots__ = ('name',)
+    _fields = ('name',)
 
+    def __init__(self, name: str):
+        self.name = name
 
-@dataclass
-class IdNode:
-    name: str
 
+class BinOpNode(Node):
+    __slots__ = ('left', 'opcode', 'right')
+    _fields = ('left', 'op', 'right')
 
-@dataclass
-class BinOpNode:
-    left: Any
-    op: str
-    right: Any
+    def __init__(self, left: Any, op: str, right: Any):
+        self.left = left
+        self.op = op
+        self.right = right
 
+    @property
+    def op(self) -> str:
+        """Símbolo del operador ('+', 'and', ...)"""
+        return BINARY_OPERATORS[self.opcode]
 
-@dataclass  
-class UnaryOpNode:
-    op: str
-    operand: Any
+    @op.setter
+    def op(self, op: str) -> None:
+        self.opcode = BINARY_OPCODES[op]  # KeyError si el símbolo no es un operador
 
 
-@dataclass
-class AssignNode:
-    name: str
-    value: Any
+class UnaryOpNode(Node):
+    __slots__ = ('opcode', 'operand')
+    _fields = ('op', 'operand')
 
+    def __init__(self, op: str, operand: Any):
+        self.op = op
+        self.operand = operand
 
-@dataclass
-class PrintNode:
-    expr: Any
+    @property
+    def op(self) -> str:
+        """Símbolo del operador ('-' o 'not')"""
+        return UNARY_OPERATORS[self.opcode]
 
+    @op.setter
+    def op(self, op: str) -> None:
+        self.opcode = UNARY_OPCODES[op]  # KeyError si el símbolo no es un operador
 
-@dataclass
-class ProgramNode:
-    statements: List[Any]
+
+class AssignNode(Node):
+    __slots__ = ('name', 'value')
+    _fields = ('name', 'value')
+
+    def __init__(self, name: str, value: Any):
+        self.name = name
+        self.value = value
+
+
+class PrintNode(Node):
+    __slots__ = ('expr',)
+    _fields = ('expr',)
+
+    def __init__(self, expr: Any):
+        self.expr = expr
+
+
+class ProgramNode(Node):
+    __slots__ = ('statements',)
+    _fields = ('statements',)
+
+    def __init__(self, statements: List[Any]):
+        self.statements = statements
 
 
 # ==================== ERRORES ====================
@@ -53,236 +138,327 @@ class ParseError(Exception):
 # ==================== PARSER ====================
 
 class Parser:
-    def __init__(self, tokens: List[Token]):
+    def __init__(self, tokens: Iterable[Token]):
+        # El parser lee los arreglos de una TokenStream (ver lexer.tokenize);
+        # cualquier otra secuencia de tokens se convierte primero
+        if not isinstance(tokens, TokenStream):
+            tokens = TokenStream.from_tokens(tokens)
         self.tokens = tokens
+        self.kinds = tokens.kinds
         self.pos = 0
     
     # ---------- Utilidades ----------
     
+    def skip_newlines(self) -> int:
+        """Avanza sobre los saltos de línea y retorna la posición actual"""
+        kinds = self.kinds
+        pos = self.pos
+        end = len(kinds)
+        while pos < end and kinds[pos] == NEWLINE:
+            pos += 1
+        self.pos = pos
+        return pos
+    
     def current_token(self) -> Optional[Token]:
         """Retorna el token actual sin consumirlo"""
-        while self.pos < len(self.tokens) and self.tokens[self.pos].type == 'NEWLINE':
-            self.pos += 1
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
+        pos = self.skip_newlines()
+        if pos < len(self.kinds):
+            return self.tokens[pos]
         return None
     
-    def peek(self, token_type: str) -> bool:
+    def peek(self, kind: int) -> bool:
         """Verifica si el token actual es del tipo especificado"""
-        token = self.current_token()
-        return token is not None and token.type == token_type
+        pos = self.skip_newlines()
+        return pos < len(self.kinds) and self.kinds[pos] == kind
     
-    def consume(self, token_type: str) -> Token:
-        """Consume el token actual si coincide con el tipo esperado"""
-        token = self.current_token()
-        if token is None:
-            raise ParseError(f"Se esperaba '{token_type}', pero se llegó al final del archivo")
-        if token.type != token_type:
-            raise ParseError(f"Se esperaba '{token_type}', pero se encontró '{token.type}' ({token.value!r})")
-        self.pos += 1
-        return token
+    def consume(self, kind: int) -> int:
+        """Consume el token actual si es del tipo esperado y retorna su posición"""
+        pos = self.skip_newlines()
+        if pos == len(self.kinds):
+            raise ParseError(f"Se esperaba '{TOKEN_TYPES[kind]}', pero se llegó al final del archivo")
+        found = self.kinds[pos]
+        if found != kind:
+            raise ParseError(f"Se esperaba '{TOKEN_TYPES[kind]}', pero se encontró "
+                             f"'{TOKEN_TYPES[found]}' ({self.tokens.value(pos)!r})")
+        self.pos = pos + 1
+        return pos
     
-    def match(self, *token_types: str) -> Optional[Token]:
-        """Consume y retorna el token si coincide con alguno de los tipos, None si no"""
-        token = self.current_token()
-        if token is not None and token.type in token_types:
-            self.pos += 1
-            return token
+    def match(self, *kinds: int) -> Optional[int]:
+        """Consume el token si es de alguno de los tipos y retorna su posición, None si no"""
+        pos = self.skip_newlines()
+        if pos < len(self.kinds) and self.kinds[pos] in kinds:
+            self.pos = pos + 1
+            return pos
         return None
     
     # ---------- Reglas de la gramática ----------
     
     def parse(self) -> ProgramNode:
         """Punto de entrada: parsea todo el programa"""
-        statements = []
-        while self.current_token() is not None:
+        return ProgramNode(list(self.parse_statements()))
+    
+    def parse_statements(self) -> Iterator[Any]:
+        """Genera las sentencias del programa una a una"""
+        end = len(self.kinds)
+        while self.skip_newlines() < end:
             stmt = self.parse_statement()
             if stmt is not None:
-                statements.append(stmt)
-        return ProgramNode(statements)
+                yield stmt
     
     def parse_statement(self) -> Any:
         """Parsea una sentencia: asignación, print, o expresión"""
-        token = self.current_token()
+        kinds = self.kinds
+        pos = self.skip_newlines()
         
-        if token is None:
+        if pos == len(kinds):
             return None
         
         # Sentencia print
-        if token.type == 'PRINT':
+        if kinds[pos] == PRINT:
             return self.parse_print()
         
-        # Asignación: ID = expr ;
-        if token.type == 'ID':
-            # Mirar adelante para ver si es asignación
-            if self.pos + 1 < len(self.tokens):
-                next_tok = self.tokens[self.pos + 1]
-                if next_tok.type == 'ASSIGN':
-                    return self.parse_assignment()
+        # Asignación: ID = expr ; (se mira el token siguiente)
+        if kinds[pos] == ID and pos + 1 < len(kinds) and kinds[pos + 1] == ASSIGN:
+            return self.parse_assignment()
         
         # Expresión como sentencia
         return self.parse_expression_statement()
     
     def parse_print(self) -> PrintNode:
         """Parsea: print '(' expresion ')' ';'"""
-        self.consume('PRINT')
-        self.consume('LPAREN')
+        self.consume(PRINT)
+        self.consume(LPAREN)
         expr = self.parse_expression()
-        self.consume('RPAREN')
-        self.consume('SEMI')
+        self.consume(RPAREN)
+        self.consume(SEMI)
         return PrintNode(expr)
     
     def parse_assignment(self) -> AssignNode:
         """Parsea: ID '=' expresion ';'"""
-        name_token = self.consume('ID')
-        self.consume('ASSIGN')
+        name = self.tokens.value(self.consume(ID))
+        self.consume(ASSIGN)
         expr = self.parse_expression()
-        self.consume('SEMI')
-        return AssignNode(name_token.value, expr)
+        self.consume(SEMI)
+        return AssignNode(name, expr)
     
     def parse_expression_statement(self) -> Any:
         """Parsea: expresion ';'"""
         expr = self.parse_expression()
-        self.consume('SEMI')
+        self.consume(SEMI)
         return expr
     
     def parse_expression(self) -> Any:
-        """Parsea una expresión (punto de entrada)"""
-        return self.parse_or()
-    
-    def parse_or(self) -> Any:
-        """Parsea: and_expr ('or' and_expr)*"""
-        left = self.parse_and()
-        while self.match('OR'):
-            right = self.parse_and()
-            left = BinOpNode(left, 'or', right)
-        return left
-    
-    def parse_and(self) -> Any:
-        """Parsea: not_expr ('and' not_expr)*"""
-        left = self.parse_not()
-        while self.match('AND'):
-            right = self.parse_not()
-            left = BinOpNode(left, 'and', right)
-        return left
-    
-    def parse_not(self) -> Any:
-        """Parsea: 'not' not_expr | comparacion"""
-        if self.match('NOT'):
-            operand = self.parse_not()
-            return UnaryOpNode('not', operand)
-        return self.parse_comparison()
-    
-    def parse_comparison(self) -> Any:
-        """Parsea: suma (('==' | '!=' | '<' | '>' | '<=' | '>=') suma)?"""
-        left = self.parse_sum()
-        op = self.match('EQ', 'NEQ', 'LT', 'GT', 'LTE', 'GTE')
-        if op:
-            right = self.parse_sum()
-            # Mapear tipos de token a operadores legibles
-            op_map = {
-                'EQ': '==', 'NEQ': '!=',
-                'LT': '<', 'GT': '>',
-                'LTE': '<=', 'GTE': '>='
-            }
-            return BinOpNode(left, op_map[op.type], right)
-        return left
-    
-    def parse_sum(self) -> Any:
-        """Parsea: termino (('+' | '-') termino)*"""
-        left = self.parse_term()
-        while True:
-            op = self.match('PLUS', 'MINUS')
-            if op:
-                right = self.parse_term()
-                op_str = '+' if op.type == 'PLUS' else '-'
-                left = BinOpNode(left, op_str, right)
-            else:
-                break
-        return left
-    
-    def parse_term(self) -> Any:
-        """Parsea: factor (('*' | '/') factor)*"""
-        left = self.parse_factor()
+        """
+        Parsea una expresión por precedencia de operadores (Pratt).
+
+        Gramática equivalente, de menor a mayor precedencia:
+            or_expr    : and_expr ('or' and_expr)*
+            and_expr   : not_expr ('and' not_expr)*
+            not_expr   : 'not' not_expr | comparacion
+            comparacion: suma (('==' | '!=' | '<' | '>' | '<=' | '>=') suma)?
+            suma       : termino (('+' | '-') termino)*
+            termino    : factor (('*' | '/') factor)*
+            factor     : NUMBER | ID | '(' expresion ')' | '-' factor
+
+        Los operadores pendientes y los paréntesis abiertos se guardan en una
+        pila explícita, así que el anidamiento no consume recursión.
+        """
+        operators: List[tuple] = []  # Entradas (precedencia, operador, aridad)
+        operands: List[Any] = []
+        text = self.tokens.text
+        kinds = self.kinds
+        starts = self.tokens.starts
+        ends = self.tokens.ends
+        end = len(kinds)
+        pos = self.pos
+        
         while True:
-            op = self.match('MULT', 'DIV')
-            if op:
-                right = self.parse_factor()
-                op_str = '*' if op.type == 'MULT' else '/'
-                left = BinOpNode(left, op_str, right)
+            # ---------- Operando (con prefijos) ----------
+            while pos < end and kinds[pos] == NEWLINE:
+                pos += 1
+            if pos == end:
+                self.pos = pos
+                raise ParseError("Se esperaba una expresión, pero se llegó al final del archivo")
+            kind = kinds[pos]
+            
+            if kind == NUMBER:
+                operands.append(NumberNode(int(text[starts[pos]:ends[pos]])))
+                pos += 1
+            elif kind == ID:
+                operands.append(IdNode(text[starts[pos]:ends[pos]]))
+                pos += 1
+            elif kind in _PREFIX_OPERATORS and (
+                    kind != NOT or not operators or operators[-1][0] <= _NOT_PRECEDENCE):
+                # `not` solo puede iniciar una expresión o seguir a and/or/not/'('
+                pos += 1
+                operators.append(_PREFIX_OPERATORS[kind])
+                continue
             else:
-                break
-        return left
-    
-    def parse_factor(self) -> Any:
-        """Parsea: NUMBER | ID | '(' expresion ')' | '-' factor"""
-        token = self.current_token()
-        
-        if token is None:
-            raise ParseError("Se esperaba una expresión, pero se llegó al final del archivo")
-        
-        # Número
-        if token.type == 'NUMBER':
-            self.pos += 1
-            return NumberNode(int(token.value))
-        
-        # Identificador
-        if token.type == 'ID':
-            self.pos += 1
-            return IdNode(token.value)
-        
-        # Expresión entre paréntesis
-        if token.type == 'LPAREN':
-            self.consume('LPAREN')
-            expr = self.parse_expression()
-            self.consume('RPAREN')
-            return expr
-        
-        # Negación unaria
-        if token.type == 'MINUS':
-            self.consume('MINUS')
-            operand = self.parse_factor()
-            return UnaryOpNode('-', operand)
-        
-        raise ParseError(f"Token inesperado: {token.type} ({token.value!r})")
+                self.pos = pos
+                raise ParseError(f"Token inesperado: {TOKEN_TYPES[kind]} "
+                                 f"({text[starts[pos]:ends[pos]]!r})")
+            
+            # ---------- Operadores binarios y cierre ----------
+            while True:
+                while pos < end and kinds[pos] == NEWLINE:
+                    pos += 1
+                entry = _BINARY_OPERATORS.get(kinds[pos]) if pos < end else None
+                
+                if entry is not None:
+                    precedence = entry[0]
+                    if precedence == _COMPARISON_PRECEDENCE:
+                        # Las comparaciones no se encadenan: a < b < c termina en el segundo '<'
+                        while operators and operators[-1][0] > precedence:
+                            _reduce(operators, operands)
+                        if not operators or operators[-1][0] != precedence:
+                            break
+                    else:
+                        while operators and operators[-1][0] >= precedence:
+                            _reduce(operators, operands)
+                        break
+                
+                # Fin de la expresión (o del paréntesis actual)
+                while operators and operators[-1] is not _PAREN:
+                    _reduce(operators, operands)
+                self.pos = pos
+                if not operators:
+                    return operands.pop()
+                self.consume(RPAREN)
+                pos = self.pos
+                operators.pop()
+            
+            pos += 1
+            operators.append(entry)
+
+
+def _reduce(operators: List[tuple], operands: List[Any]) -> None:
+    """Aplica el operador del tope de la pila a sus operandos"""
+    _, op, arity = operators.pop()
+    if arity == 2:
+        right = operands.pop()
+        operands[-1] = BinOpNode(operands[-1], op, right)
+    else:
+        operands[-1] = UnaryOpNode(op, operands[-1])
+
+
+# Tabla de precedencias: tipo de token -> (precedencia, operador, aridad)
+_BINARY_OPERATORS = {
+    OR: (1, 'or', 2),
+    AND: (2, 'and', 2),
+    EQ: (4, '==', 2), NEQ: (4, '!=', 2),
+    LT: (4, '<', 2), GT: (4, '>', 2),
+    LTE: (4, '<=', 2), GTE: (4, '>=', 2),
+    PLUS: (5, '+', 2), MINUS: (5, '-', 2),
+    MULT: (6, '*', 2), DIV: (6, '/', 2),
+}
+
+_PREFIX_OPERATORS = {
+    NOT: (3, 'not', 1),
+    MINUS: (7, '-', 1),
+    LPAREN: (0, '(', 0),
+}
+
+_PAREN = _PREFIX_OPERATORS[LPAREN]
+_NOT_PRECEDENCE = 3
+_COMPARISON_PRECEDENCE = 4
 
 
 # ==================== FUNCIONES AUXILIARES ====================
 
 def parse(text: str) -> ProgramNode:
     """Función de conveniencia: lexer + parser en un solo paso"""
-    tokens = list(lexer(text))
-    parser = Parser(tokens)
-    return parser.parse()
+    return Parser(tokenize(text)).parse()
 
 
-def print_ast(node, indent=0):
-    """Imprime el AST de forma legible (para debug)"""
-    prefix = "  " * indent
+def parse_stream(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Parsea código que llega por fragmentos y genera las sentencias una a una.
+
+    Toda sentencia termina en ';' y ese carácter no aparece en ningún otro
+    token, así que el texto hasta el último ';' recibido siempre contiene
+    sentencias completas: se analiza en cuanto llega y el resto espera al
+    siguiente fragmento. La memoria queda acotada por el tamaño del fragmento
+    más la sentencia más larga, no por el tamaño total del código.
+    """
+    pending: List[str] = []  # Texto recibido después del último ';'
+    line = 1
+    for chunk in chunks:
+        cut = chunk.rfind(';')
+        if cut < 0:
+            pending.append(chunk)
+            continue
+        pending.append(chunk[:cut + 1])
+        text = ''.join(pending)
+        pending = [chunk[cut + 1:]]
+        yield from Parser(tokenize(text, line)).parse_statements()
+        line += text.count('\n')
     
-    if isinstance(node, ProgramNode):
-        print(f"{prefix}Program:")
-        for stmt in node.statements:
-            print_ast(stmt, indent + 1)
-    elif isinstance(node, NumberNode):
-        print(f"{prefix}Number({node.value})")
-    elif isinstance(node, IdNode):
-        print(f"{prefix}Id({node.name})")
-    elif isinstance(node, BinOpNode):
-        print(f"{prefix}BinOp({node.op}):")
-        print_ast(node.left, indent + 1)
-        print_ast(node.right, indent + 1)
-    elif isinstance(node, UnaryOpNode):
-        print(f"{prefix}UnaryOp({node.op}):")
-        print_ast(node.operand, indent + 1)
-    elif isinstance(node, AssignNode):
-        print(f"{prefix}Assign({node.name}):")
-        print_ast(node.value, indent + 1)
-    elif isinstance(node, PrintNode):
-        print(f"{prefix}Print:")
-        print_ast(node.expr, indent + 1)
-    else:
-        print(f"{prefix}Unknown: {node}")
+    text = ''.join(pending)
+    if text:
+        yield from Parser(tokenize(text, line)).parse_statements()
+
+
+def count_nodes(node) -> int:
+    """Cuenta los nodos de un árbol"""
+    total = 0
+    pending = [node]
+    while pending:
+        node = pending.pop()
+        total += 1
+        if isinstance(node, ProgramNode):
+            pending.extend(node.statements)
+        elif isinstance(node, BinOpNode):
+            pending.append(node.left)
+            pending.append(node.right)
+        elif isinstance(node, UnaryOpNode):
+            pending.append(node.operand)
+        elif isinstance(node, AssignNode):
+            pending.append(node.value)
+        elif isinstance(node, PrintNode):
+            pending.append(node.expr)
+    return total
+
+
+def print_ast(node, indent=0):
+    """
+    Imprime el AST de forma legible (para debug).
+
+    Usa una pila explícita en lugar de recursión para poder mostrar árboles
+    muy profundos.
+    """
+    pending = [(node, indent)]
+    while pending:
+        node, indent = pending.pop()
+        prefix = "  " * indent
+        
+        if isinstance(node, ProgramNode):
+            print(f"{prefix}Program:")
+            children = node.statements
+        elif isinstance(node, NumberNode):
+            print(f"{prefix}Number({node.value})")
+            children = ()
+        elif isinstance(node, IdNode):
+            print(f"{prefix}Id({node.name})")
+            children = ()
+        elif isinstance(node, BinOpNode):
+            print(f"{prefix}BinOp({node.op}):")
+            children = (node.left, node.right)
+        elif isinstance(node, UnaryOpNode):
+            print(f"{prefix}UnaryOp({node.op}):")
+            children = (node.operand,)
+        elif isinstance(node, AssignNode):
+            print(f"{prefix}Assign({node.name}):")
+            children = (node.value,)
+        elif isinstance(node, PrintNode):
+            print(f"{prefix}Print:")
+            children = (node.expr,)
+        else:
+            print(f"{prefix}Unknown: {node}")
+            children = ()
+        
+        # Los hijos se apilan en orden inverso para imprimirse en orden
+        for child in reversed(children):
+            pending.append((child, indent + 1))
 
 
 if __name__ == "__main__":
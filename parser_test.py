@@ -1,10 +1,13 @@
 import argparse
 import sys
 import unittest
+from contextlib import redirect_stdout
+from io import StringIO
 from parser import (
-    parse, Parser, ParseError,
+    parse, parse_stream, Parser, ParseError,
     NumberNode, IdNode, BinOpNode, UnaryOpNode,
-    AssignNode, PrintNode, ProgramNode, print_ast
+    AssignNode, PrintNode, ProgramNode, print_ast,
+    BINARY_OPERATORS, OP_ADD, OP_AND, OP_NOT
 )
 from lexer import lexer
 
@@ -238,6 +241,147 @@ class ParserTest(unittest.TestCase):
         """Error: token inesperado"""
         with self.assertRaises(ParseError):
             parse("+ 5;")
+    
+    def test_chained_comparison_error(self):
+        """Error: las comparaciones no se encadenan"""
+        with self.assertRaises(ParseError) as ctx:
+            parse("a < b < c;")
+        self.assertEqual(str(ctx.exception), "Se esperaba 'SEMI', pero se encontró 'LT' ('<')")
+    
+    def test_not_inside_arithmetic_error(self):
+        """Error: not no puede ser operando de un operador aritmético"""
+        with self.assertRaises(ParseError) as ctx:
+            parse("1 + not x;")
+        self.assertEqual(str(ctx.exception), "Token inesperado: NOT ('not')")
+    
+    def test_unexpected_eof_message(self):
+        """Error: expresión incompleta al final del archivo"""
+        with self.assertRaises(ParseError) as ctx:
+            parse("x = (1 +")
+        self.assertEqual(str(ctx.exception), "Se esperaba una expresión, pero se llegó al final del archivo")
+    
+    # ---------- Tests de precedencia (Pratt) ----------
+    
+    def test_unary_minus_binds_tighter(self):
+        """-a * b se parsea como (-a) * b"""
+        stmt = parse("-a * b;").statements[0]
+        self.assertEqual(stmt.op, '*')
+        self.assertIsInstance(stmt.left, UnaryOpNode)
+    
+    def test_left_associative(self):
+        """a - b - c se parsea como (a - b) - c"""
+        stmt = parse("a - b - c;").statements[0]
+        self.assertEqual(stmt.op, '-')
+        self.assertIsInstance(stmt.left, BinOpNode)
+        self.assertIsInstance(stmt.right, IdNode)
+    
+    def test_not_over_comparison(self):
+        """not a == b se parsea como not (a == b)"""
+        stmt = parse("not a == b;").statements[0]
+        self.assertIsInstance(stmt, UnaryOpNode)
+        self.assertEqual(stmt.operand.op, '==')
+    
+    def test_deep_parentheses(self):
+        """Paréntesis anidados más allá del límite de recursión"""
+        depth = sys.getrecursionlimit() * 50
+        ast = parse("(" * depth + "x" + ")" * depth + ";")
+        self.assertIsInstance(ast.statements[0], IdNode)
+    
+    def test_deep_unary_chain(self):
+        """Cadena larga de negaciones unarias"""
+        depth = sys.getrecursionlimit() * 50
+        node = parse("-" * depth + "1;").statements[0]
+        for _ in range(depth):
+            self.assertIsInstance(node, UnaryOpNode)
+            node = node.operand
+        self.assertEqual(node.value, 1)
+    
+    # ---------- Tests de parse_stream ----------
+    
+    def test_stream_matches_parse(self):
+        """parse_stream produce las mismas sentencias con cualquier tamaño de bloque"""
+        code = "x = 10;\ny = (x +\n 2) * 3;\nprint(y >= 36 and not 0);\nx;"
+        expected = parse(code).statements
+        for size in (1, 2, 5, 7, 1000):
+            chunks = [code[i:i + size] for i in range(0, len(code), size)]
+            self.assertEqual(list(parse_stream(chunks)), expected, size)
+    
+    def test_stream_is_lazy(self):
+        """Las sentencias se generan antes de leer todo el código"""
+        def chunks():
+            yield "x = 1; y"
+            raise AssertionError("se leyó el siguiente bloque antes de tiempo")
+        stream = parse_stream(chunks())
+        self.assertIsInstance(next(stream), AssignNode)
+    
+    def test_stream_incomplete_statement(self):
+        """Error: sentencia sin ';' al final del flujo"""
+        with self.assertRaises(ParseError):
+            list(parse_stream(["x = 1; y = ", "2"]))
+    
+    def test_stream_error_line(self):
+        """Los errores del lexer reportan la línea real del archivo"""
+        with self.assertRaises(RuntimeError) as ctx:
+            list(parse_stream(["x = 1;\ny = 2;\n", "z = 3 @ 4;"]))
+        self.assertIn("line 3", str(ctx.exception))
+    
+    # ---------- Tests de print_ast ----------
+    
+    def test_print_ast_deep_tree(self):
+        """print_ast muestra árboles más profundos que el límite de recursión"""
+        node = IdNode('x')
+        for _ in range(sys.getrecursionlimit() * 5):
+            node = UnaryOpNode('-', node)
+        out = StringIO()
+        with redirect_stdout(out):
+            print_ast(ProgramNode([node]))
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "Program:")
+        self.assertEqual(lines[-1].strip(), "Id(x)")
+        self.assertEqual(len(lines), sys.getrecursionlimit() * 5 + 2)
+
+
+class NodeTest(unittest.TestCase):
+    """Tests de la representación compacta de los nodos"""
+
+    def test_slots(self):
+        """Los nodos no tienen __dict__ por instancia"""
+        for node in (NumberNode(1), IdNode('x'), BinOpNode(IdNode('x'), '+', NumberNode(1)),
+                     UnaryOpNode('-', NumberNode(1)), AssignNode('x', NumberNode(1)),
+                     PrintNode(NumberNode(1)), ProgramNode([])):
+            self.assertFalse(hasattr(node, '__dict__'), type(node).__name__)
+
+    def test_opcodes(self):
+        """El operador se guarda como código entero y se expone como símbolo"""
+        node = parse("a + b and not c;").statements[0]
+        self.assertEqual(node.opcode, OP_AND)
+        self.assertEqual(node.left.opcode, OP_ADD)
+        self.assertEqual(node.right.opcode, OP_NOT)
+        self.assertEqual(node.left.op, '+')
+        for code, symbol in enumerate(BINARY_OPERATORS):
+            self.assertEqual(BinOpNode(NumberNode(1), symbol, NumberNode(2)).opcode, code)
+
+    def test_set_op(self):
+        """Asignar `op` actualiza el código"""
+        node = BinOpNode(NumberNode(1), '+', NumberNode(2))
+        node.op = 'or'
+        self.assertEqual(node.op, 'or')
+
+    def test_unknown_operator(self):
+        """Error: operador desconocido al construir el nodo"""
+        with self.assertRaises(KeyError):
+            BinOpNode(NumberNode(1), '%', NumberNode(2))
+        with self.assertRaises(KeyError):
+            UnaryOpNode('+', NumberNode(1))
+
+    def test_repr_and_eq(self):
+        """__repr__ y __eq__ conservan el formato de los dataclass"""
+        node = BinOpNode(IdNode('x'), '*', NumberNode(2))
+        self.assertEqual(repr(node),
+                         "BinOpNode(left=IdNode(name='x'), op='*', right=NumberNode(value=2))")
+        self.assertEqual(node, BinOpNode(IdNode('x'), '*', NumberNode(2)))
+        self.assertNotEqual(node, BinOpNode(IdNode('x'), '+', NumberNode(2)))
+        self.assertNotEqual(NumberNode(1), IdNode(1))
 
 
 def manual_test():
@@ -0,0 +1,235 @@
+from __future__ import annotations
+import time
+from interpreter import Interpreter
+from lexer import tokenize
+from options import TOP_STATEMENTS
+from parser import Parser, BinOpNode, UnaryOpNode
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, List, Optional, TextIO, Tuple
+    from sinks import Sink
+
+
+# ==================== ESTADÍSTICAS ====================
+
+class Stat:
+    """Llamadas y tiempo (inclusivo y propio, en segundos) de una categoría"""
+    __slots__ = ('calls', 'total', 'own')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0  # Incluye a los nodos hijos
+        self.own = 0.0    # Sin los nodos hijos
+
+    def add(self, total: float, own: float) -> None:
+        self.calls += 1
+        self.total += total
+        self.own += own
+
+    def __repr__(self):
+        return f"Stat(calls={self.calls}, total={self.total:.6f}, own={self.own:.6f})"
+
+
+# ==================== INTÉRPRETE CON PERFILADO ====================
+
+class ProfilingInterpreter(Interpreter):
+    """
+    Intérprete que mide cada nodo que evalúa.
+
+    Evalúa con Interpreter.walk (sin recursión, así que admite la misma
+    profundidad que los demás motores) y usa sus ganchos por nodo: cada nodo
+    abre un marco con su cronómetro al entrar y lo cierra al producir su
+    valor, así que los tiempos de cada nodo son comparables entre sí. Sin
+    ganchos, walk() solo paga una comparación por nodo.
+
+    Los tiempos se acumulan por tipo de nodo, por operador, por línea del
+    código y por pila de llamadas (para los gráficos de llama). Las pilas
+    se guardan como un árbol de prefijos: cada visita cuesta O(1) aunque
+    el árbol sea profundo.
+    """
+
+    def __init__(self, sink: Optional[Sink] = None):
+        super().__init__('tree', sink)
+        self.by_type: Dict[str, Stat] = {}
+        self.by_operator: Dict[str, Stat] = {}
+        self.by_line: Dict[int, Stat] = {}
+        # Pilas: (pila padre, etiqueta) -> id; por id, su clave y su tiempo propio
+        self._stack_ids: Dict[Tuple[int, str], int] = {}
+        self._stacks: List[Tuple[int, str]] = []
+        self._stack_own: List[float] = []
+        self._stack = -1  # Pila de la sentencia actual (-1: ninguna)
+        # Marcos de los nodos abiertos: [nodo, pila, tiempo de los hijos, inicio]
+        self._frames: List[list] = []
+
+    def run_statement(self, stmt, line: int) -> Any:
+        """Ejecuta una sentencia y atribuye su tiempo a la línea `line`"""
+        self._stack = self._stack_id(-1, f"línea {line}")
+        start = time.perf_counter()
+        try:
+            return self.visit(stmt)
+        finally:
+            elapsed = time.perf_counter() - start
+            stat = self.by_line.get(line)
+            if stat is None:
+                stat = self.by_line[line] = Stat()
+            stat.add(elapsed, elapsed)
+            self._stack = -1
+
+    def visit(self, node) -> Any:
+        """Evalúa un nodo con walk() midiendo cada nodo con sus ganchos"""
+        frames = self._frames
+        try:
+            return self.walk(node, self._enter, self._leave)
+        finally:
+            # Con un error, los nodos abiertos también se cuentan
+            while frames:
+                self._leave()
+
+    def _enter(self, node) -> None:
+        """Abre el marco de un nodo: su pila y su cronómetro"""
+        kind = type(node)
+        if kind is BinOpNode or kind is UnaryOpNode:
+            label = f"{kind.__name__}({node.op})"
+        else:
+            label = kind.__name__
+        frames = self._frames
+        parent = frames[-1][1] if frames else self._stack
+        frames.append([node, self._stack_id(parent, label), 0.0, time.perf_counter()])
+
+    def _leave(self) -> None:
+        """Cierra el marco del último nodo abierto y acumula su tiempo"""
+        frames = self._frames
+        node, stack, children, start = frames.pop()
+        elapsed = time.perf_counter() - start
+        own = elapsed - children
+        if frames:
+            frames[-1][2] += elapsed
+        self._stack_own[stack] += own
+        kind = type(node)
+        name = kind.__name__
+        stat = self.by_type.get(name)
+        if stat is None:
+            stat = self.by_type[name] = Stat()
+        stat.add(elapsed, own)
+        if kind is BinOpNode or kind is UnaryOpNode:
+            operator = node.op
+            stat = self.by_operator.get(operator)
+            if stat is None:
+                stat = self.by_operator[operator] = Stat()
+            stat.add(elapsed, own)
+
+    def _stack_id(self, parent: int, label: str) -> int:
+        key = (parent, label)
+        stack = self._stack_ids.get(key)
+        if stack is None:
+            stack = self._stack_ids[key] = len(self._stacks)
+            self._stacks.append(key)
+            self._stack_own.append(0.0)
+        return stack
+
+    def collapsed(self) -> List[Tuple[str, float]]:
+        """Pilas en formato 'a;b;c' con su tiempo propio en segundos"""
+        result = []
+        for stack, own in enumerate(self._stack_own):
+            if own <= 0:
+                continue
+            labels = []
+            while stack >= 0:
+                stack, label = self._stacks[stack]
+                labels.append(label)
+            result.append((';'.join(reversed(labels)), own))
+        return result
+
+
+# ==================== PERFIL DE UN PROGRAMA ====================
+
+class Profile:
+    """Resultado de profile(): fases, estadísticas y salida del programa"""
+
+    def __init__(self, text: str, phases: Dict[str, float], interpreter: ProfilingInterpreter):
+        self.text = text
+        self.phases = phases  # 'lex', 'parse', 'exec' -> segundos
+        self.interpreter = interpreter
+        self.by_type = interpreter.by_type
+        self.by_operator = interpreter.by_operator
+        self.by_line = interpreter.by_line
+
+    def top_statements(self, n: int = TOP_STATEMENTS) -> List[Tuple[int, Stat]]:
+        """Las `n` líneas con más tiempo de ejecución"""
+        return sorted(self.by_line.items(), key=lambda item: item[1].total, reverse=True)[:n]
+
+    def format_table(self, top: int = TOP_STATEMENTS) -> str:
+        """Informe legible: fases, tipos de nodo, operadores y sentencias más lentas"""
+        lines = []
+        total = sum(self.phases.values()) or 1.0
+
+        lines.append("Fases:")
+        for phase, seconds in self.phases.items():
+            lines.append(f"  {phase:8} {seconds * 1e3:10.3f} ms {100 * seconds / total:6.1f}%")
+
+        for title, stats in (("Tipo de nodo", self.by_type), ("Operador", self.by_operator)):
+            lines.append("")
+            lines.append(f"{title:20} {'llamadas':>10} {'total ms':>10} {'propio ms':>10} {'propio %':>9}")
+            own_total = sum(stat.own for stat in stats.values()) or 1.0
+            for name, stat in sorted(stats.items(), key=lambda item: item[1].own, reverse=True):
+                lines.append(f"{name:20} {stat.calls:10} {stat.total * 1e3:10.3f} "
+                             f"{stat.own * 1e3:10.3f} {100 * stat.own / own_total:8.1f}%")
+
+        source = self.text.splitlines()
+        lines.append("")
+        lines.append(f"Sentencias más lentas (top {top}):")
+        lines.append(f"{'línea':>7} {'veces':>7} {'ms':>10}  código")
+        for line, stat in self.top_statements(top):
+            code = source[line - 1].strip() if line <= len(source) else ''
+            if len(code) > 60:
+                code = code[:57] + '...'
+            lines.append(f"{line:7} {stat.calls:7} {stat.total * 1e3:10.3f}  {code}")
+        return '\n'.join(lines)
+
+    def write_collapsed(self, stream: TextIO) -> None:
+        """
+        Escribe las pilas en formato 'colapsado' (una por línea, con su tiempo
+        propio en microsegundos), el que leen flamegraph.pl y speedscope.
+        """
+        for stack, own in self.interpreter.collapsed():
+            micros = round(own * 1e6)
+            if micros > 0:
+                stream.write(f"{stack} {micros}\n")
+
+
+def profile(text: str, sink: Optional[Sink] = None) -> Profile:
+    """
+    Lexer + parser + ejecución midiendo cada fase y cada nodo.
+
+    La ejecución se hace con ProfilingInterpreter (recorriendo el árbol),
+    sentencia a sentencia, para atribuir el tiempo a la línea de cada una.
+    """
+    start = time.perf_counter()
+    tokens = tokenize(text)
+    lexed = time.perf_counter()
+
+    # Línea de cada sentencia: se cuentan los saltos desde la anterior
+    parser = Parser(tokens)
+    statements = []
+    line, offset = 1, 0
+    end = len(tokens.kinds)
+    while parser.skip_newlines() < end:
+        start_offset = tokens.starts[parser.pos]
+        stmt = parser.parse_statement()
+        line += text.count('\n', offset, start_offset)
+        offset = start_offset
+        statements.append((stmt, line))
+    parsed = time.perf_counter()
+
+    interpreter = ProfilingInterpreter(sink)
+    try:
+        for stmt, line in statements:
+            interpreter.run_statement(stmt, line)
+    finally:
+        if sink is not None:
+            sink.flush()
+    executed = time.perf_counter()
+
+    phases = {'lex': lexed - start, 'parse': parsed - lexed, 'exec': executed - parsed}
+    return Profile(text, phases, interpreter)
@@ -0,0 +1,113 @@
+import io
+import sys
+import unittest
+from unittest import mock
+from errors import RuntimeError
+from interpreter import Interpreter
+from main import main
+from parser import parse
+from profiler import profile, ProfilingInterpreter
+from sinks import CaptureSink
+
+
+PROGRAM = """x = 2;
+y = x * 3 + 1;
+
+print(-y);  z = x and y;
+"""
+
+
+class ProfileTest(unittest.TestCase):
+    """Tests del perfilado de un programa"""
+
+    def setUp(self):
+        self.sink = CaptureSink()
+        self.result = profile(PROGRAM, self.sink)
+
+    def test_same_behavior(self):
+        """El programa se ejecuta igual que sin perfilado"""
+        self.assertEqual(self.sink.values, [-7])
+        self.assertEqual(self.result.interpreter.env, {'x': 2, 'y': 7, 'z': 7})
+
+    def test_counts_by_type_and_operator(self):
+        """Se cuentan las visitas por tipo de nodo y por operador"""
+        counts = {name: stat.calls for name, stat in self.result.by_type.items()}
+        self.assertEqual(counts, {'AssignNode': 3, 'PrintNode': 1, 'NumberNode': 3,
+                                  'IdNode': 4, 'BinOpNode': 3, 'UnaryOpNode': 1})
+        counts = {op: stat.calls for op, stat in self.result.by_operator.items()}
+        self.assertEqual(counts, {'*': 1, '+': 1, '-': 1, 'and': 1})
+
+    def test_own_time_within_total(self):
+        """El tiempo propio nunca supera al inclusivo"""
+        for stat in self.result.by_type.values():
+            self.assertLessEqual(stat.own, stat.total + 1e-9)
+
+    def test_statements_by_line(self):
+        """Cada sentencia se atribuye a su línea del código"""
+        self.assertEqual(sorted(self.result.by_line), [1, 2, 4])
+        self.assertEqual(self.result.by_line[4].calls, 2)
+        self.assertEqual(len(self.result.top_statements(2)), 2)
+
+    def test_phases(self):
+        """Se miden las tres fases"""
+        self.assertEqual(list(self.result.phases), ['lex', 'parse', 'exec'])
+
+    def test_table(self):
+        """El informe incluye las secciones y el código de las sentencias"""
+        table = self.result.format_table()
+        for text in ('Fases:', 'BinOpNode', 'Operador', 'y = x * 3 + 1;'):
+            self.assertIn(text, table)
+
+    def test_collapsed(self):
+        """Las pilas empiezan por la línea y siguen el anidamiento"""
+        stacks = dict(self.result.interpreter.collapsed())
+        self.assertIn('línea 2;AssignNode;BinOpNode(+);BinOpNode(*);IdNode', stacks)
+        stream = io.StringIO()
+        self.result.write_collapsed(stream)
+        for line in stream.getvalue().splitlines():
+            stack, micros = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith('línea '))
+            self.assertGreater(int(micros), 0)
+
+    def test_runtime_error(self):
+        """Los errores del programa se propagan"""
+        with self.assertRaises(RuntimeError):
+            profile("x = 1 / 0;", CaptureSink())
+
+    def test_matches_tree_engine(self):
+        """Cortocircuito, división y programas completos como el motor tree"""
+        for code in ("0 and x;", "1 or x;", "x = 7 / 2; print(x and 0 or -x);",
+                     "not 0 == 1;", "a = 1; b = a < 2; a + b;"):
+            expected = Interpreter('tree', CaptureSink())
+            profiled = ProfilingInterpreter(CaptureSink())
+            self.assertEqual(profiled.run(parse(code)), expected.run(parse(code)), code)
+            self.assertEqual((profiled.env, profiled.output), (expected.env, expected.output), code)
+
+    def test_deep_tree(self):
+        """Árboles más profundos que el límite de recursión de Python"""
+        code = "x = " + "(1 + " * 2000 + "1" + ")" * 2000 + "; print(" + "-" * 2000 + "x);"
+        result = profile(code, CaptureSink())
+        self.assertEqual(result.interpreter.output, [2001])
+        self.assertEqual(result.by_operator['+'].calls, 2000)
+        self.assertEqual(result.by_type['UnaryOpNode'].calls, 2000)
+        stacks = dict(result.interpreter.collapsed())
+        self.assertTrue(any(stack.count('BinOpNode(+)') == 2000 for stack in stacks))
+
+    def test_base_interpreter_unchanged(self):
+        """Interpreter no tiene el cronómetro de visit"""
+        self.assertIsNot(ProfilingInterpreter.visit, Interpreter.visit)
+        self.assertFalse(hasattr(Interpreter(), 'by_type'))
+
+    def test_cli_rejects_engine(self):
+        """main.py --profile no acepta --engine: siempre perfila el motor tree"""
+        argv = ['main.py', '--profile', '--engine', 'bytecode', '-c', '1;']
+        with mock.patch.object(sys, 'argv', argv), \
+                mock.patch('sys.stderr', io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit) as raised:
+                main()
+        self.assertEqual(raised.exception.code, 2)
+        self.assertIn("'tree'", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
@@ -0,0 +1,192 @@
+from __future__ import annotations
+import os
+from itertools import islice
+from errors import RuntimeError
+from options import RECORDS_CHUNK_SIZE as CHUNK_SIZE, FORMATS, EMIT_MODES
+from parser import ProgramNode, PrintNode
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
+    from interpreter import CompiledProgram
+
+
+# ==================== LECTURA ====================
+
+def detect_format(path: str) -> str:
+    """Deduce el formato por la extensión del archivo"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"No se reconoce el formato de '{path}' (use --format)")
+
+
+def read_records(stream: TextIO, format: str) -> Iterator[Dict[str, Any]]:
+    """
+    Genera los registros de un archivo CSV (con cabecera) o JSONL, uno a uno.
+
+    En CSV los valores enteros se convierten a int y las celdas vacías se
+    omiten (la variable queda sin definir); en JSONL cada línea es un objeto
+    y sus valores se usan tal cual.
+    """
+    # csv y json se importan al leer: importar records (por ejemplo, para las
+    # opciones de main.py) no los carga
+    if format == 'csv':
+        import csv
+        reader = csv.reader(stream)
+        header = next(reader, None)
+        if header is None:
+            return
+        for row in reader:
+            record = {}
+            for name, value in zip(header, row):
+                if value:
+                    try:
+                        record[name] = int(value)
+                    except ValueError:
+                        record[name] = value
+            yield record
+    elif format == 'jsonl':
+        import json
+        for number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"JSON inválido en la línea {number}: {e}") from None
+            if not isinstance(record, dict):
+                raise ValueError(f"La línea {number} no es un objeto JSON")
+            yield record
+    else:
+        raise ValueError(f"Formato desconocido: '{format}' (opciones: {', '.join(FORMATS)})")
+
+
+def chunked(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Agrupa los registros en listas de hasta `size` elementos"""
+    if size < 1:
+        raise ValueError("El tamaño de bloque debe ser positivo")
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ==================== EVALUACIÓN ====================
+
+def default_emit_mode(prog: CompiledProgram) -> str:
+    """'print' si el programa tiene sentencias print, 'value' si no"""
+    ast = prog.ast
+    statements = ast.statements if isinstance(ast, ProgramNode) else [ast]
+    return 'print' if any(isinstance(stmt, PrintNode) for stmt in statements) else 'value'
+
+
+def evaluate_records(prog: CompiledProgram, chunks: Iterable[List[Dict[str, Any]]],
+                     write: Callable[[Any], None], emit: str = 'value',
+                     vectorize: bool = True,
+                     on_error: Optional[Callable[[int, Exception], None]] = None) -> int:
+    """
+    Ejecuta un programa sobre cada registro y escribe los resultados en orden.
+
+    Cada bloque se evalúa de una sola vez por columnas (ver vectorized.py)
+    si NumPy está disponible y todos los registros del bloque tienen las
+    mismas columnas enteras; si no, o si la evaluación por columnas falla
+    (por ejemplo, por un resultado que no cabe en 64 bits), el bloque se
+    ejecuta registro a registro con enteros exactos. Así la memoria depende
+    del tamaño del bloque y no del archivo.
+
+    Args:
+        prog: Programa compilado una sola vez (ver interpreter.compile_program)
+        chunks: Bloques de registros (ver chunked)
+        write: Recibe cada valor de salida, en orden de registro
+        emit: 'value' (valor final de cada registro) o 'print' (sus valores impresos)
+        vectorize: Permitir la evaluación por columnas
+        on_error: Recibe (número de registro, excepción) de los registros que
+            fallan; si no se indica, el error se propaga
+
+    Returns:
+        Cantidad de registros con error
+    """
+    if emit not in EMIT_MODES:
+        raise ValueError(f"Modo de salida desconocido: '{emit}' (opciones: {', '.join(EMIT_MODES)})")
+    np = _numpy() if vectorize else None
+    failed = 0
+    first = 1  # Número (desde 1) del primer registro del bloque
+
+    for chunk in chunks:
+        columns = _columns(np, chunk) if np is not None else None
+        done = False
+        if columns is not None:
+            try:
+                result = prog(columns)
+            except RuntimeError:
+                pass  # Se repite registro a registro para ubicar los errores
+            else:
+                _write_columns(np, result, len(chunk), emit, write)
+                done = True
+
+        if not done:
+            for offset, record in enumerate(chunk):
+                try:
+                    result = prog(record)
+                except (RuntimeError, TypeError) as e:
+                    # TypeError: operación con un valor no numérico del registro
+                    if on_error is None:
+                        raise
+                    failed += 1
+                    on_error(first + offset, e)
+                    continue
+                if emit == 'value':
+                    write(result.value)
+                else:
+                    for value in result.output:
+                        write(value)
+        first += len(chunk)
+
+    return failed
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _columns(np, chunk: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Convierte un bloque en columnas enteras, o None si no es homogéneo"""
+    names = chunk[0].keys()
+    if not names:
+        return None
+    for record in chunk:
+        if record.keys() != names:
+            return None
+        for value in record.values():
+            if type(value) is not int:
+                return None
+    try:
+        return {name: np.array([record[name] for record in chunk], dtype=np.int64)
+                for name in names}
+    except OverflowError:
+        return None
+
+
+def _write_columns(np, result, rows: int, emit: str, write: Callable[[Any], None]) -> None:
+    """Escribe el resultado por columnas en el mismo orden que registro a registro"""
+    if emit == 'value':
+        if result.value is None:
+            for _ in range(rows):
+                write(None)
+            return
+        for value in np.broadcast_to(result.value, (rows,)).tolist():
+            write(value)
+    else:
+        printed = [np.broadcast_to(column, (rows,)).tolist() for column in result.output]
+        for row in range(rows):
+            for column in printed:
+                write(column[row])
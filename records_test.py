@@ -0,0 +1,171 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from contextlib import redirect_stdout
+from io import StringIO
+from errors import RuntimeError
+from interpreter import compile_program
+from main import main, run_over
+from records import read_records, chunked, evaluate_records, detect_format, default_emit_mode
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+CSV = "precio,cantidad,nombre\n10,2,a\n30,5,b\n7,,c\n"
+
+RULES = "total = precio * cantidad; print(total > 100 and total / cantidad); total;"
+
+
+class ReadRecordsTest(unittest.TestCase):
+    """Tests de lectura de registros CSV y JSONL"""
+
+    def test_csv(self):
+        """Los enteros se convierten y las celdas vacías se omiten"""
+        records = list(read_records(StringIO(CSV), 'csv'))
+        self.assertEqual(records, [
+            {'precio': 10, 'cantidad': 2, 'nombre': 'a'},
+            {'precio': 30, 'cantidad': 5, 'nombre': 'b'},
+            {'precio': 7, 'nombre': 'c'},
+        ])
+
+    def test_jsonl(self):
+        """Cada línea es un objeto; las líneas vacías se ignoran"""
+        records = list(read_records(StringIO('{"x": 1}\n\n{"x": 2, "y": -3}\n'), 'jsonl'))
+        self.assertEqual(records, [{'x': 1}, {'x': 2, 'y': -3}])
+
+    def test_invalid_jsonl(self):
+        """Error: línea que no es un objeto JSON"""
+        with self.assertRaises(ValueError):
+            list(read_records(StringIO('{"x": 1}\n[1, 2]\n'), 'jsonl'))
+        with self.assertRaises(ValueError):
+            list(read_records(StringIO('{"x": \n'), 'jsonl'))
+
+    def test_detect_format(self):
+        """El formato se deduce de la extensión"""
+        self.assertEqual(detect_format('datos.CSV'), 'csv')
+        self.assertEqual(detect_format('datos.jsonl'), 'jsonl')
+        with self.assertRaises(ValueError):
+            detect_format('datos.txt')
+
+    def test_chunked(self):
+        """Los bloques respetan el tamaño pedido"""
+        self.assertEqual([len(c) for c in chunked(range(7), 3)], [3, 3, 1])
+        with self.assertRaises(ValueError):
+            list(chunked(range(3), 0))
+
+
+class EvaluateRecordsTest(unittest.TestCase):
+    """Tests de la evaluación de un programa por registro"""
+
+    RECORDS = [{'precio': p, 'cantidad': c} for p, c in
+               [(10, 2), (30, 5), (40, 3), (1, 1), (25, 4), (60, 2), (3, 9)]]
+
+    def evaluate(self, code, records, emit='value', vectorize=True, chunk_size=3):
+        output, errors = [], []
+        evaluate_records(compile_program(code), chunked(records, chunk_size), output.append,
+                         emit, vectorize, lambda number, e: errors.append(number))
+        return output, errors
+
+    def test_values_in_order(self):
+        """Se escribe el valor final de cada registro, en orden"""
+        output, _ = self.evaluate("precio * cantidad;", self.RECORDS, vectorize=False)
+        self.assertEqual(output, [20, 150, 120, 1, 100, 120, 27])
+
+    def test_printed_values(self):
+        """Con emit='print' se escriben los valores impresos de cada registro"""
+        output, _ = self.evaluate("print(precio); print(cantidad);", self.RECORDS[:2],
+                                  emit='print', vectorize=False)
+        self.assertEqual(output, [10, 2, 30, 5])
+
+    @unittest.skipUnless(numpy is not None, "NumPy no está instalado")
+    def test_vectorized_matches_rows(self):
+        """Por columnas se obtiene exactamente la misma salida"""
+        for emit in ('value', 'print'):
+            rows, _ = self.evaluate(RULES, self.RECORDS, emit, vectorize=False)
+            columns, _ = self.evaluate(RULES, self.RECORDS, emit, vectorize=True)
+            self.assertEqual([str(v) for v in columns], [str(v) for v in rows], emit)
+
+    @unittest.skipUnless(numpy is not None, "NumPy no está instalado")
+    def test_overflow_falls_back_to_rows(self):
+        """Un desborde de 64 bits repite el bloque registro a registro"""
+        records = [{'x': 10_000_000_000}, {'x': 3}]
+        output, errors = self.evaluate("x * x;", records, vectorize=True)
+        self.assertEqual(output, [100_000_000_000_000_000_000, 9])
+        self.assertEqual(errors, [])
+
+    def test_errors_reported_by_record(self):
+        """Los registros que fallan se reportan con su número y no frenan al resto"""
+        records = [{'x': 1}, {'x': 0}, {'x': 2}, {'x': 0}, {'y': 1}]
+        for vectorize in (False, True):
+            output, errors = self.evaluate("10 / x;", records, vectorize=vectorize)
+            self.assertEqual(output, [10, 5], vectorize)
+            self.assertEqual(errors, [2, 4, 5], vectorize)
+
+    def test_errors_propagate_without_handler(self):
+        """Sin on_error el primer error se propaga"""
+        with self.assertRaises(RuntimeError):
+            evaluate_records(compile_program("1 / x;"), [[{'x': 0}]], print)
+
+    def test_default_emit_mode(self):
+        """print si el programa imprime, value si no"""
+        self.assertEqual(default_emit_mode(compile_program("x;")), 'value')
+        self.assertEqual(default_emit_mode(compile_program(RULES)), 'print')
+
+
+class RunOverTest(unittest.TestCase):
+    """Tests de main.py --over"""
+
+    def test_csv_to_output_file(self):
+        """Lee un CSV por bloques y escribe un valor por línea"""
+        with tempfile.TemporaryDirectory() as tmp:
+            data = os.path.join(tmp, 'datos.csv')
+            result = os.path.join(tmp, 'salida.txt')
+            with open(data, 'w', encoding='utf-8') as f:
+                f.write("a,b\n" + "".join(f"{i},{i % 4}\n" for i in range(50)))
+            self.assertTrue(run_over(data, "a - b;", chunk_size=7, output=result))
+            with open(result, encoding='utf-8') as f:
+                self.assertEqual(f.read().split(), [str(i - i % 4) for i in range(50)])
+
+    def test_csv_overflow(self):
+        """Los enteros grandes del CSV dan el resultado exacto"""
+        with tempfile.TemporaryDirectory() as tmp:
+            data = os.path.join(tmp, 'datos.csv')
+            result = os.path.join(tmp, 'salida.txt')
+            with open(data, 'w', encoding='utf-8') as f:
+                f.write("x\n10000000000\n")
+            self.assertTrue(run_over(data, "x * x;", output=result))
+            with open(result, encoding='utf-8') as f:
+                self.assertEqual(f.read(), "100000000000000000000\n")
+
+    def test_zero_chunk_size(self):
+        """chunk_size=0 es un error, no el tamaño por defecto"""
+        with tempfile.TemporaryDirectory() as tmp:
+            data = os.path.join(tmp, 'datos.csv')
+            with open(data, 'w', encoding='utf-8') as f:
+                f.write("x\n1\n")
+            with redirect_stdout(StringIO()) as out:
+                self.assertFalse(run_over(data, "x;", chunk_size=0))
+            self.assertIn("tamaño de bloque", out.getvalue())
+
+    def test_missing_program_file(self):
+        """Un archivo de programa inexistente es un error, no una excepción"""
+        with tempfile.TemporaryDirectory() as tmp:
+            data = os.path.join(tmp, 'datos.csv')
+            missing = os.path.join(tmp, 'no_existe.txt')
+            with open(data, 'w', encoding='utf-8') as f:
+                f.write("x\n1\n")
+            argv = ['main.py', '--over', data, missing]
+            with mock.patch.object(sys, 'argv', argv), redirect_stdout(StringIO()) as out:
+                with self.assertRaises(SystemExit) as raised:
+                    main()
+        self.assertEqual(raised.exception.code, 1)
+        self.assertIn(f"No se encontró el archivo '{missing}'", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
@@ -0,0 +1,107 @@
+from __future__ import annotations
+from parser import (
+    ProgramNode, IdNode, BinOpNode,
+    UnaryOpNode, AssignNode, PrintNode
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Iterable, List
+
+
+# ==================== CENTINELA ====================
+
+class _Undefined:
+    """Marca de slot sin valor (variable todavía no definida)"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'UNDEFINED'
+
+
+UNDEFINED = _Undefined()
+
+
+# ==================== TABLA DE SLOTS ====================
+
+class SlotTable:
+    """
+    Asigna a cada variable de un programa un índice fijo en una lista.
+
+    Los motores compilados leen y escriben `slots[i]` en lugar de buscar el
+    nombre en un diccionario; el diccionario `env` solo se usa para cargar
+    los valores iniciales y para volcar el resultado al terminar.
+    """
+
+    def __init__(self, names: Iterable[str] = (), assigned: Iterable[int] = ()):
+        """
+        Args:
+            names: Variables ya conocidas, en orden de slot (por ejemplo, las
+                de un Code deserializado)
+            assigned: Slots de `names` que el programa asigna
+        """
+        self.names: List[str] = []         # índice -> nombre
+        self.index: Dict[str, int] = {}    # nombre -> índice
+        self.assigned: List[int] = list(assigned)  # slots que el programa asigna
+        self.depth = 0                     # profundidad máxima del árbol
+        for name in names:
+            self.slot(name)
+
+    def slot(self, name: str) -> int:
+        """Retorna el slot de una variable, creándolo si hace falta"""
+        index = self.index.get(name)
+        if index is None:
+            index = self.index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def load(self, env: Dict[str, Any]) -> List[Any]:
+        """Crea la lista de slots con los valores iniciales de `env`"""
+        get = env.get
+        return [get(name, UNDEFINED) for name in self.names]
+
+    def store(self, slots: List[Any], env: Dict[str, Any]) -> None:
+        """Vuelca a `env` los slots asignados que tienen valor"""
+        names = self.names
+        for index in self.assigned:
+            value = slots[index]
+            if value is not UNDEFINED:
+                env[names[index]] = value
+
+
+def resolve(node) -> SlotTable:
+    """
+    Recorre el AST y asigna un slot a cada variable, en orden de aparición.
+
+    El recorrido es iterativo y registra además la profundidad máxima del
+    árbol, que los motores recursivos usan para decidir si pueden compilarlo.
+    """
+    table = SlotTable()
+    assigned = set()
+    pending = [(node, 1)]
+    max_depth = 0
+    while pending:
+        node, depth = pending.pop()
+        if depth > max_depth:
+            max_depth = depth
+        depth += 1
+        if isinstance(node, IdNode):
+            table.slot(node.name)
+        elif isinstance(node, BinOpNode):
+            pending.append((node.right, depth))
+            pending.append((node.left, depth))
+        elif isinstance(node, UnaryOpNode):
+            pending.append((node.operand, depth))
+        elif isinstance(node, AssignNode):
+            index = table.slot(node.name)
+            if index not in assigned:
+                assigned.add(index)
+                table.assigned.append(index)
+            pending.append((node.value, depth))
+        elif isinstance(node, PrintNode):
+            pending.append((node.expr, depth))
+        elif isinstance(node, ProgramNode):
+            pending.extend((stmt, depth) for stmt in reversed(node.statements))
+    table.depth = max_depth
+    return table
@@ -0,0 +1,81 @@
+import sys
+import unittest
+from errors import RuntimeError
+from interpreter import Interpreter, interpret
+from bytecode import Code, compile_bytecode
+from parser import parse
+from resolver import resolve, SlotTable, UNDEFINED
+
+
+class ResolverTest(unittest.TestCase):
+    """Tests unitarios para la resolución de variables a slots"""
+
+    def test_slots_in_order(self):
+        """Cada nombre distinto recibe un slot fijo en orden de aparición"""
+        table = resolve(parse("x = a + b; y = x * a; print(y);"))
+        self.assertEqual(table.names, ['x', 'a', 'b', 'y'])
+        self.assertEqual(table.index['y'], 3)
+        self.assertEqual([table.names[i] for i in table.assigned], ['x', 'y'])
+
+    def test_load_marks_undefined(self):
+        """Las variables ausentes de env quedan marcadas con el centinela"""
+        table = resolve(parse("x = a + b;"))
+        self.assertEqual(table.load({'a': 1}), [UNDEFINED, 1, UNDEFINED])
+
+    def test_store_only_assigned(self):
+        """Solo se vuelcan a env los slots asignados con valor"""
+        table = resolve(parse("x = a; y = 2;"))
+        env = {'a': 1}
+        table.store([5, 100, UNDEFINED], env)
+        self.assertEqual(env, {'a': 1, 'x': 5})
+
+    def test_table_from_names(self):
+        """Una tabla armada desde nombres conserva sus slots"""
+        table = SlotTable(['a', 'b'], [1])
+        self.assertEqual(table.index, {'a': 0, 'b': 1})
+        self.assertEqual(table.slot('c'), 2)
+        env = {}
+        table.store([1, 2, 3], env)
+        self.assertEqual(env, {'b': 2})
+
+    def test_bytecode_uses_same_table(self):
+        """El bytecode (también deserializado) carga y vuelca como el resolver"""
+        node = parse("x = a; print(b); y = 2;")
+        for code in (compile_bytecode(node), Code.from_bytes(compile_bytecode(node).to_bytes())):
+            table = code.slots
+            self.assertEqual(sorted(table.names), ['a', 'b', 'x', 'y'])
+            self.assertEqual(sorted(table.names[i] for i in table.assigned), ['x', 'y'])
+            self.assertEqual(table.load({'b': 1})[table.index['b']], 1)
+
+    # ---------- Vista de env ----------
+
+    def test_env_view_all_engines(self):
+        """interpreter.env refleja el resultado con cualquier motor"""
+        for engine in ('closures', 'bytecode'):
+            interp = interpret("y = x + 1; z = y * 2;", env={'x': 1, 'w': 0}, engine=engine)
+            self.assertEqual(interp.env, {'x': 1, 'w': 0, 'y': 2, 'z': 4}, engine)
+
+    def test_env_persists_between_runs(self):
+        """El entorno se conserva entre ejecuciones (como en el REPL)"""
+        interp = Interpreter()
+        interp.run(parse("x = 10;"))
+        self.assertEqual(interp.run(parse("x + 5;")), 15)
+
+    def test_env_updated_before_error(self):
+        """Las asignaciones previas a un error quedan en env"""
+        for engine in ('closures', 'bytecode'):
+            interp = Interpreter(engine)
+            with self.assertRaises(RuntimeError):
+                interp.run(parse("a = 1; b = c;"))
+            self.assertEqual(interp.env, {'a': 1}, engine)
+
+    def test_many_variables(self):
+        """Programas con miles de variables"""
+        code = "v0 = 1; " + " ".join(f"v{i} = v{i - 1} + 1;" for i in range(1, 3000))
+        interp = interpret(code)
+        self.assertEqual(interp.env['v2999'], 3000)
+        self.assertEqual(len(interp.env), 3000)
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
@@ -0,0 +1,174 @@
+from __future__ import annotations
+import os
+import sys
+from abc import ABC, abstractmethod
+from collections import deque
+from options import SINKS
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Generator, List, Optional
+
+
+# Valores acumulados antes de formatear y escribir un bloque (ver FdSink)
+BATCH_SIZE = 4096
+
+
+
+# ==================== DESTINOS DE SALIDA ====================
+
+class Sink(ABC):
+    """
+    Destino de los valores que imprime un programa (ver Interpreter).
+
+    write() recibe cada valor; flush() entrega lo que haya pendiente y
+    close() libera el destino. Se puede usar como gestor de contexto:
+    al salir del bloque se cierra. Las subclases deben definir write().
+    """
+
+    @abstractmethod
+    def write(self, value: Any) -> None:
+        """Recibe un valor impreso"""
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FdSink(Sink):
+    """
+    Escribe en un descriptor de archivo por bloques.
+
+    Los valores se acumulan y cada `batch_size` valores se formatean de una
+    vez (una línea por valor, igual que print) y se escriben con una sola
+    llamada a os.write, en lugar de una escritura por print.
+    """
+
+    def __init__(self, fd: int = 1, batch_size: int = BATCH_SIZE, closefd: bool = False):
+        if batch_size < 1:
+            raise ValueError("El tamaño de bloque debe ser positivo")
+        self.fd = fd
+        self.batch_size = batch_size
+        self.closefd = closefd
+        self._pending: List[Any] = []
+
+    @classmethod
+    def open(cls, path: str, batch_size: int = BATCH_SIZE) -> 'FdSink':
+        """Crea (o trunca) un archivo y escribe en él"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        return cls(fd, batch_size, closefd=True)
+
+    def write(self, value: Any) -> None:
+        pending = self._pending
+        pending.append(value)
+        if len(pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        data = ('\n'.join(map(str, self._pending)) + '\n').encode('utf-8')
+        self._pending = []
+        if self.fd == 1:
+            # Lo que ya se escribió con print debe aparecer antes
+            sys.stdout.flush()
+        view = memoryview(data)
+        while view:
+            written = os.write(self.fd, view)
+            view = view[written:]
+
+    def close(self) -> None:
+        self.flush()
+        if self.closefd:
+            os.close(self.fd)
+            self.closefd = False
+
+
+class CaptureSink(Sink):
+    """
+    Guarda los valores en memoria (en `values`).
+
+    Con `max_values` solo se conservan los últimos valores (un buffer
+    circular), así que la memoria queda acotada en ejecuciones largas;
+    `dropped` cuenta los valores descartados.
+    """
+
+    def __init__(self, max_values: Optional[int] = None):
+        if max_values is not None and max_values < 1:
+            raise ValueError("La capacidad debe ser positiva")
+        self.values = [] if max_values is None else deque(maxlen=max_values)
+        self.max_values = max_values
+        self.total = 0
+
+    def write(self, value: Any) -> None:
+        self.total += 1
+        self.values.append(value)
+
+    @property
+    def dropped(self) -> int:
+        return self.total - len(self.values)
+
+
+class NullSink(Sink):
+    """Descarta los valores"""
+
+    def write(self, value: Any) -> None:
+        pass
+
+
+class CallbackSink(Sink):
+    """Entrega cada valor a una función"""
+
+    def __init__(self, callback: Callable[[Any], None]):
+        self.callback = callback
+        self.write = callback  # Sin indirección en cada valor
+
+    def write(self, value: Any) -> None:
+        self.callback(value)
+
+
+class GeneratorSink(Sink):
+    """
+    Envía cada valor a un generador con send().
+
+    El generador se inicia al crear el destino y se cierra con close():
+
+        def contar():
+            total = 0
+            while True:
+                value = yield
+                total += 1
+    """
+
+    def __init__(self, generator: Generator[Any, Any, Any]):
+        self.generator = generator
+        next(generator)
+        self.write = generator.send  # Sin indirección en cada valor
+
+    def write(self, value: Any) -> None:
+        self.generator.send(value)
+
+    def close(self) -> None:
+        self.generator.close()
+
+
+def make_sink(name: str) -> Optional[Sink]:
+    """
+    Crea el destino de main.py --sink: 'print' (None: print y captura en
+    Interpreter.output), 'buffered' (FdSink sobre stdout) o 'null'.
+    """
+    if name == 'print':
+        return None
+    if name == 'buffered':
+        return FdSink()
+    if name == 'null':
+        return NullSink()
+    raise ValueError(f"Destino de salida desconocido: '{name}' (opciones: {', '.join(SINKS)})")
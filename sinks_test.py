@@ -0,0 +1,115 @@
+import os
+import sys
+import tempfile
+import unittest
+from interpreter import Interpreter, interpret, interpret_stream, ENGINES
+from parser import parse
+from sinks import Sink, FdSink, CaptureSink, NullSink, CallbackSink, GeneratorSink, make_sink
+
+
+PROGRAM = "x = 2; print(x); print(x > 1); print(-x); x * 3;"
+
+
+class FdSinkTest(unittest.TestCase):
+    """Tests de la escritura por bloques en un descriptor"""
+
+    def read(self, sink_factory, code):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'salida.txt')
+            with sink_factory(path) as sink:
+                interpret(code, sink=sink)
+            with open(path, encoding='utf-8') as f:
+                return f.read()
+
+    def test_same_text_as_print(self):
+        """Una línea por valor, con el mismo formato que print"""
+        text = self.read(FdSink.open, PROGRAM)
+        self.assertEqual(text, "2\nTrue\n-2\n")
+
+    def test_batches(self):
+        """Los valores se escriben al completar cada bloque y al cerrar"""
+        code = "".join(f"print({i});" for i in range(10))
+        text = self.read(lambda path: FdSink.open(path, batch_size=3), code)
+        self.assertEqual(text.split(), [str(i) for i in range(10)])
+
+    def test_pending_until_flush(self):
+        """Nada se escribe antes de completar un bloque"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'salida.txt')
+            sink = FdSink.open(path, batch_size=10)
+            sink.write(1)
+            self.assertEqual(os.path.getsize(path), 0)
+            sink.close()
+            self.assertEqual(os.path.getsize(path), 2)
+
+
+class SinksTest(unittest.TestCase):
+    """Tests de los destinos en memoria y por función"""
+
+    def test_capture(self):
+        """CaptureSink es la salida del intérprete"""
+        sink = CaptureSink()
+        interp = interpret(PROGRAM, sink=sink)
+        self.assertEqual(interp.output, [2, True, -2])
+        self.assertIs(interp.output, sink.values)
+
+    def test_ring_buffer(self):
+        """Con capacidad solo se conservan los últimos valores"""
+        sink = CaptureSink(max_values=3)
+        interpret("".join(f"print({i});" for i in range(10)), sink=sink)
+        self.assertEqual(list(sink.values), [7, 8, 9])
+        self.assertEqual((sink.total, sink.dropped), (10, 7))
+
+    def test_null(self):
+        """NullSink descarta y no acumula"""
+        interp = interpret(PROGRAM, sink=NullSink())
+        self.assertEqual(interp.output, [])
+        self.assertEqual(interp.env['x'], 2)
+
+    def test_callback_and_generator(self):
+        """Cada valor llega a la función o al generador"""
+        values = []
+        interpret(PROGRAM, sink=CallbackSink(values.append))
+        self.assertEqual(values, [2, True, -2])
+
+        received = []
+
+        def consumer():
+            while True:
+                received.append((yield))
+
+        with GeneratorSink(consumer()) as sink:
+            interpret_stream(["print(1); pri", "nt(2);"], sink=sink)
+        self.assertEqual(received, [1, 2])
+
+    def test_all_engines(self):
+        """Todos los motores escriben en el destino"""
+        for engine in ENGINES:
+            if engine == 'vector':
+                continue
+            sink = CaptureSink()
+            Interpreter(engine, sink).run(parse(PROGRAM))
+            self.assertEqual(sink.values, [2, True, -2], engine)
+
+    def test_write_required(self):
+        """Una subclase sin write() falla al crearse, no en el primer print"""
+        class Incomplete(Sink):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+        # Las instancias reemplazan write por la función, sin indirección
+        callback = CallbackSink(print)
+        self.assertIs(callback.write, print)
+
+    def test_make_sink(self):
+        """Nombres de main.py --sink"""
+        self.assertIsNone(make_sink('print'))
+        self.assertIsInstance(make_sink('null'), NullSink)
+        self.assertIsInstance(make_sink('buffered'), FdSink)
+        with self.assertRaises(ValueError):
+            make_sink('otro')
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
@@ -0,0 +1,174 @@
+from __future__ import annotations
+import ast
+from compiler import MAX_CLOSURE_DEPTH
+from errors import RuntimeError
+from parser import (
+    ProgramNode, NumberNode, IdNode, BinOpNode,
+    UnaryOpNode, AssignNode, PrintNode
+)
+from resolver import resolve
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Union
+    from bytecode import Code
+
+
+# ==================== TABLAS DE OPERADORES ====================
+
+BINARY_OPS = {
+    '+': ast.Add, '-': ast.Sub, '*': ast.Mult, '/': ast.FloorDiv,
+}
+
+COMPARE_OPS = {
+    '==': ast.Eq, '!=': ast.NotEq, '<': ast.Lt,
+    '>': ast.Gt, '<=': ast.LtE, '>=': ast.GtE,
+}
+
+BOOL_OPS = {'and': ast.And, 'or': ast.Or}
+
+UNARY_OPS = {'-': ast.USub, 'not': ast.Not}
+
+# Las variables del programa se renombran para no chocar con palabras
+# reservadas de Python ni con los nombres auxiliares de la función generada
+VAR_PREFIX = 'v_'
+
+
+# ==================== PROGRAMA TRANSPILADO ====================
+
+class TranspiledProgram:
+    """Programa traducido a una función nativa de Python"""
+
+    def __init__(self, code, assigned: List[str]):
+        self.code = code  # Objeto code del módulo generado
+        namespace: Dict[str, Any] = {}
+        exec(code, namespace)
+        self._function = namespace['__program']
+        self._assigned = [(VAR_PREFIX + name, name) for name in assigned]
+
+    def execute(self, env: Dict[str, Any], emit: Callable[[Any], None]) -> Any:
+        """Ejecuta el programa sobre `env` y retorna el último valor"""
+        assigned = self._assigned
+
+        def store(local_vars):
+            # Vuelca las variables asignadas al entorno, incluso si hubo error
+            for local, name in assigned:
+                if local in local_vars:
+                    env[name] = local_vars[local]
+
+        try:
+            return self._function(env, emit, store)
+        except ZeroDivisionError:
+            raise RuntimeError("División por cero") from None
+        except NameError as e:
+            import re  # Solo hace falta al informar el error
+            match = re.search(r"'" + VAR_PREFIX + r"(\w+)'", str(e))
+            if match is None:
+                raise
+            raise RuntimeError(f"Variable no definida: '{match.group(1)}'") from None
+
+
+# ==================== TRADUCTOR ====================
+
+class Transpiler:
+    """Traduce el AST del lenguaje a un AST de Python"""
+
+    def __init__(self):
+        self.names: Dict[str, None] = {}     # Todas las variables, en orden
+        self.assigned: Dict[str, None] = {}  # Variables asignadas, en orden
+
+    def transpile(self, node) -> ast.Module:
+        statements = node.statements if isinstance(node, ProgramNode) else [node]
+        body = [self._assign('__r', ast.Constant(None))]
+        for stmt in statements:
+            body.extend(self.statement(stmt))
+        body.append(ast.Return(self._load('__r')))
+
+        # Carga inicial: if 'x' in __env: v_x = __env['x']
+        prelude = [
+            ast.If(
+                test=ast.Compare(ast.Constant(name), [ast.In()], [self._load('__env')]),
+                body=[self._assign(VAR_PREFIX + name, ast.Subscript(
+                    self._load('__env'), ast.Constant(name), ast.Load()))],
+                orelse=[],
+            )
+            for name in self.names
+        ]
+
+        # try: <cuerpo> finally: __store(locals())
+        guarded = ast.Try(
+            body=body, handlers=[], orelse=[],
+            finalbody=[ast.Expr(ast.Call(
+                self._load('__store'), [ast.Call(self._load('locals'), [], [])], []))],
+        )
+        function = ast.FunctionDef(
+            name='__program',
+            args=ast.arguments(
+                posonlyargs=[], kwonlyargs=[], kw_defaults=[], defaults=[],
+                args=[ast.arg('__env'), ast.arg('__emit'), ast.arg('__store')],
+            ),
+            body=prelude + [guarded],
+            decorator_list=[],
+        )
+        return ast.fix_missing_locations(ast.Module(body=[function], type_ignores=[]))
+
+    def statement(self, node) -> List[ast.stmt]:
+        if isinstance(node, AssignNode):
+            local = VAR_PREFIX + node.name
+            self.names[node.name] = None
+            self.assigned[node.name] = None
+            return [
+                self._assign(local, self.expr(node.value)),
+                self._assign('__r', self._load(local)),
+            ]
+        if isinstance(node, PrintNode):
+            return [
+                ast.Expr(ast.Call(self._load('__emit'), [self.expr(node.expr)], [])),
+                self._assign('__r', ast.Constant(None)),
+            ]
+        return [self._assign('__r', self.expr(node))]
+
+    def expr(self, node) -> ast.expr:
+        if isinstance(node, NumberNode):
+            return ast.Constant(node.value)
+        if isinstance(node, IdNode):
+            self.names[node.name] = None
+            return self._load(VAR_PREFIX + node.name)
+        if isinstance(node, BinOpNode):
+            left = self.expr(node.left)
+            right = self.expr(node.right)
+            if node.op in BOOL_OPS:
+                return ast.BoolOp(BOOL_OPS[node.op](), [left, right])
+            if node.op in COMPARE_OPS:
+                return ast.Compare(left, [COMPARE_OPS[node.op]()], [right])
+            return ast.BinOp(left, BINARY_OPS[node.op](), right)
+        if isinstance(node, UnaryOpNode):
+            return ast.UnaryOp(UNARY_OPS[node.op](), self.expr(node.operand))
+        raise RuntimeError(f"No se puede evaluar el nodo: {type(node).__name__}")
+
+    # ---------- Utilidades ----------
+
+    @staticmethod
+    def _load(name: str) -> ast.Name:
+        return ast.Name(name, ast.Load())
+
+    @staticmethod
+    def _assign(name: str, value: ast.expr) -> ast.Assign:
+        return ast.Assign([ast.Name(name, ast.Store())], value)
+
+
+def compile_python(node, filename: str = '<programa>') -> Union[TranspiledProgram, Code]:
+    """
+    Función de conveniencia: traduce un nodo AST y lo compila con compile().
+
+    La traducción y compile() son recursivos, así que un árbol más profundo
+    que MAX_CLOSURE_DEPTH se compila a bytecode, como en compiler.compile_ast;
+    ambos programas se ejecutan con execute(env, emit).
+    """
+    if resolve(node).depth > MAX_CLOSURE_DEPTH:
+        from bytecode import compile_bytecode  # Solo la cargan los árboles profundos
+        return compile_bytecode(node)
+    transpiler = Transpiler()
+    module = transpiler.transpile(node)
+    code = compile(module, filename, 'exec')
+    return TranspiledProgram(code, list(transpiler.assigned))
@@ -0,0 +1,90 @@
+import sys
+import unittest
+from errors import RuntimeError
+from interpreter import Interpreter, interpret
+from parser import parse
+from transpiler import compile_python
+
+
+class TranspilerTest(unittest.TestCase):
+    """Tests unitarios para la traducción a funciones de Python"""
+
+    def execute(self, code, env=None):
+        env = dict(env or {})
+        output = []
+        result = compile_python(parse(code)).execute(env, output.append)
+        return result, env, output
+
+    # ---------- Equivalencia con el recorrido del árbol ----------
+
+    def test_matches_tree_walker(self):
+        """El código generado produce lo mismo que los métodos eval_*"""
+        programs = [
+            "1 + 2 * 3;",
+            "(1 + 2) * 3 - 4 / 3;",
+            "-7 / 2;",
+            "--5;",
+            "not 0 or 1 and 0;",
+            "(1 < 2) < 3;",
+            "5 >= 5 and 3 != 4;",
+            "x = 10; y = x * 2; print(y); y > x;",
+            "print(1); print(2);",
+        ]
+        for code in programs:
+            walker = Interpreter()
+            expected = walker.visit(parse(code))
+            result, env, output = self.execute(code)
+            self.assertEqual(result, expected, code)
+            self.assertEqual(env, walker.env, code)
+            self.assertEqual(output, walker.output, code)
+
+    def test_python_keywords_as_names(self):
+        """Variables con nombres reservados de Python funcionan"""
+        result, env, _ = self.execute("class = 2; None = class * 3; None;")
+        self.assertEqual(result, 6)
+        self.assertEqual(env, {'class': 2, 'None': 6})
+
+    def test_reusable_with_different_env(self):
+        """El mismo código compilado se ejecuta con distintos entornos"""
+        program = compile_python(parse("y = x * 2; y;"))
+        self.assertEqual(program.execute({'x': 3}, print), 6)
+        self.assertEqual(program.execute({'x': 5}, print), 10)
+
+    # ---------- Errores ----------
+
+    def test_division_by_zero(self):
+        """Error: división por cero"""
+        with self.assertRaises(RuntimeError):
+            self.execute("10 / 0;")
+
+    def test_undefined_variable(self):
+        """Error: variable no definida con el nombre original"""
+        with self.assertRaises(RuntimeError) as ctx:
+            self.execute("x = y + 1;")
+        self.assertEqual(str(ctx.exception), "Variable no definida: 'y'")
+
+    def test_env_updated_before_error(self):
+        """Las asignaciones previas a un error quedan en el entorno"""
+        env = {}
+        with self.assertRaises(RuntimeError):
+            compile_python(parse("a = 1; b = a / 0;")).execute(env, print)
+        self.assertEqual(env, {'a': 1})
+
+    # ---------- Integración ----------
+
+    def test_interpret_engine(self):
+        """interpret() acepta el motor python"""
+        interp = interpret("y = x + 10; print(y);", env={'x': 5}, engine='python')
+        self.assertEqual(interp.env, {'x': 5, 'y': 15})
+        self.assertEqual(interp.output, [15])
+
+    def test_deep_program(self):
+        """Árboles más profundos que el límite de recursión de Python"""
+        interp = interpret("x = 1" + " + 1" * 3000 + "; print(x);", engine='python')
+        self.assertEqual(interp.output, [3001])
+        result, env, _ = self.execute("y = " + "-" * 3000 + "x;", {'x': 4})
+        self.assertEqual((result, env['y']), (4, 4))
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])
@@ -0,0 +1,273 @@
+from __future__ import annotations
+import sys
+from errors import RuntimeError
+from parser import (
+    ProgramNode, NumberNode, IdNode, BinOpNode,
+    UnaryOpNode, AssignNode, PrintNode,
+    OP_ADD, OP_SUB, OP_MUL, OP_DIV, OP_EQ, OP_NE,
+    OP_LT, OP_GT, OP_LE, OP_GE, OP_AND, OP_OR, OP_NEG
+)
+from resolver import resolve
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Optional
+
+
+# Filas con error que se muestran en el mensaje
+MAX_REPORTED_ROWS = 10
+
+# Menor entero de 64 bits (su negación no cabe en 64 bits)
+INT64_MIN = -(1 << 63)
+
+
+# ==================== ERRORES ====================
+
+class RowsError(RuntimeError):
+    """Error en algunas filas de la evaluación vectorial; `rows` contiene sus índices"""
+
+    message = "Error en las filas"
+
+    def __init__(self, rows):
+        self.rows = rows
+        shown = ', '.join(str(row) for row in rows[:MAX_REPORTED_ROWS])
+        if len(rows) > MAX_REPORTED_ROWS:
+            shown += f", ... ({len(rows) - MAX_REPORTED_ROWS} más)"
+        super().__init__(f"{self.message}: {shown}")
+
+
+class DivisionByZeroError(RowsError):
+    """División por cero en algunas filas"""
+
+    message = "División por cero en las filas"
+
+
+class IntegerOverflowError(RowsError):
+    """
+    Resultado fuera de los enteros de 64 bits en algunas filas. La ejecución
+    fila a fila usa enteros de Python y no desborda.
+    """
+
+    message = "Desborde de enteros de 64 bits en las filas"
+
+
+# ==================== DETECCIÓN ====================
+
+def has_arrays(env: Optional[Dict[str, Any]]) -> bool:
+    """
+    Indica si el entorno contiene arreglos de NumPy.
+
+    No importa NumPy: si el módulo no está cargado, el entorno no puede
+    contener arreglos.
+    """
+    np = sys.modules.get('numpy')
+    if np is None or not env:
+        return False
+    ndarray = np.ndarray
+    return any(isinstance(value, ndarray) for value in env.values())
+
+
+# ==================== EVALUACIÓN VECTORIAL ====================
+
+class VectorEvaluator:
+    """
+    Evalúa un programa una sola vez sobre columnas de NumPy.
+
+    Cada variable del entorno es un arreglo de una dimensión (una fila por
+    registro) o un escalar, que vale para todas las filas. Cada nodo del
+    árbol se traduce a una operación sobre arreglos completos.
+
+    El cortocircuito de and/or se emula con máscaras: el operando derecho
+    solo se evalúa en las filas en que hace falta, de modo que una división
+    por cero o una variable no definida en una fila descartada no es un
+    error, igual que en la ejecución fila a fila.
+
+    Los enteros son de 64 bits: si un resultado no cabe en alguna fila que
+    se usa, se lanza IntegerOverflowError en lugar de dar un valor distinto
+    del de la ejecución fila a fila (que usa enteros de Python). Cuando
+    and/or mezclan booleanos y enteros el resultado es una columna de objetos
+    de Python, para conservar True/False en cada fila.
+    """
+
+    def __init__(self, env: Dict[str, Any]):
+        try:
+            import numpy
+        except ImportError:
+            raise RuntimeError("La evaluación vectorial requiere NumPy") from None
+        self.np = numpy
+        self.env = env
+        self.rows = _row_count(numpy, env)
+        self.arithmetic = {OP_ADD: numpy.add, OP_SUB: numpy.subtract, OP_MUL: numpy.multiply}
+        self.comparisons = {
+            OP_EQ: numpy.equal, OP_NE: numpy.not_equal,
+            OP_LT: numpy.less, OP_GT: numpy.greater,
+            OP_LE: numpy.less_equal, OP_GE: numpy.greater_equal,
+        }
+
+    def run(self, node, emit: Callable[[Any], None]) -> Any:
+        """Ejecuta un programa o sentencia; print emite la columna completa"""
+        table = resolve(node)
+        if table.depth > sys.getrecursionlimit() // 4:
+            raise RuntimeError("Expresión demasiado profunda para la evaluación vectorial")
+        statements = node.statements if isinstance(node, ProgramNode) else [node]
+        result = None
+        for stmt in statements:
+            if isinstance(stmt, AssignNode):
+                result = self.env[stmt.name] = self.eval(stmt.value, None)
+            elif isinstance(stmt, PrintNode):
+                emit(self.eval(stmt.expr, None))
+                result = None
+            else:
+                result = self.eval(stmt, None)
+        return result
+
+    def eval(self, node, mask) -> Any:
+        """
+        Evalúa una expresión. `mask` es un arreglo booleano con las filas
+        cuyo resultado se usa (None: todas); el valor en las demás filas es
+        indefinido.
+        """
+        kind = type(node)
+        if kind is NumberNode:
+            return node.value
+        if kind is IdNode:
+            if node.name not in self.env:
+                raise RuntimeError(f"Variable no definida: '{node.name}'")
+            return self.env[node.name]
+        if kind is UnaryOpNode:
+            operand = self.eval(node.operand, mask)
+            if node.opcode == OP_NEG:
+                operand = self._as_int(operand)
+                result = self.np.negative(operand)
+                if self._is_int64(result):
+                    self._check_rows(IntegerOverflowError, self.np.equal(operand, INT64_MIN), mask)
+                return result
+            return self.np.logical_not(operand)
+        if kind is BinOpNode:
+            opcode = node.opcode
+            if opcode == OP_AND or opcode == OP_OR:
+                return self._short_circuit(node, mask)
+            left = self.eval(node.left, mask)
+            right = self.eval(node.right, mask)
+            return self._binary(opcode, left, right, mask)
+        raise RuntimeError(f"No se puede evaluar el nodo: {kind.__name__}")
+
+    # ---------- Operadores ----------
+
+    def _binary(self, opcode: int, left: Any, right: Any, mask) -> Any:
+        np = self.np
+        if opcode in self.comparisons:
+            return self.comparisons[opcode](left, right)
+        left, right = self._as_int(left), self._as_int(right)
+        try:
+            with np.errstate(over='ignore'):
+                if opcode == OP_DIV:
+                    self._check_rows(DivisionByZeroError, np.equal(right, 0), mask)
+                    # Las filas descartadas con divisor 0 se dividen por 1
+                    result = np.floor_divide(left, np.where(np.equal(right, 0), 1, right))
+                else:
+                    result = self.arithmetic[opcode](left, right)
+        except OverflowError:
+            # Un escalar de Python que no cabe en 64 bits vale para todas las filas
+            raise IntegerOverflowError(list(range(self.rows))) from None
+        if self._is_int64(result):
+            self._check_rows(IntegerOverflowError,
+                             _overflows(np, opcode, left, right, result), mask)
+        return result
+
+    def _check_rows(self, error: type, failed: Any, mask) -> None:
+        """Lanza `error` con las filas usadas (según `mask`) en que `failed` es verdadero"""
+        np = self.np
+        if mask is not None:
+            failed = failed & mask
+        if np.any(failed):
+            rows = np.flatnonzero(np.broadcast_to(failed, (self.rows,)))
+            raise error(rows.tolist())
+
+    def _is_int64(self, value: Any) -> bool:
+        """Resultado de enteros de NumPy (no una columna de objetos de Python)"""
+        return self.np.asarray(value).dtype.kind == 'i'
+
+    def _short_circuit(self, node: BinOpNode, mask) -> Any:
+        """and/or: el lado derecho solo se evalúa en las filas que lo necesitan"""
+        np = self.np
+        left = self.eval(node.left, mask)
+        truthy = np.not_equal(left, 0)
+        need = truthy if node.opcode == OP_AND else np.logical_not(truthy)
+        if mask is not None:
+            need = need & mask
+        if not np.any(need):
+            return left
+        right = self.eval(node.right, need)
+        if self._is_bool(left) != self._is_bool(right):
+            # Un booleano y un entero no caben en una columna de un solo tipo
+            # sin convertir True en 1: se usan objetos de Python
+            left = self._as_objects(left)
+            right = self._as_objects(right)
+        if node.opcode == OP_AND:
+            return np.where(truthy, right, left)
+        return np.where(truthy, left, right)
+
+    def _is_bool(self, value: Any) -> bool:
+        np = self.np
+        if isinstance(value, np.ndarray):
+            return value.dtype == np.bool_
+        return isinstance(value, (bool, np.bool_))
+
+    def _as_objects(self, value: Any) -> Any:
+        """Convierte un valor en arreglo de objetos de Python (bool e int)"""
+        np = self.np
+        if isinstance(value, np.ndarray) and value.dtype == object:
+            return value
+        result = np.empty(np.shape(value), dtype=object)
+        result[...] = value.tolist() if isinstance(value, np.ndarray) else _item(value)
+        return result
+
+    def _as_int(self, value: Any) -> Any:
+        """Los booleanos se operan como enteros (True + True es 2)"""
+        np = self.np
+        if isinstance(value, (bool, np.bool_)):
+            return int(value)
+        if isinstance(value, np.ndarray) and value.dtype == np.bool_:
+            return value.astype(np.int64)
+        return value
+
+
+def _overflows(np, opcode: int, left: Any, right: Any, result: Any) -> Any:
+    """Filas en que `result` (de 64 bits) no es el resultado exacto de la operación"""
+    if opcode == OP_ADD:
+        # Operandos del mismo signo y resultado de signo contrario
+        return ((left ^ result) & (right ^ result)) < 0
+    if opcode == OP_SUB:
+        return ((left ^ right) & (left ^ result)) < 0
+    if opcode == OP_DIV:
+        return np.equal(left, INT64_MIN) & np.equal(right, -1)
+    # Multiplicación: sin desborde, result // left == right
+    with np.errstate(over='ignore'):
+        quotient = np.floor_divide(result, np.where(np.equal(left, 0), 1, left))
+    return np.not_equal(left, 0) & (
+        np.not_equal(quotient, right) | (np.equal(left, -1) & np.equal(right, INT64_MIN)))
+
+
+def _item(value: Any) -> Any:
+    """Escalar de NumPy -> escalar de Python"""
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _row_count(np, env: Dict[str, Any]) -> int:
+    """Cantidad de filas: la longitud común de las columnas del entorno"""
+    rows = None
+    for name, value in env.items():
+        if isinstance(value, np.ndarray):
+            if value.ndim != 1:
+                raise ValueError(f"La columna '{name}' debe tener una dimensión")
+            if rows is None:
+                rows = len(value)
+            elif len(value) != rows:
+                raise ValueError(f"La columna '{name}' tiene {len(value)} filas; se esperaban {rows}")
+    return 1 if rows is None else rows
+
+
+def evaluate_vectorized(node, env: Dict[str, Any], emit: Callable[[Any], None]) -> Any:
+    """Función de conveniencia: evalúa `node` sobre las columnas de `env`"""
+    return VectorEvaluator(env).run(node, emit)
@@ -0,0 +1,162 @@
+import random
+import sys
+import unittest
+from errors import RuntimeError
+from interpreter import interpret, compile_program
+from parser import parse
+from vectorized import has_arrays, DivisionByZeroError, IntegerOverflowError, evaluate_vectorized
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class HasArraysTest(unittest.TestCase):
+    """La detección de columnas no requiere NumPy"""
+
+    def test_plain_env(self):
+        """Un entorno de escalares no se vectoriza"""
+        self.assertFalse(has_arrays({'x': 1, 'y': [1, 2]}))
+        self.assertFalse(has_arrays(None))
+
+
+@unittest.skipUnless(np is not None, "NumPy no está instalado")
+class VectorizedTest(unittest.TestCase):
+    """Tests para la evaluación por columnas con NumPy"""
+
+    X = [-3, -1, 0, 1, 2, 5]
+    Y = [0, 2, -2, 0, 1, 3]
+
+    def columns(self):
+        return {'x': np.array(self.X), 'y': np.array(self.Y)}
+
+    def row_by_row(self, code, name):
+        values = []
+        for x, y in zip(self.X, self.Y):
+            values.append(interpret(code, env={'x': x, 'y': y}).env[name])
+        return values
+
+    def test_matches_row_by_row(self):
+        """Cada fila da lo mismo que la ejecución escalar"""
+        programs = [
+            "r = x * 2 - y / 3;",
+            "r = (x > 0) + (y <= 1) * 2;",
+            "r = -x + (not y);",
+            "r = x and y or 7;",
+            "r = not (x == y) and x != 0;",
+            "a = x + 1; r = a * a - x;",
+        ]
+        for code in programs:
+            interp = interpret(code, env=self.columns())
+            self.assertEqual([int(v) for v in interp.env['r']],
+                             [int(v) for v in self.row_by_row(code, 'r')], code)
+
+    def test_short_circuit_masks(self):
+        """Las filas descartadas por and/or no producen errores"""
+        interp = interpret("r = y != 0 and x / y; s = y == 0 or x / y;", env=self.columns())
+        self.assertEqual(interp.env['r'].tolist(), [0, -1, 0, 0, 2, 1])
+        self.assertEqual(interp.env['s'].tolist(), [1, -1, 0, 1, 2, 1])
+        # La variable no definida no se necesita en ninguna fila
+        interp = interpret("r = x * 0 and z;", env=self.columns())
+        self.assertEqual(interp.env['r'].tolist(), [0] * 6)
+
+    def test_division_by_zero_rows(self):
+        """La división por cero reporta las filas afectadas"""
+        with self.assertRaises(DivisionByZeroError) as ctx:
+            interpret("x / y;", env=self.columns())
+        self.assertEqual(ctx.exception.rows, [0, 3])
+        self.assertIn("0, 3", str(ctx.exception))
+        self.assertIsInstance(ctx.exception, RuntimeError)
+
+    def test_division_by_scalar_zero(self):
+        """Un divisor escalar cero afecta a todas las filas"""
+        with self.assertRaises(DivisionByZeroError) as ctx:
+            interpret("x / 0;", env=self.columns())
+        self.assertEqual(ctx.exception.rows, list(range(6)))
+
+    def test_integer_overflow_rows(self):
+        """Un resultado fuera de 64 bits es un error con sus filas, no un valor truncado"""
+        big = np.array([10_000_000_000, 3, -(1 << 63)])
+        for code, rows in (("x * x;", [0, 2]), ("x + x;", [2]), ("x - 1;", [2]),
+                           ("-x;", [2]), ("x / -1;", [2]), ("x * 100000000000000000000;", [0, 1, 2])):
+            with self.assertRaises(IntegerOverflowError, msg=code) as ctx:
+                interpret(code, env={'x': big})
+            self.assertEqual(ctx.exception.rows, rows, code)
+            self.assertIsInstance(ctx.exception, RuntimeError)
+        # Las filas descartadas por and/or no cuentan
+        interp = interpret("r = x < 10 and x * x;", env={'x': big[:2]})
+        self.assertEqual(interp.env['r'].tolist(), [False, 9])
+
+    def test_undefined_variable(self):
+        """Error: variable no definida"""
+        with self.assertRaises(RuntimeError):
+            interpret("x + z;", env=self.columns())
+
+    def test_boolean_arithmetic(self):
+        """Los booleanos se suman como enteros"""
+        interp = interpret("r = (x > 0) + (x > 0);", env=self.columns())
+        self.assertEqual(interp.env['r'].tolist(), [0, 0, 0, 2, 2, 2])
+
+    def test_and_or_keep_booleans(self):
+        """and/or entre booleanos y enteros conservan True/False en cada fila"""
+        code = "r = y and x > 0; s = x > 0 or y;"
+        interp = interpret(code, env=self.columns())
+        for name in ('r', 's'):
+            self.assertEqual([repr(v) for v in interp.env[name].tolist()],
+                             [repr(v) for v in self.row_by_row(code, name)], name)
+
+    def test_differential_fuzz(self):
+        """Programas al azar dan, fila a fila, el mismo valor y tipo que interpret"""
+        rng = random.Random(16)
+        operators = ['+', '-', '*', '/', '==', '!=', '<', '>', '<=', '>=', 'and', 'or']
+
+        def expression(depth):
+            if depth == 0 or rng.random() < 0.3:
+                return rng.choice(['x', 'y', 'z', '0', '1', '2', '3'])
+            if rng.random() < 0.15:
+                return f"({rng.choice(['-', 'not '])}({expression(depth - 1)}))"
+            return f"({expression(depth - 1)} {rng.choice(operators)} {expression(depth - 1)})"
+
+        rows = [{name: rng.randint(-3, 3) for name in 'xyz'} for _ in range(12)]
+        columns = {name: np.array([row[name] for row in rows]) for name in 'xyz'}
+        for _ in range(500):
+            code = f"r = {expression(4)};"
+            try:
+                expected = [repr(interpret(code, env=row, engine='tree').env['r']) for row in rows]
+            except RuntimeError:
+                with self.assertRaises(RuntimeError, msg=code):
+                    interpret(code, env=dict(columns))
+                continue
+            result = np.broadcast_to(interpret(code, env=dict(columns)).env['r'], (len(rows),))
+            self.assertEqual([repr(v) for v in result.tolist()], expected, code)
+
+    def test_print_emits_columns(self):
+        """print emite la columna completa"""
+        result = []
+        evaluate_vectorized(parse("print(x + 1);"), self.columns(), result.append)
+        self.assertEqual(result[0].tolist(), [-2, 0, 1, 2, 3, 6])
+
+    def test_compile_program(self):
+        """compile_program evalúa por columnas si recibe arreglos"""
+        prog = compile_program("t = x * y; t > 0;")
+        result = prog(self.columns())
+        self.assertEqual(result.env['t'].tolist(), [0, -2, 0, 0, 2, 15])
+        self.assertEqual(result.value.tolist(), [False, False, False, False, True, True])
+        self.assertEqual(prog({'x': 2, 'y': 3}).value, True)
+
+    def test_explicit_engine_with_columns(self):
+        """Con columnas, un motor explícito que no es 'vector' es un error"""
+        self.assertEqual(interpret("r = x;", env=self.columns(), engine='vector').env['r'].tolist(),
+                         self.X)
+        with self.assertRaises(ValueError):
+            interpret("r = x;", env=self.columns(), engine='bytecode')
+
+    def test_mismatched_columns(self):
+        """Error: columnas de distinta longitud"""
+        with self.assertRaises(ValueError):
+            interpret("x + y;", env={'x': np.arange(3), 'y': np.arange(4)})
+
+
+if __name__ == "__main__":
+    unittest.main(argv=[sys.argv[0]])